@@ -1,7 +1,7 @@
 import pytest
 from flask import Flask
 from flask_jwt_extended import JWTManager
-from controllers.auth import validate_auth
+from controllers.auth import validate_auth, validate_tokens
 
 
 @pytest.fixture
@@ -51,3 +51,20 @@ def test_validate_auth_missing_role(mocker, app):
         response = validate_auth(identity="test@example.com")
         assert response.status_code == 403
         assert response.get_json() == {"error": "Admin access required"}
+
+
+def test_validate_tokens_verifies_repeats_once(mocker, app):
+    """
+    Test that a token repeated in a batch is decoded once.
+    """
+    decode = mocker.patch(
+        "controllers.auth.decode_token",
+        return_value={"sub": "a@example.com", "role": "User", "type": "access"},
+    )
+    mocker.patch("controllers.auth.get_unverified_jwt_headers", return_value={})
+    with app.test_request_context():
+        results = validate_tokens(["t1", "t1", "t2"])
+    assert [result["identity"] for result in results] == ["a@example.com"] * 3
+    assert decode.call_count == 2
+    with pytest.raises(ValueError, match="Expected a list of tokens"):
+        validate_tokens("t1")
@@ -1,7 +1,9 @@
 import pytest
 from flask import Flask
-from flask_jwt_extended import JWTManager, create_access_token
+from datetime import timedelta
+from flask_jwt_extended import JWTManager, create_access_token, create_refresh_token
 from flasgger import Swagger
+from common.auth import CachedJWTManager
 from views.auth import auth_blueprint
 
 
@@ -107,3 +109,71 @@ def test_auth_endpoint_no_token(client):
     response = client.get("/auth-endpoint")
     assert response.status_code == 401
     assert response.get_json().get("msg") == "Missing Authorization Header"
+
+
+def test_validate_batch(client, app, admin_token, user_token):
+    """
+    Test that each token gets its own result, in order.
+    """
+    with app.test_request_context():
+        expired = create_access_token(
+            identity="old@example.com", expires_delta=timedelta(seconds=-1)
+        )
+        refresh = create_refresh_token(identity="admin@example.com")
+
+    response = client.post(
+        "/auth/validate-batch",
+        json={"tokens": [admin_token, user_token, expired, "not-a-token", refresh, 7]},
+    )
+
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert results[0] == {
+        "valid": True,
+        "identity": "admin@example.com",
+        "role": "Admin",
+        "admin": True,
+    }
+    assert results[1]["admin"] is False and results[1]["role"] == "User"
+    assert results[2] == {"valid": False, "error": "Token has expired"}
+    assert results[3]["error"].startswith("Invalid token")
+    assert results[4] == {
+        "valid": False,
+        "error": "Invalid token: Only non-refresh tokens are allowed",
+    }
+    assert results[5] == {"valid": False, "error": "Token must be a non-empty string"}
+
+
+def test_validate_batch_rejects_bad_body(client):
+    """
+    Test that the body must hold a bounded list of tokens.
+    """
+    assert client.post("/auth/validate-batch", json=["token"]).status_code == 400
+    response = client.post("/auth/validate-batch", json={"tokens": ["t"] * 1001})
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "At most 1000 tokens per request"}
+
+
+def test_revoke_token(tmp_path):
+    """
+    Test that a revoked token is rejected on the next request.
+    """
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = "shared-secret-key"
+    app.config["JWT_REVOCATION_FILE"] = str(tmp_path / "revoked_tokens.py")
+    CachedJWTManager(app)
+    app.register_blueprint(auth_blueprint)
+    with app.test_request_context():
+        token = create_access_token(
+            identity="admin@example.com", additional_claims={"role": "Admin"}
+        )
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/auth-endpoint", headers=headers).status_code == 200
+    response = client.post("/auth/revoke", headers=headers)
+    assert response.status_code == 200
+    assert response.get_json() == {"message": "Token revoked"}
+    assert client.get("/auth-endpoint", headers=headers).status_code == 401
+    results = client.post("/auth/validate-batch", json={"tokens": [token]}).get_json()
+    assert results["results"] == [{"valid": False, "error": "Token has been revoked"}]
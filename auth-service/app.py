@@ -1,6 +1,13 @@
+import os
+import sys
+
+# Make the shared ``common`` package importable when run from this directory.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
 from flask import Flask, jsonify
-from flask_jwt_extended import JWTManager
 from flasgger import Swagger
+from common.auth import CachedJWTManager
+from common.structured_logging import configure_logging
 from views.auth import auth_blueprint
 
 
@@ -8,7 +15,9 @@ app = Flask(__name__)
 
 # JWT Configuration
 app.config["JWT_SECRET_KEY"] = "shared-secret-key"
-jwt = JWTManager(app)
+jwt = CachedJWTManager(app)
+# JSON-lines logs written by a background thread; LOG_LEVEL sets the level
+configure_logging(app)
 
 
 # JWT Error Handlers
@@ -1 +1 @@
-from .auth import validate_auth
+from .auth import validate_auth, validate_token, validate_tokens
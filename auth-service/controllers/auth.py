@@ -1,5 +1,14 @@
+import logging
 from flask import jsonify, make_response
-from flask_jwt_extended import get_jwt
+from flask_jwt_extended import get_jwt, decode_token, get_unverified_jwt_headers
+from flask_jwt_extended.exceptions import JWTExtendedException, RevokedTokenError
+from flask_jwt_extended.internal_utils import (
+    verify_token_type,
+    verify_token_not_blocklisted,
+)
+from jwt import PyJWTError, ExpiredSignatureError
+
+logger = logging.getLogger(__name__)
 
 
 def validate_auth(identity):
@@ -7,7 +16,57 @@ def validate_auth(identity):
     Validates if the user has admin privileges.
     """
     claims = get_jwt()  # Retrieve additional claims from the JWT
-    print(f"JWT Claims: {claims}")  # Debugging log
     if claims.get("role") != "Admin":
+        logger.info("Admin access denied for %s", identity)
         return make_response(jsonify({"error": "Admin access required"}), 403)
     return make_response(jsonify({"message": "Admin access granted"}), 200)
+
+
+def validate_token(token):
+    """
+    Verify one access token the way @jwt_required() would.
+
+    Returns {"valid", "identity", "role", "admin"} for a good token and
+    {"valid": False, "error"} otherwise.
+    """
+    if not isinstance(token, str) or not token:
+        return {"valid": False, "error": "Token must be a non-empty string"}
+    try:
+        claims = decode_token(token)
+        verify_token_type(claims, refresh=False)
+        verify_token_not_blocklisted(get_unverified_jwt_headers(token), claims)
+    except ExpiredSignatureError:
+        return {"valid": False, "error": "Token has expired"}
+    except RevokedTokenError:
+        return {"valid": False, "error": "Token has been revoked"}
+    except (PyJWTError, JWTExtendedException) as e:
+        return {"valid": False, "error": f"Invalid token: {e}"}
+    role = claims.get("role")
+    return {
+        "valid": True,
+        "identity": claims.get("sub"),
+        "role": role,
+        "admin": role == "Admin",
+    }
+
+
+def validate_tokens(tokens, max_tokens=None):
+    """
+    Verify a list of access tokens in one pass, keeping their order.
+
+    A token repeated in the list is verified once.
+    """
+    if not isinstance(tokens, list):
+        raise ValueError("Expected a list of tokens")
+    if max_tokens is not None and len(tokens) > max_tokens:
+        raise ValueError(f"At most {max_tokens} tokens per request")
+    verified = {}
+    results = []
+    for token in tokens:
+        if not isinstance(token, str):
+            results.append(validate_token(token))
+            continue
+        if token not in verified:
+            verified[token] = validate_token(token)
+        results.append(verified[token])
+    return results
@@ -1,9 +1,15 @@
-from flask import Blueprint, jsonify
+import logging
+from flask import Blueprint, jsonify, request
 from flask_jwt_extended import get_jwt, jwt_required, get_jwt_identity
-from controllers.auth import validate_auth
+from controllers.auth import validate_auth, validate_tokens
+from common.auth import revoke_token
 
 
 auth_blueprint = Blueprint("auth", __name__)
+logger = logging.getLogger(__name__)
+
+# Tokens accepted by one /auth/validate-batch request.
+MAX_BATCH_TOKENS = 1000
 
 
 @auth_blueprint.route("/auth-endpoint", methods=["GET"])
@@ -35,13 +41,11 @@ def auth_endpoint():
               example: Admin access required
     """
     identity = get_jwt_identity()
-    claims = get_jwt()  # Retrieve additional claims
-    print(f"Extracted Identity: {identity}")  # Log identity
-    print(f"JWT Claims: {claims}")  # Log claims
+    # Only the identity is logged; claims may carry sensitive data.
+    logger.debug("Admin check for %s", identity)
 
     validation_error = validate_auth(identity)
     if validation_error:
-        print(f"Validation Error: {validation_error}")  # Debugging log
         return validation_error
 
     return (
@@ -52,3 +56,72 @@ def auth_endpoint():
         ),
         200,
     )
+
+
+@auth_blueprint.route("/auth/revoke", methods=["POST"])
+@jwt_required()
+def revoke():
+    """
+    Revoke the Token Used for This Request
+    ---
+    security:
+      - Bearer: []
+    responses:
+      200:
+        description: Token revoked in every service
+      401:
+        description: Missing, expired or already revoked token
+    """
+    revoke_token(get_jwt())
+    return jsonify({"message": "Token revoked"}), 200
+
+
+@auth_blueprint.route("/auth/validate-batch", methods=["POST"])
+def validate_batch():
+    """
+    Validate Many Tokens in One Request
+    ---
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          properties:
+            tokens:
+              type: array
+              items:
+                type: string
+              example: ["eyJhbGciOi..."]
+    responses:
+      200:
+        description: One result per token, in request order
+        schema:
+          type: object
+          properties:
+            results:
+              type: array
+              items:
+                type: object
+                properties:
+                  valid:
+                    type: boolean
+                  identity:
+                    type: string
+                  role:
+                    type: string
+                  admin:
+                    type: boolean
+                  error:
+                    type: string
+      400:
+        description: Body is not {"tokens": [...]} or has too many tokens
+    """
+    data = request.get_json(silent=True)
+    try:
+        if not isinstance(data, dict):
+            raise ValueError('Expected {"tokens": [...]}')
+        results = validate_tokens(data.get("tokens"), max_tokens=MAX_BATCH_TOKENS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"results": results}), 200
@@ -0,0 +1,148 @@
+import pytest
+from datetime import timedelta
+from flask import Flask, jsonify
+from flask_jwt_extended import (
+    JWTManager,
+    create_access_token,
+    decode_token,
+    jwt_required,
+    get_jwt,
+)
+from common.auth import ClaimsCache, CachedJWTManager, admin_required, revoke_token
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def app(tmp_path):
+    """
+    Create an app with a cached JWT manager and two protected views.
+    """
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = "test-secret-key"
+    app.config["JWT_REVOCATION_FILE"] = str(tmp_path / "revoked_tokens.py")
+    CachedJWTManager(app)
+
+    @app.route("/claims")
+    @jwt_required()
+    def claims():
+        return jsonify(get_jwt())
+
+    @app.route("/admin")
+    @admin_required(status=401)
+    def admin():
+        """
+        Admin view.
+        """
+        return jsonify({"ok": True})
+
+    return app
+
+
+def make_token(app, role="Admin", **kwargs):
+    with app.test_request_context():
+        return create_access_token(
+            identity="a@example.com", additional_claims={"role": role}, **kwargs
+        )
+
+
+def test_cache_expires_at_ttl_and_token_exp():
+    """
+    Test that entries expire at the earlier of the TTL and the token's exp.
+    """
+    clock = Clock()
+    cache = ClaimsCache(max_size=10, ttl=60, clock=clock)
+    cache.put("long", {"sub": "a", "exp": 5000})
+    cache.put("short", {"sub": "b", "exp": 1010})
+    assert cache.get("long") == {"sub": "a", "exp": 5000}
+
+    clock.now = 1010
+    assert cache.get("short") is None
+    assert cache.get("long") is not None
+    clock.now = 1060
+    assert cache.get("long") is None
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used():
+    """
+    Test that the oldest unused entry is evicted once the cache is full.
+    """
+    cache = ClaimsCache(max_size=2, clock=Clock())
+    cache.put("a", {"sub": "a"})
+    cache.put("b", {"sub": "b"})
+    cache.get("a")
+    cache.put("c", {"sub": "c"})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"sub": "a"}
+    assert cache.get("c") == {"sub": "c"}
+
+
+def test_repeat_requests_skip_verification(app, mocker):
+    """
+    Test that a token is decoded once and then served from the cache.
+    """
+    token = make_token(app)
+    decode = mocker.spy(JWTManager, "_decode_jwt_from_config")
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = client.get("/claims", headers=headers)
+    second = client.get("/claims", headers=headers)
+
+    assert first.get_json() == second.get_json()
+    assert second.get_json()["role"] == "Admin"
+    assert decode.call_count == 1
+
+
+def test_invalid_and_expired_tokens_are_not_cached(app):
+    """
+    Test that failed verification is never cached.
+    """
+    client = app.test_client()
+    expired = make_token(app, expires_delta=timedelta(seconds=-1))
+    for _ in range(2):
+        response = client.get("/claims", headers={"Authorization": f"Bearer {expired}"})
+        assert response.status_code == 401
+    response = client.get("/claims", headers={"Authorization": "Bearer a.b.c"})
+    assert response.status_code == 422
+    assert len(app.extensions["flask-jwt-extended"].claims_cache) == 0
+
+
+def test_admin_required(app):
+    """
+    Test that the decorator checks the token and then the role.
+    """
+    client = app.test_client()
+    admin = client.get("/admin", headers={"Authorization": f"Bearer {make_token(app)}"})
+    user = client.get(
+        "/admin", headers={"Authorization": f"Bearer {make_token(app, 'User')}"}
+    )
+    assert admin.get_json() == {"ok": True}
+    assert user.status_code == 401
+    assert user.get_json() == {"error": "Access denied. Admins only."}
+    assert client.get("/admin").status_code == 401
+    assert app.view_functions["admin"].__doc__.strip() == "Admin view."
+
+
+def test_revoked_token_is_rejected(app):
+    """
+    Test that a revoked token fails even though its claims are cached.
+    """
+    token = make_token(app)
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/claims", headers=headers).status_code == 200
+
+    with app.test_request_context():
+        revoke_token(decode_token(token))
+
+    response = client.get("/claims", headers=headers)
+    assert response.status_code == 401
+    assert response.get_json() == {"msg": "Token has been revoked"}
@@ -0,0 +1,310 @@
+import os
+import time
+import pytest
+from common.log_store import LogStore, RecordLog
+from common.snapshot import PythonSnapshot, SnapshotError
+
+
+class ItemStore(LogStore):
+    variable = "items"
+
+    def key(self, record):
+        return record["id"]
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    """
+    Provide a snapshot file with two items.
+    """
+    path = tmp_path / "items.py"
+    path.write_text("items = [{'id': 'a', 'value': 1}, {'id': 'b', 'value': 2}]")
+    return str(path)
+
+
+def test_put_and_delete_are_logged(snapshot):
+    """
+    Test that mutations go to the log and the snapshot is left alone.
+    """
+    store = ItemStore(snapshot)
+    store.put({"id": "c", "value": 3})
+    assert store.delete("a") is True
+    assert store.delete("missing") is False
+
+    with open(snapshot) as file:
+        assert "'c'" not in file.read()
+    assert [item["id"] for item in store.all()] == ["b", "c"]
+
+
+def test_startup_replays_snapshot_and_log(snapshot):
+    """
+    Test that a new store rebuilds state from snapshot plus log.
+    """
+    store = ItemStore(snapshot)
+    store.put({"id": "b", "value": 20})
+    store.put({"id": "c", "value": 3})
+    store.delete("a")
+
+    restarted = ItemStore(snapshot)
+    assert restarted.all() == [{"id": "b", "value": 20}, {"id": "c", "value": 3}]
+
+
+def test_compact_folds_log_into_snapshot(snapshot):
+    """
+    Test that compaction rewrites the snapshot and drops the log.
+    """
+    store = ItemStore(snapshot)
+    store.put({"id": "c", "value": 3})
+    store.compact()
+
+    assert not os.path.exists(store.log.path)
+    assert not os.path.exists(store.log.rotated_path)
+    with open(snapshot) as file:
+        assert "'c'" in file.read()
+    assert len(ItemStore(snapshot)) == 3
+
+
+def test_writes_after_compaction_are_kept(snapshot):
+    """
+    Test that entries appended after a compaction survive a restart.
+    """
+    store = ItemStore(snapshot)
+    store.put({"id": "c", "value": 3})
+    store.compact()
+    store.put({"id": "d", "value": 4})
+
+    assert len(store) == 4
+    assert len(ItemStore(snapshot)) == 4
+
+
+def test_background_compaction(snapshot):
+    """
+    Test that crossing the threshold compacts without blocking the writer.
+    """
+    store = ItemStore(snapshot, compact_threshold=3)
+    for value in range(3):
+        store.put({"id": f"n{value}", "value": value})
+
+    deadline = time.time() + 5
+    while os.path.exists(store.log.path) and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert not os.path.exists(store.log.path)
+    assert len(ItemStore(snapshot)) == 5
+
+
+def test_rotated_log_is_replayed(snapshot):
+    """
+    Test recovery from a crash between log rotation and snapshot swap.
+    """
+    store = ItemStore(snapshot)
+    store.put({"id": "c", "value": 3})
+    store.log.rotate()
+
+    assert len(ItemStore(snapshot)) == 3
+
+
+def test_rotation_appends_to_leftover_rotated_log(snapshot):
+    """
+    Test that rotating again after a failed compaction keeps both logs.
+    """
+    store = ItemStore(snapshot)
+    store.put({"id": "c", "value": 3})
+    store.log.rotate()
+    store.put({"id": "d", "value": 4})
+    store.log.rotate()
+
+    assert not os.path.exists(store.log.path)
+    assert [item["id"] for item in ItemStore(snapshot).all()] == ["a", "b", "c", "d"]
+
+
+def test_failed_compactions_lose_nothing(snapshot, monkeypatch):
+    """
+    Test that records survive repeated snapshot write failures.
+    """
+    store = ItemStore(snapshot)
+
+    def fail(records):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store, "_write_snapshot", fail)
+    store.put({"id": "c", "value": 3})
+    with pytest.raises(OSError):
+        store.compact()
+    store.put({"id": "d", "value": 4})
+    with pytest.raises(OSError):
+        store.compact()
+    assert [item["id"] for item in ItemStore(snapshot).all()] == ["a", "b", "c", "d"]
+
+    monkeypatch.undo()
+    store.put({"id": "e", "value": 5})
+    store.compact()
+    assert not os.path.exists(store.log.rotated_path)
+    assert len(ItemStore(snapshot)) == 5
+
+
+def test_snapshot_temp_file_is_removed_on_failure(snapshot, monkeypatch):
+    """
+    Test that a snapshot that cannot be written leaves no temp file behind.
+    """
+
+    def fail(path, variable, records):
+        with open(path, "w") as file:
+            file.write("items = [")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(PythonSnapshot, "write", staticmethod(fail))
+    store = ItemStore(snapshot)
+    store.put({"id": "c", "value": 3})
+    with pytest.raises(OSError):
+        store.compact()
+    assert [name for name in os.listdir(os.path.dirname(snapshot)) if "tmp" in name] == []
+
+
+def test_unencodable_records_are_not_logged(tmp_path):
+    """
+    Test that a binary-backed store rejects values its snapshot cannot
+    hold before they reach the log.
+    """
+    store = ItemStore(str(tmp_path / "items.snap"))
+    with pytest.raises(ValueError, match="Unsupported value type: list"):
+        store.put({"id": "a", "tags": ["x"]})
+    with pytest.raises(ValueError, match="Unsupported value type: dict"):
+        store.put_many([{"id": "b"}, {"id": "c", "meta": {}}])
+
+    assert not os.path.exists(store.log.path)
+    assert len(store) == 0
+
+
+def test_compaction_keeps_writes_from_other_processes(snapshot, monkeypatch):
+    """
+    Test that an entry another store appends just before the rotation
+    ends up in the new snapshot instead of being discarded.
+    """
+    store = ItemStore(snapshot)
+    other = ItemStore(snapshot)
+    store.put({"id": "c", "value": 3})
+    rotate = store.log.rotate
+
+    def rotate_after_other_write():
+        other.put({"id": "d", "value": 4})
+        return rotate()
+
+    monkeypatch.setattr(store.log, "rotate", rotate_after_other_write)
+    store.compact()
+
+    assert not os.path.exists(store.log.rotated_path)
+    assert [item["id"] for item in ItemStore(snapshot).all()] == ["a", "b", "c", "d"]
+    assert store.get("d") == {"id": "d", "value": 4}
+
+
+def test_torn_line_is_ignored(tmp_path):
+    """
+    Test that a partially written last line is left for the next read.
+    """
+    log = RecordLog(str(tmp_path / "items.log"))
+    log.append({"op": "delete", "key": "a"})
+    with open(log.path, "a") as file:
+        file.write('{"op":"del')
+
+    entries, offset = log.read()
+    assert entries == [{"op": "delete", "key": "a"}]
+    assert offset < os.path.getsize(log.path)
+
+
+def test_replace_resets_log(snapshot):
+    """
+    Test that replacing all records writes a snapshot and clears the log.
+    """
+    store = ItemStore(snapshot)
+    store.put({"id": "c", "value": 3})
+    store.replace([{"id": "z", "value": 26}])
+
+    assert not os.path.exists(store.log.path)
+    assert ItemStore(snapshot).all() == [{"id": "z", "value": 26}]
+
+
+def test_version_moves_on_change(snapshot):
+    """
+    Test that the version increases on writes and stays put on reads.
+    """
+    store = ItemStore(snapshot)
+    before = store.version
+    store.all()
+    assert store.version == before
+
+    store.put({"id": "c", "value": 3})
+    after_put = store.version
+    assert after_put > before
+
+    store.delete("c")
+    assert store.version > after_put
+
+
+def test_page_walks_keys_in_order(snapshot):
+    """
+    Test keyset pagination over an ordered store.
+    """
+    store = ItemStore(snapshot)
+    store.ordered = True
+    store.put({"id": "d", "value": 4})
+    store.put({"id": "c", "value": 3})
+    store.delete("b")
+
+    items, next_key = store.page(limit=2)
+    assert [item["id"] for item in items] == ["a", "c"]
+    assert next_key == "c"
+
+    items, next_key = store.page(after=next_key, limit=2)
+    assert [item["id"] for item in items] == ["d"]
+    assert next_key is None
+
+
+def test_page_rejects_mismatched_cursor(snapshot):
+    """
+    Test that a cursor of the wrong type is reported as invalid.
+    """
+    store = ItemStore(snapshot)
+    store.ordered = True
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        store.page(after=3)
+
+
+def test_binary_snapshot(tmp_path):
+    """
+    Test that a .snap path stores its snapshot in the binary format.
+    """
+    path = str(tmp_path / "items.snap")
+    store = ItemStore(path)
+    store.put({"id": "a", "value": 1})
+    store.compact()
+
+    with open(path, "rb") as file:
+        assert file.read(4) == b"SNAP"
+    assert ItemStore(path).all() == [{"id": "a", "value": 1}]
+
+
+def test_unparseable_snapshot_raises(tmp_path):
+    """
+    Test that a corrupt snapshot is reported instead of read as empty.
+    """
+    path = tmp_path / "items.py"
+    path.write_text("items = [{'id': 'a'")
+    with pytest.raises(SnapshotError):
+        ItemStore(str(path)).all()
+    assert len(ItemStore(str(tmp_path / "missing.py"))) == 0
+
+
+def test_batch_writes_append_once(snapshot, mocker):
+    """
+    Test that put_many and delete_many each write the log once.
+    """
+    store = ItemStore(snapshot)
+    spy = mocker.spy(store.log, "append_many")
+
+    store.put_many([{"id": "c", "value": 3}, {"id": "d", "value": 4}])
+    assert store.delete_many(["a", "missing", "c", "a"]) == ["a", "c"]
+    assert store.delete_many(["missing"]) == []
+
+    assert spy.call_count == 2
+    assert [item["id"] for item in ItemStore(snapshot).all()] == ["b", "d"]
@@ -0,0 +1,44 @@
+import pytest
+from werkzeug.datastructures import MultiDict
+from common.pagination import (
+    MAX_PAGE_SIZE,
+    encode_cursor,
+    decode_cursor,
+    parse_page_args,
+    wants_page,
+)
+
+
+def test_cursor_round_trip():
+    """
+    Test that cursors decode back to the original key.
+    """
+    for key in ("f624c7b4-07a2-4582-9889-1c1f5d62e474", 42):
+        assert decode_cursor(encode_cursor(key)) == key
+
+
+def test_invalid_cursor():
+    """
+    Test that garbage cursors raise ValueError.
+    """
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor("not-a-cursor!")
+
+
+def test_parse_page_args():
+    """
+    Test parsing limit and cursor query parameters.
+    """
+    args = MultiDict({"limit": "10", "cursor": encode_cursor(5)})
+    assert wants_page(args)
+    assert parse_page_args(args) == (10, 5)
+    assert not wants_page(MultiDict())
+
+
+@pytest.mark.parametrize("limit", ["0", str(MAX_PAGE_SIZE + 1), "ten"])
+def test_parse_page_args_bad_limit(limit):
+    """
+    Test that out-of-range or non-numeric limits are rejected.
+    """
+    with pytest.raises(ValueError, match="limit must be"):
+        parse_page_args(MultiDict({"limit": limit}))
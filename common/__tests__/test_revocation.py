@@ -0,0 +1,71 @@
+import time
+from common.revocation import RevocationStore
+
+
+def make_store(tmp_path, **kwargs):
+    return RevocationStore(str(tmp_path / "revoked_tokens.py"), **kwargs)
+
+
+def test_revoke_and_check(tmp_path):
+    """
+    Test that revoked ids are found and others are not.
+    """
+    store = make_store(tmp_path)
+    assert store.is_revoked("a") is False
+    store.revoke("a", time.time() + 60)
+    assert store.is_revoked("a") is True
+    assert store.is_revoked("b") is False
+    assert store.is_revoked(None) is False
+
+
+def test_revocations_are_shared_through_the_file(tmp_path):
+    """
+    Test that another process sees a revocation after its refresh interval.
+    """
+    writer = make_store(tmp_path)
+    reader = make_store(tmp_path, refresh_interval=0)
+    cached = make_store(tmp_path, refresh_interval=3600)
+    assert cached.is_revoked("a") is False
+
+    writer.revoke("a", time.time() + 60)
+    assert reader.is_revoked("a") is True
+    # Within the interval the resident set is used without touching disk.
+    assert cached.is_revoked("a") is False
+    cached._next_refresh = 0
+    assert cached.is_revoked("a") is True
+    assert make_store(tmp_path).is_revoked("a") is True
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    """
+    Test that revocations are purged once their tokens have expired.
+    """
+    now = [1000.0]
+    store = make_store(tmp_path, clock=lambda: now[0])
+    store.revoke("old", 1010)
+    store.revoke("forever")
+    now[0] = 1011
+    store.revoke("new", 2000)
+    assert sorted(record["jti"] for record in store.all()) == ["forever", "new"]
+    assert store.is_revoked("old") is False
+
+
+def test_purge_only_visits_expired_entries(tmp_path, mocker):
+    """
+    Test that a revoke finds expired entries through the expiry heap, and
+    that re-revoking an id with a later exp keeps it.
+    """
+    now = [1000.0]
+    store = make_store(tmp_path, clock=lambda: now[0])
+    for number in range(50):
+        store.revoke(f"t{number}", 5000)
+    store.revoke("short", 1010)
+    now[0] = 1011
+    store.revoke("short", 3000)
+    expired = mocker.spy(store, "_expired")
+
+    store.revoke("again", 2000)
+
+    assert expired.spy_return == []
+    assert store.is_revoked("short") is True
+    assert len(make_store(tmp_path)) == 52
@@ -0,0 +1,174 @@
+import pytest
+from common.snapshot import (
+    BinaryReader,
+    BinarySnapshot,
+    PythonSnapshot,
+    SnapshotError,
+    convert_snapshot,
+    ensure_snapshot,
+    main,
+    read_snapshot,
+    snapshot_format,
+    snapshot_path,
+    verify_snapshots,
+)
+
+RECORDS = [
+    {"id": 1, "name": "Paris", "ratio": 0.5, "open": True, "note": None},
+    {"id": 2, "name": "Tōkyō", "open": False},
+    {"id": -(2**63), "name": "Paris"},
+]
+
+
+@pytest.mark.parametrize("extension", [".py", ".json", ".jsonl", ".snap"])
+def test_round_trip(tmp_path, extension):
+    """
+    Test that every supported value type survives a write and read.
+    """
+    path = str(tmp_path / f"items{extension}")
+    snapshot_format(path).write(path, "items", RECORDS)
+    assert read_snapshot(path, "items") == RECORDS
+
+
+@pytest.mark.parametrize(
+    "name, content, message",
+    [
+        ("items.py", "items = [{'id': 1}", "items.py"),
+        ("items.py", "[{'id': 1}]", "items.py"),
+        ("items.json", '{"id": 1}', "expected a list of records"),
+        ("items.jsonl", '{"id": 1}\n{"id": ', "line 2"),
+    ],
+)
+def test_parse_errors_raise(tmp_path, name, content, message):
+    """
+    Test that a malformed data file raises instead of reading as empty.
+    """
+    path = tmp_path / name
+    path.write_text(content)
+    with pytest.raises(SnapshotError, match=message):
+        read_snapshot(str(path))
+
+
+def test_reader_decodes_lazily(tmp_path):
+    """
+    Test random access and that repeated strings are shared.
+    """
+    path = str(tmp_path / "items.snap")
+    BinarySnapshot().write(path, "items", RECORDS)
+
+    with BinaryReader(path) as reader:
+        assert len(reader) == 3
+        assert reader.fields == ["id", "name", "ratio", "open", "note"]
+        assert reader[2] == RECORDS[2]
+        assert reader[0]["name"] is reader[2]["name"]
+        with pytest.raises(IndexError):
+            reader[3]
+
+
+def test_unsupported_values_are_rejected(tmp_path):
+    """
+    Test that nested values and oversized integers cannot be written.
+    """
+    path = str(tmp_path / "items.snap")
+    with pytest.raises(ValueError, match="Unsupported value type: list"):
+        BinarySnapshot().write(path, "items", [{"tags": ["a"]}])
+    with pytest.raises(ValueError, match="Integer out of range"):
+        BinarySnapshot().write(path, "items", [{"id": 2**63}])
+
+
+def test_check_rejects_values_that_cannot_be_read_back():
+    """
+    Test that check catches values a format would write but not read.
+    """
+    for value in (float("nan"), float("inf"), [{"ratio": float("-inf")}]):
+        with pytest.raises(ValueError, match="Unsupported value"):
+            PythonSnapshot().check({"id": 1, "value": value})
+    PythonSnapshot().check({"id": 1, "tags": ["a"], "ratio": 0.5})
+
+    with pytest.raises(UnicodeEncodeError):
+        BinarySnapshot().check({"name": "\ud800"})
+    with pytest.raises(ValueError, match="Unsupported value type: list"):
+        BinarySnapshot().check({"tags": ["a"]})
+    BinarySnapshot().check({"name": "Tōkyō", "open": True, "ratio": float("nan")})
+
+
+def test_bad_file_is_rejected(tmp_path):
+    """
+    Test that a file without the snapshot header is refused.
+    """
+    path = tmp_path / "items.snap"
+    path.write_bytes(b"items = [{'id': 1}]")
+    with pytest.raises(SnapshotError, match="not a version 1 snapshot"):
+        BinaryReader(str(path))
+    path.write_bytes(b"")
+    with pytest.raises(SnapshotError, match="not a binary snapshot"):
+        BinaryReader(str(path))
+
+
+def test_format_follows_extension():
+    """
+    Test picking a format by file extension.
+    """
+    assert isinstance(snapshot_format("data/items.py"), PythonSnapshot)
+    assert isinstance(snapshot_format("data/items.snap"), BinarySnapshot)
+    with pytest.raises(ValueError, match="Unknown snapshot format: .txt"):
+        snapshot_format("items.txt")
+    assert snapshot_path("data/items.py", "jsonl") == "data/items.jsonl"
+    assert snapshot_path("data/items.py", "python") == "data/items.py"
+    with pytest.raises(ValueError, match="Unknown snapshot format: xml"):
+        snapshot_path("data/items.py", "xml")
+
+
+def test_convert_and_ensure(tmp_path):
+    """
+    Test converting a Python data file once and leaving it alone after.
+    """
+    source = tmp_path / "items.py"
+    source.write_text(f"items = {RECORDS}")
+    target = str(tmp_path / "items.snap")
+
+    assert ensure_snapshot(str(source), target, "items") == target
+    assert BinarySnapshot().read(target, "items") == RECORDS
+
+    source.write_text("items = []")
+    ensure_snapshot(str(source), target, "items")
+    assert len(BinarySnapshot().read(target, "items")) == 3
+
+    assert convert_snapshot(str(source), target, "items") == 0
+
+
+def test_verify_snapshots(tmp_path):
+    """
+    Test that verify reports unreadable and mismatched files.
+    """
+    source = tmp_path / "items.py"
+    source.write_text(f"items = {RECORDS}")
+    copy = str(tmp_path / "items.json")
+    convert_snapshot(str(source), copy, "items")
+    assert verify_snapshots([str(source), copy]) == []
+
+    other = tmp_path / "other.jsonl"
+    other.write_text('{"id": 1}\n')
+    broken = tmp_path / "broken.json"
+    broken.write_text("[")
+    problems = verify_snapshots([str(source), str(other), str(broken)])
+    assert problems[0] == f"{other} differs from {source}"
+    assert problems[1].startswith(f"{broken}:")
+
+
+def test_main(tmp_path, capsys):
+    """
+    Test the convert and verify commands.
+    """
+    source = tmp_path / "items.py"
+    source.write_text(f"items = {RECORDS}")
+    target = str(tmp_path / "items.jsonl")
+
+    assert main(["convert", str(source), target, "items"]) == 0
+    assert "Wrote 3 items" in capsys.readouterr().out
+    assert main(["verify", str(source), target]) == 0
+    assert "OK: 3 records" in capsys.readouterr().out
+
+    source.write_text("items = [")
+    assert main(["verify", str(source), target]) == 1
+    assert main(["convert", str(source), target, "items"]) == 1
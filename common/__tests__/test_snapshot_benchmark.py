@@ -0,0 +1,29 @@
+from common.snapshot_benchmark import main, make_records, run
+
+
+def test_make_records():
+    """
+    Test that generated records have unique ids and booking fields.
+    """
+    records = make_records(10)
+    assert [record["id"] for record in records] == list(range(10))
+    assert records[0]["destination"] == "Paris"
+
+
+def test_run_covers_every_format(tmp_path, capsys):
+    """
+    Test that the benchmark times each format at each count.
+    """
+    rows = run(counts=(5, 10), repeat=1, directory=str(tmp_path))
+    assert [(row[0], row[1]) for row in rows] == [
+        (".py", 5),
+        (".json", 5),
+        (".jsonl", 5),
+        (".snap", 5),
+        (".py", 10),
+        (".json", 10),
+        (".jsonl", 10),
+        (".snap", 10),
+    ]
+    assert main(["3", "--repeat", "1"]) == 0
+    assert ".snap" in capsys.readouterr().out
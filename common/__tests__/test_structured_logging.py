@@ -0,0 +1,116 @@
+import io
+import json
+import logging
+import threading
+import pytest
+from flask import Flask
+from common.structured_logging import (
+    DeferredQueueHandler,
+    configure_logging,
+    stop_listener,
+)
+
+
+@pytest.fixture
+def logged_app():
+    """
+    Create an app whose logs go to a buffer, and restore logging after.
+    """
+    root = logging.getLogger()
+    level = root.level
+    stream = io.StringIO()
+    app = Flask(__name__)
+
+    @app.route("/hello")
+    def hello():
+        logging.getLogger("views").warning("hello %s", "world")
+        return "hi"
+
+    configure_logging(app, level="INFO", stream=stream)
+    yield app, stream
+    stop_listener()
+    root.setLevel(level)
+
+
+def read_lines(stream):
+    stop_listener()
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_requests_get_correlation_ids(logged_app):
+    """
+    Test that a request's records carry its id and the id is echoed back.
+    """
+    app, stream = logged_app
+    client = app.test_client()
+    given = client.get("/hello", headers={"X-Request-ID": "req-1"})
+    generated = client.get("/hello")
+
+    assert given.headers["X-Request-ID"] == "req-1"
+    generated_id = generated.headers["X-Request-ID"]
+    assert len(generated_id) == 32
+
+    lines = read_lines(stream)
+    assert [(line["message"], line["correlation_id"]) for line in lines] == [
+        ("hello world", "req-1"),
+        ("GET /hello 200", "req-1"),
+        ("hello world", generated_id),
+        ("GET /hello 200", generated_id),
+    ]
+    assert lines[1]["status"] == 200 and lines[1]["path"] == "/hello"
+
+
+def test_formatting_happens_off_the_request_thread(logged_app):
+    """
+    Test that messages are rendered by the listener, not the caller.
+    """
+    _, stream = logged_app
+    threads = []
+    # Bypass pytest's capture handlers, which format on the calling thread.
+    logger = logging.getLogger("probe")
+    logger.propagate = False
+    logger.handlers = [
+        handler
+        for handler in logging.getLogger().handlers
+        if isinstance(handler, DeferredQueueHandler)
+    ]
+
+    class Probe:
+        def __str__(self):
+            threads.append(threading.current_thread())
+            return "probe"
+
+    logger.info("value %s", Probe())
+    logger.debug("hidden %s", Probe())
+    logger.handlers = []
+    logger.propagate = True
+
+    assert read_lines(stream)[0]["message"] == "value probe"
+    assert len(threads) == 1
+    assert threads[0] is not threading.current_thread()
+
+
+def test_configure_is_idempotent(logged_app):
+    """
+    Test that configuring a second app reuses the one queue handler.
+    """
+    configure_logging(Flask("other"))
+    handlers = [
+        handler
+        for handler in logging.getLogger().handlers
+        if isinstance(handler, DeferredQueueHandler)
+    ]
+    assert len(handlers) == 1
+
+
+@pytest.mark.parametrize(
+    "setting, expected",
+    [("debug", logging.DEBUG), ("Warning", logging.WARNING), ("ERROR", logging.ERROR)],
+)
+def test_log_level_is_case_insensitive(logged_app, monkeypatch, setting, expected):
+    """
+    Test that LOG_LEVEL is accepted in any case.
+    """
+    monkeypatch.setenv("LOG_LEVEL", setting)
+    configure_logging(Flask("other"))
+    assert logging.getLogger().level == expected
@@ -0,0 +1,170 @@
+import time
+import hashlib
+import threading
+from functools import wraps
+from collections import OrderedDict
+from flask import current_app, jsonify
+from flask_jwt_extended import JWTManager, jwt_required, get_jwt
+from .revocation import RevocationStore, REVOCATION_FILE
+
+DEFAULT_CACHE_SIZE = 4096
+DEFAULT_CACHE_TTL = 300
+
+
+def token_digest(encoded_token):
+    """
+    Return a fixed-size cache key for an encoded token.
+    """
+    return hashlib.blake2b(encoded_token.encode(), digest_size=16).digest()
+
+
+class ClaimsCache:
+    """
+    LRU cache of verified token claims with a time-to-live.
+
+    Entries are keyed by a digest of the encoded token and expire after
+    ttl seconds or at the token's own ``exp``, whichever comes first, so a
+    cached token can never outlive its signature's validity.
+    """
+
+    def __init__(
+        self, max_size=DEFAULT_CACHE_SIZE, ttl=DEFAULT_CACHE_TTL, clock=time.time
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, encoded_token):
+        """
+        Return the cached claims for a token, or None.
+        """
+        key = token_digest(encoded_token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            claims, expires = entry
+            if expires <= self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return dict(claims)
+
+    def put(self, encoded_token, claims):
+        """
+        Cache the verified claims of a token.
+        """
+        if self.max_size <= 0:
+            return
+        expires = self.clock() + self.ttl
+        if "exp" in claims:
+            expires = min(expires, claims["exp"])
+        key = token_digest(encoded_token)
+        with self._lock:
+            self._entries[key] = (dict(claims), expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Drop every cached entry.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+class CachedJWTManager(JWTManager):
+    """
+    JWTManager that skips signature verification and JSON parsing for
+    tokens it has already verified.
+
+    Only the decode step is cached; token type, freshness and blocklist
+    checks still run on every request. JWT_CLAIMS_CACHE_SIZE and
+    JWT_CLAIMS_CACHE_TTL size the cache; a size of 0 disables it.
+
+    Tokens are checked against the revocation store kept in
+    JWT_REVOCATION_FILE, which defaults to one file shared by all services.
+    """
+
+    def init_app(self, app, add_context_processor=False):
+        super().init_app(app, add_context_processor)
+        self.claims_cache = ClaimsCache(
+            int(app.config.get("JWT_CLAIMS_CACHE_SIZE", DEFAULT_CACHE_SIZE)),
+            float(app.config.get("JWT_CLAIMS_CACHE_TTL", DEFAULT_CACHE_TTL)),
+        )
+        app.extensions["revocation_store"] = RevocationStore(
+            app.config.get("JWT_REVOCATION_FILE", REVOCATION_FILE)
+        )
+        self.token_in_blocklist_loader(token_is_revoked)
+
+    def _decode_jwt_from_config(
+        self, encoded_token, csrf_value=None, allow_expired=False
+    ):
+        if csrf_value is not None or allow_expired:
+            return super()._decode_jwt_from_config(
+                encoded_token, csrf_value, allow_expired
+            )
+        claims = self.claims_cache.get(encoded_token)
+        if claims is None:
+            claims = super()._decode_jwt_from_config(encoded_token)
+            self.claims_cache.put(encoded_token, claims)
+        return claims
+
+
+def get_revocation_store():
+    """
+    Return the revocation store of the current app.
+    """
+    return current_app.extensions["revocation_store"]
+
+
+def token_is_revoked(jwt_header, jwt_payload):
+    """
+    Blocklist loader: True if the token's jti, or the login session
+    (``family``) it belongs to, has been revoked.
+    """
+    store = get_revocation_store()
+    if store.is_revoked(jwt_payload.get("jti")):
+        return True
+    family = jwt_payload.get("family")
+    return family is not None and store.is_revoked(family)
+
+
+def revoke_id(token_id, exp=None):
+    """
+    Revoke a token jti or session family in every service until exp.
+    """
+    get_revocation_store().revoke(token_id, exp)
+
+
+def revoke_token(claims):
+    """
+    Revoke the token with these claims in every service.
+    """
+    revoke_id(claims["jti"], claims.get("exp"))
+
+
+def admin_required(status=403, message="Access denied. Admins only."):
+    """
+    Decorate a view so it needs a valid token with the Admin role.
+
+    Requests from other roles get {"error": message} with status.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        @jwt_required()
+        def wrapper(*args, **kwargs):
+            if get_jwt().get("role") != "Admin":
+                return jsonify({"error": message}), status
+            return view(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
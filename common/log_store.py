@@ -0,0 +1,571 @@
+import os
+import json
+import heapq
+import bisect
+import shutil
+import threading
+from contextlib import contextmanager
+from .snapshot import snapshot_format
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def file_signature(path):
+    """
+    Return the (inode, mtime, size) of a file, or None if it does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+@contextmanager
+def file_lock(path, shared=False):
+    """
+    Hold a lock on path, seen by every process, while the block runs.
+
+    The lock is exclusive unless shared is set; shared holders only
+    exclude exclusive ones. Where flock is unavailable every lock is
+    exclusive. The lock file is created if needed and left in place.
+    """
+    with open(path, "a+b") as file:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+            else:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def unique_path(path, suffix):
+    """
+    Return a sibling of path private to this process and thread.
+    """
+    return f"{path}.{os.getpid()}.{threading.get_ident()}{suffix}"
+
+
+class RecordLog:
+    """
+    Append-only JSON-lines log of store mutations.
+
+    Appends hold a shared lock on a file next to the log and rotation holds
+    it exclusively, so no write can land in a log after it was moved aside.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rotated_path = f"{path}.compacting"
+        self.lock_path = f"{path}.lock"
+
+    def append(self, entry):
+        """
+        Append one entry as a single line.
+        """
+        self.append_many([entry])
+
+    def append_many(self, entries):
+        """
+        Append entries, one line each, with a single write.
+        """
+        data = "".join(
+            json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries
+        )
+        # One write() on an O_APPEND descriptor keeps lines from concurrent
+        # writers intact.
+        with file_lock(self.lock_path, shared=True), open(self.path, "a") as file:
+            file.write(data)
+
+    def read(self, path=None, offset=0):
+        """
+        Read complete entries starting at a byte offset.
+
+        Returns the entries and the offset just past the last complete line,
+        so a line that is still being written is picked up on the next call.
+        """
+        try:
+            with open(path or self.path, "rb") as file:
+                file.seek(offset)
+                data = file.read()
+        except FileNotFoundError:
+            return [], offset
+
+        end = data.rfind(b"\n") + 1
+        entries = []
+        for line in data[:end].splitlines():
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+        return entries, offset + end
+
+    def rotate(self):
+        """
+        Move the live log aside so a snapshot can absorb it.
+
+        If a rotated log is still there because an earlier compaction
+        failed, the live log is appended to it instead of replacing it, so
+        its entries are never lost. Returns the offset in the rotated log
+        where the live log's entries start, or None if there was no live
+        log.
+        """
+        with file_lock(self.lock_path):
+            if not os.path.exists(self.rotated_path):
+                try:
+                    os.replace(self.path, self.rotated_path)
+                except FileNotFoundError:
+                    return None
+                return 0
+
+            moving_path = unique_path(self.path, ".moving")
+            try:
+                os.replace(self.path, moving_path)
+            except FileNotFoundError:
+                return None
+            with open(self.rotated_path, "a+b") as target:
+                # Keep a torn last line from swallowing the first moved entry.
+                if target.tell():
+                    target.seek(-1, os.SEEK_END)
+                    if target.read(1) != b"\n":
+                        target.write(b"\n")
+                start = target.tell()
+                with open(moving_path, "rb") as source:
+                    shutil.copyfileobj(source, target)
+            os.remove(moving_path)
+            return start
+
+    def discard(self, include_live=False):
+        """
+        Remove the rotated log, and the live log too if asked.
+        """
+        paths = [self.rotated_path, self.path] if include_live else [self.rotated_path]
+        with file_lock(self.lock_path):
+            for path in paths:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+
+class LogStore:
+    """
+    Keyed record store backed by a snapshot file plus an append-only log.
+
+    The snapshot is a data file in the format its extension selects (see
+    common.snapshot), by default Python-literal (``name = [...]``). Each
+    mutation appends one entry to the log instead of rewriting the snapshot,
+    and the in-memory state is the snapshot with the log replayed over it.
+    Once enough entries pile up, a background thread folds them into a new
+    snapshot. Log entries are keyed upserts and deletes, so replaying an
+    entry that is already part of the snapshot is harmless.
+
+    Subclasses set ``variable`` and implement ``key``. Setting ``ordered``
+    also keeps a sorted list of keys for keyset pagination with ``page``;
+    keys must then be mutually comparable. Overriding ``decode`` and
+    ``encode`` lets records be held in memory in a different form from the
+    plain literals written to the snapshot and log, and ``on_change`` and
+    ``on_reset`` let subclasses keep derived indexes in step.
+    """
+
+    variable = None
+    ordered = False
+    compact_threshold = 1000
+
+    def __init__(self, path, log_path=None, compact_threshold=None):
+        self.path = path
+        self.log = RecordLog(log_path or f"{os.path.splitext(path)[0]}.log")
+        self.lock_path = f"{self.path}.lock"
+        if compact_threshold is not None:
+            self.compact_threshold = compact_threshold
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._records = {}
+        self._sorted_keys = []
+        self._snapshot_signature = None
+        self._log_signature = None
+        self._log_offset = 0
+        self._log_entries = 0
+        self._rotated = False
+        self._compacting = False
+        self._version = 0
+
+    def key(self, record):
+        """
+        Return the key a record is stored under.
+        """
+        raise NotImplementedError
+
+    def decode(self, record):
+        """
+        Convert a record read from disk to its in-memory form.
+        """
+        return record
+
+    def encode(self, record):
+        """
+        Convert an in-memory record to the literal written to disk.
+        """
+        return record
+
+    def on_change(self, key, record):
+        """
+        Called under the lock after the record under key is put, or
+        deleted when record is None.
+        """
+
+    def on_reset(self):
+        """
+        Called under the lock after every record has been replaced.
+        """
+
+    # Snapshot file
+
+    def _read_snapshot(self):
+        # A missing snapshot is an empty store, but one that fails to parse
+        # raises SnapshotError rather than being replaced by an empty list.
+        try:
+            return snapshot_format(self.path).read(self.path, self.variable)
+        except FileNotFoundError:
+            return []
+
+    def _write_snapshot(self, records):
+        temp_path = unique_path(self.path, ".tmp")
+        try:
+            snapshot_format(self.path).write(
+                temp_path, self.variable, [self.encode(record) for record in records]
+            )
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        return temp_path
+
+    # Replay
+
+    def _apply(self, entry):
+        op = entry.get("op")
+        if op == "put":
+            record = self.decode(entry["record"])
+            key = self.key(record)
+            if self.ordered and key not in self._records:
+                bisect.insort(self._sorted_keys, key)
+            self._records[key] = record
+            self.on_change(key, record)
+        elif op == "delete":
+            key = entry["key"]
+            if self._records.pop(key, None) is not None:
+                if self.ordered:
+                    del self._sorted_keys[bisect.bisect_left(self._sorted_keys, key)]
+                self.on_change(key, None)
+        self._log_entries += 1
+        self._version += 1
+
+    def _set_records(self, records):
+        self._records = {}
+        for record in records:
+            record = self.decode(record)
+            self._records.setdefault(self.key(record), record)
+        self._sorted_keys = sorted(self._records) if self.ordered else []
+        self._log_entries = 0
+        self._version += 1
+        self.on_reset()
+
+    def _reload(self):
+        snapshot_signature = file_signature(self.path)
+        log_signature = file_signature(self.log.path)
+
+        self._set_records(self._read_snapshot())
+        entries, _ = self.log.read(self.log.rotated_path)
+        for entry in entries:
+            self._apply(entry)
+        entries, self._log_offset = self.log.read()
+        for entry in entries:
+            self._apply(entry)
+
+        self._snapshot_signature = snapshot_signature
+        self._log_signature = log_signature
+        self._loaded = True
+
+    def _tail(self, log_signature):
+        entries, self._log_offset = self.log.read(offset=self._log_offset)
+        for entry in entries:
+            self._apply(entry)
+        self._log_signature = log_signature
+
+    def _refresh_locked(self):
+        snapshot_signature = file_signature(self.path)
+        log_signature = file_signature(self.log.path)
+        if (
+            self._loaded
+            and snapshot_signature == self._snapshot_signature
+            and log_signature == self._log_signature
+        ):
+            return
+
+        same_log = (
+            self._log_signature is not None
+            and log_signature is not None
+            and log_signature[0] == self._log_signature[0]
+            and log_signature[2] >= self._log_offset
+        )
+        # A log that appeared since the last look can be tailed from the
+        # start, unless another process rotated a log in between.
+        new_log = self._log_signature is None and (
+            self._rotated or not os.path.exists(self.log.rotated_path)
+        )
+        if (
+            self._loaded
+            and snapshot_signature == self._snapshot_signature
+            and (same_log or new_log)
+        ):
+            self._tail(log_signature)
+        else:
+            self._reload()
+
+    def refresh(self):
+        """
+        Pick up snapshot or log changes made since the last call.
+        """
+        if (
+            self._loaded
+            and file_signature(self.path) == self._snapshot_signature
+            and file_signature(self.log.path) == self._log_signature
+        ):
+            return
+        with self._lock:
+            self._refresh_locked()
+
+    # Reads
+
+    def all(self):
+        """
+        Return a copy of all records in insertion order.
+        """
+        self.refresh()
+        return list(self._records.values())
+
+    def get(self, key):
+        """
+        Return the record stored under key, or None.
+        """
+        self.refresh()
+        return self._records.get(key)
+
+    def page(self, after=None, limit=50):
+        """
+        Return up to limit records with keys greater than after, in key
+        order, and the key to continue from (None on the last page).
+        """
+        self.refresh()
+        with self._lock:
+            keys = self._sorted_keys
+            try:
+                start = 0 if after is None else bisect.bisect_right(keys, after)
+            except TypeError:
+                raise ValueError("Invalid cursor")
+            page_keys = keys[start : start + limit]
+            items = [self._records[key] for key in page_keys]
+            more = start + limit < len(keys)
+        return items, (page_keys[-1] if more and page_keys else None)
+
+    @property
+    def version(self):
+        """
+        Counter that increases whenever the in-memory records change.
+        """
+        self.refresh()
+        return self._version
+
+    def __len__(self):
+        self.refresh()
+        return len(self._records)
+
+    # Writes
+
+    def _encode_checked(self, record):
+        """
+        Encode a record, raising ValueError if the snapshot format could
+        not hold it, so it is rejected before it reaches the log.
+        """
+        encoded = self.encode(record)
+        snapshot_format(self.path).check(encoded)
+        return encoded
+
+    def put(self, record):
+        """
+        Insert or replace a record by appending one log entry.
+        """
+        with self._lock:
+            self._refresh_locked()
+            self.log.append({"op": "put", "record": self._encode_checked(record)})
+            self._refresh_locked()
+            self._maybe_compact()
+        return record
+
+    def put_many(self, records):
+        """
+        Insert or replace several records with one append to the log.
+        """
+        records = list(records)
+        with self._lock:
+            self._refresh_locked()
+            if records:
+                self.log.append_many(
+                    [
+                        {"op": "put", "record": self._encode_checked(record)}
+                        for record in records
+                    ]
+                )
+                self._refresh_locked()
+                self._maybe_compact()
+        return records
+
+    def delete_many(self, keys):
+        """
+        Delete several records with one append to the log. Returns the keys
+        that existed and were deleted.
+        """
+        with self._lock:
+            self._refresh_locked()
+            deleted = [key for key in dict.fromkeys(keys) if key in self._records]
+            if deleted:
+                self.log.append_many([{"op": "delete", "key": key} for key in deleted])
+                self._refresh_locked()
+                self._maybe_compact()
+        return deleted
+
+    def delete(self, key):
+        """
+        Delete a record by key. Returns False if it does not exist.
+        """
+        with self._lock:
+            self._refresh_locked()
+            if key not in self._records:
+                return False
+            self.log.append({"op": "delete", "key": key})
+            self._refresh_locked()
+            self._maybe_compact()
+        return True
+
+    def replace(self, records):
+        """
+        Replace every record with a fresh snapshot and an empty log.
+        """
+        with file_lock(self.lock_path), self._lock:
+            records = list(records)
+            temp_path = self._write_snapshot(records)
+            os.replace(temp_path, self.path)
+            self.log.discard(include_live=True)
+            self._set_records(records)
+            self._snapshot_signature = file_signature(self.path)
+            self._log_signature = None
+            self._log_offset = 0
+            self._loaded = True
+
+    # Compaction
+
+    def _maybe_compact(self):
+        if self._log_entries < self.compact_threshold or self._compacting:
+            return
+        self._compacting = True
+        threading.Thread(target=self._background_compact, daemon=True).start()
+
+    def _background_compact(self):
+        try:
+            self.compact()
+        finally:
+            self._compacting = False
+
+    def compact(self):
+        """
+        Fold the log into a new snapshot.
+
+        The log is rotated under the lock, the snapshot is written without
+        holding it, and the swap happens under the lock again. Readers in
+        between replay the rotated log on top of the old snapshot.
+
+        Compactions are serialized across processes by a lock file next to
+        the snapshot. Entries other processes appended between the refresh
+        and the rotation are read back from the rotated log, so the new
+        snapshot holds them too. If writing the snapshot fails the rotated
+        log is kept, and the next compaction appends to it rather than
+        replacing it.
+        """
+        with file_lock(self.lock_path):
+            with self._lock:
+                self._refresh_locked()
+                start = self.log.rotate()
+                if start is not None:
+                    entries, _ = self.log.read(
+                        self.log.rotated_path, start + self._log_offset
+                    )
+                    for entry in entries:
+                        self._apply(entry)
+                records = list(self._records.values())
+                self._rotated = True
+                self._log_signature = None
+                self._log_offset = 0
+                self._log_entries = 0
+
+            temp_path = self._write_snapshot(records)
+
+            with self._lock:
+                os.replace(temp_path, self.path)
+                self.log.discard()
+                self._rotated = False
+                self._snapshot_signature = file_signature(self.path)
+
+
+class ExpiringLogStore(LogStore):
+    """
+    LogStore whose records carry an ``exp`` timestamp (None for never).
+
+    Keys are also kept in a heap ordered by expiry, maintained through
+    on_change and on_reset, so finding the expired records costs only
+    their number, not a scan of the store. Heap entries left behind when a
+    record is replaced or deleted are skipped when they reach the top.
+    Subclasses that override on_change or on_reset must call these.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._expiry = []
+
+    def on_change(self, key, record):
+        if record is not None and record["exp"] is not None:
+            heapq.heappush(self._expiry, (record["exp"], key))
+
+    def on_reset(self):
+        self._expiry = [
+            (record["exp"], key)
+            for key, record in self._records.items()
+            if record["exp"] is not None
+        ]
+        heapq.heapify(self._expiry)
+
+    def _expired(self, now):
+        """
+        Pop and return the keys of records that expired by now. Call under
+        the lock.
+        """
+        expired = []
+        while self._expiry and self._expiry[0][0] <= now:
+            exp, key = heapq.heappop(self._expiry)
+            record = self._records.get(key)
+            if record is not None and record["exp"] == exp:
+                expired.append(key)
+        return expired
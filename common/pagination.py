@@ -0,0 +1,69 @@
+import json
+import base64
+import binascii
+from urllib.parse import urlencode
+from flask import request
+from .response_cache import etag_json_response
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(key):
+    """
+    Encode the last key of a page as an opaque cursor.
+    """
+    raw = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def wants_page(args):
+    """
+    Return True if the query string asks for a paginated response.
+    """
+    return "limit" in args or "cursor" in args
+
+
+def parse_page_args(args):
+    """
+    Return (limit, after_key) from the limit and cursor query parameters.
+    """
+    try:
+        limit = int(args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    cursor = args.get("cursor")
+    return limit, (decode_cursor(cursor) if cursor else None)
+
+
+def next_link(next_cursor):
+    """
+    Build a Link header value pointing at the page after the current request.
+    """
+    args = request.args.to_dict()
+    args["cursor"] = next_cursor
+    return f'<{request.base_url}?{urlencode(args)}>; rel="next"'
+
+
+def page_response(items, next_key):
+    """
+    Build a JSON page with its next cursor in the body and a Link header.
+    """
+    next_cursor = encode_cursor(next_key) if next_key is not None else None
+    response = etag_json_response({"items": items, "next_cursor": next_cursor})
+    if next_cursor is not None:
+        response.headers["Link"] = next_link(next_cursor)
+    return response
@@ -0,0 +1,81 @@
+import hashlib
+import threading
+from flask import current_app, request
+
+
+def encode_json(data):
+    """
+    Serialize data the way jsonify does and return the bytes.
+    """
+    return (current_app.json.dumps(data) + "\n").encode()
+
+
+def make_etag(body):
+    """
+    Return a strong ETag for an encoded body.
+    """
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+class ResponseCache:
+    """
+    Encoded JSON response bodies and their ETags keyed by name and version.
+
+    A body is serialized and hashed once per version of the data behind it
+    and then served as-is until the version moves.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, name, version, load):
+        """
+        Return (body, etag) for name at version, building it with load()
+        on a miss.
+        """
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == version:
+            return entry[1], entry[2]
+        # The version is read before load() runs, so data newer than the
+        # version can only cause an extra rebuild, never a stale hit.
+        body = encode_json(load())
+        etag = make_etag(body)
+        with self._lock:
+            self._entries[name] = (version, body, etag)
+        return body, etag
+
+
+def get_response_cache():
+    """
+    Return the response cache of the current app.
+    """
+    return current_app.extensions.setdefault("response_cache", ResponseCache())
+
+
+def conditional_response(body, etag, status=200):
+    """
+    Build a JSON response carrying etag, or a 304 if the client has it.
+    """
+    response = current_app.response_class(
+        body, status=status, mimetype=current_app.json.mimetype
+    )
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+
+def cached_json_response(name, version, load, status=200):
+    """
+    Build a conditional JSON response from the cached body for name at
+    version.
+    """
+    body, etag = get_response_cache().get(name, version, load)
+    return conditional_response(body, etag, status)
+
+
+def etag_json_response(data, status=200):
+    """
+    Build a conditional JSON response for data that is not worth caching.
+    """
+    body = encode_json(data)
+    return conditional_response(body, make_etag(body), status)
@@ -0,0 +1,64 @@
+import os
+import time
+from .log_store import ExpiringLogStore
+
+REVOCATION_FILE = os.path.join(os.path.dirname(__file__), "../revoked_tokens.py")
+# Seconds between checks for revocations written by other processes.
+DEFAULT_REFRESH_INTERVAL = 1.0
+
+
+class RevocationStore(ExpiringLogStore):
+    """
+    Revoked token ids, shared by every service through one data file.
+
+    Each revocation is a {"jti", "exp"} record appended to the log, so all
+    processes see it. A lookup is one set-membership test on the resident
+    records; the files are checked for other processes' revocations at
+    most once per refresh_interval, so the hot path does no system calls.
+    Entries are dropped once the token they block has expired, since the
+    signature check rejects it from then on anyway; they are found through
+    the expiry heap, so a revoke does not scan every entry.
+    """
+
+    variable = "revoked"
+
+    def __init__(
+        self,
+        path=REVOCATION_FILE,
+        log_path=None,
+        refresh_interval=DEFAULT_REFRESH_INTERVAL,
+        clock=time.time,
+    ):
+        super().__init__(path, log_path)
+        self.refresh_interval = refresh_interval
+        self.clock = clock
+        self._next_refresh = 0.0
+
+    def key(self, record):
+        return record["jti"]
+
+    def is_revoked(self, jti):
+        """
+        Return True if the token with this jti has been revoked.
+        """
+        now = time.monotonic()
+        if now >= self._next_refresh:
+            self.refresh()
+            self._next_refresh = now + self.refresh_interval
+        return jti in self._records
+
+    def revoke(self, jti, exp=None):
+        """
+        Revoke a token until its exp (forever if None), dropping entries
+        that have expired, with a single log append.
+        """
+        now = self.clock()
+        with self._lock:
+            self._refresh_locked()
+            entries = [
+                {"op": "delete", "key": key} for key in self._expired(now) if key != jti
+            ]
+            entries.append({"op": "put", "record": {"jti": jti, "exp": exp}})
+            self.log.append_many(entries)
+            self._refresh_locked()
+            self._maybe_compact()
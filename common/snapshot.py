@@ -0,0 +1,414 @@
+import os
+import ast
+import sys
+import json
+import math
+import mmap
+import struct
+import argparse
+
+BINARY_MAGIC = b"SNAP"
+BINARY_VERSION = 1
+
+# magic, format version, field count, record count, string count
+HEADER = struct.Struct("<4sHHII")
+FIELD = struct.Struct("<I")
+STRING_OFFSET = struct.Struct("<Q")
+# Every field of every record is one fixed-width (tag, payload) slot.
+SLOT = struct.Struct("<Bq")
+FLOAT = struct.Struct("<d")
+
+ABSENT, NONE, FALSE, TRUE, INT, FLOAT_TAG, STRING = range(7)
+
+
+class SnapshotError(Exception):
+    """
+    A data file exists but could not be parsed.
+
+    Not a ValueError, which views report as a bad request: a broken data
+    file is a server fault, and its message names the file's path.
+    """
+
+
+def check_records(path, records):
+    """
+    Return records if they are a list of dicts, else raise SnapshotError.
+    """
+    if not isinstance(records, list) or not all(
+        isinstance(record, dict) for record in records
+    ):
+        raise SnapshotError(f"{path}: expected a list of records")
+    return records
+
+
+class SnapshotFormat:
+    """
+    Base class for data file formats.
+    """
+
+    def check(self, record):
+        """
+        Raise ValueError if record could not be written in this format.
+        """
+
+
+class PythonSnapshot(SnapshotFormat):
+    """
+    Python-literal data file: ``name = [...]``.
+    """
+
+    def read(self, path, variable):
+        with open(path, "r") as file:
+            content = file.read()
+        try:
+            records = ast.literal_eval(content.split("=", 1)[1].strip())
+        except (IndexError, SyntaxError, ValueError) as error:
+            raise SnapshotError(f"{path}: {error}")
+        return check_records(path, records)
+
+    def check(self, record):
+        # repr() writes nan and inf, which literal_eval cannot read back.
+        values = [record]
+        while values:
+            value = values.pop()
+            if isinstance(value, dict):
+                values.extend(value.values())
+            elif isinstance(value, (list, tuple)):
+                values.extend(value)
+            elif isinstance(value, float) and not math.isfinite(value):
+                raise ValueError(f"Unsupported value: {value}")
+
+    def write(self, path, variable, records):
+        with open(path, "w") as file:
+            file.write(f"{variable} = {list(records)}")
+
+
+class JsonSnapshot(SnapshotFormat):
+    """
+    JSON data file holding one array of records.
+    """
+
+    def read(self, path, variable):
+        with open(path, "r", encoding="utf-8") as file:
+            try:
+                records = json.load(file)
+            except ValueError as error:
+                raise SnapshotError(f"{path}: {error}")
+        return check_records(path, records)
+
+    def write(self, path, variable, records):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(list(records), file, separators=(",", ":"))
+
+
+class JsonLinesSnapshot(SnapshotFormat):
+    """
+    JSON-lines data file with one record per line.
+    """
+
+    def read(self, path, variable):
+        records = []
+        with open(path, "r", encoding="utf-8") as file:
+            for number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError as error:
+                    raise SnapshotError(f"{path}, line {number}: {error}")
+        return check_records(path, records)
+
+    def write(self, path, variable, records):
+        with open(path, "w", encoding="utf-8") as file:
+            for record in records:
+                file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+class BinaryReader:
+    """
+    Read-only view of a binary snapshot through mmap.
+
+    Records are decoded when they are indexed or iterated, and each string
+    in the string table is decoded at most once and then shared.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            try:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise SnapshotError(f"{path} is not a binary snapshot")
+        try:
+            magic, version, field_count, record_count, string_count = (
+                HEADER.unpack_from(self._map, 0)
+            )
+        except struct.error:
+            self._map.close()
+            raise SnapshotError(f"{path} is not a binary snapshot")
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            self._map.close()
+            raise SnapshotError(f"{path} is not a version {BINARY_VERSION} snapshot")
+
+        self._record_count = record_count
+        self._string_count = string_count
+        self._strings = [None] * string_count
+        self._records_offset = HEADER.size + field_count * FIELD.size
+        self._record_size = field_count * SLOT.size
+        self._offsets_offset = self._records_offset + record_count * self._record_size
+        self._data_offset = (
+            self._offsets_offset + (string_count + 1) * STRING_OFFSET.size
+        )
+        self.fields = [
+            self._string(FIELD.unpack_from(self._map, HEADER.size + i * FIELD.size)[0])
+            for i in range(field_count)
+        ]
+
+    def _string(self, index):
+        value = self._strings[index]
+        if value is None:
+            position = self._offsets_offset + index * STRING_OFFSET.size
+            start = STRING_OFFSET.unpack_from(self._map, position)[0]
+            end = STRING_OFFSET.unpack_from(self._map, position + STRING_OFFSET.size)[0]
+            value = self._map[self._data_offset + start : self._data_offset + end]
+            value = self._strings[index] = sys.intern(value.decode("utf-8"))
+        return value
+
+    def __len__(self):
+        return self._record_count
+
+    def __getitem__(self, index):
+        if not 0 <= index < self._record_count:
+            raise IndexError("record index out of range")
+        record = {}
+        position = self._records_offset + index * self._record_size
+        for field in self.fields:
+            tag, payload = SLOT.unpack_from(self._map, position)
+            position += SLOT.size
+            if tag == ABSENT:
+                continue
+            if tag == STRING:
+                record[field] = self._string(payload)
+            elif tag == INT:
+                record[field] = payload
+            elif tag == FLOAT_TAG:
+                record[field] = FLOAT.unpack(struct.pack("<q", payload))[0]
+            else:
+                record[field] = {NONE: None, FALSE: False, TRUE: True}[tag]
+        return record
+
+    def __iter__(self):
+        for index in range(self._record_count):
+            yield self[index]
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class BinarySnapshot(SnapshotFormat):
+    """
+    Versioned binary data file read through mmap.
+
+    The file is a fixed header, the field names, one fixed-width slot per
+    field per record, and a string table of offsets plus UTF-8 data. Record
+    values are None, booleans, 64-bit integers, floats or strings.
+    """
+
+    def read(self, path, variable):
+        with BinaryReader(path) as reader:
+            return list(reader)
+
+    def _slot(self, value, string_index):
+        if value is None:
+            return NONE, 0
+        if value is True or value is False:
+            return (TRUE if value else FALSE), 0
+        if isinstance(value, int):
+            if not -(2**63) <= value < 2**63:
+                raise ValueError(f"Integer out of range: {value}")
+            return INT, value
+        if isinstance(value, float):
+            return FLOAT_TAG, struct.unpack("<q", FLOAT.pack(value))[0]
+        if isinstance(value, str):
+            return STRING, string_index(value)
+        raise ValueError(f"Unsupported value type: {type(value).__name__}")
+
+    def check(self, record):
+        for field, value in record.items():
+            field.encode("utf-8")
+            if isinstance(value, str):
+                value.encode("utf-8")
+            else:
+                self._slot(value, lambda value: 0)
+
+    def write(self, path, variable, records):
+        records = list(records)
+        strings = {}
+
+        def string_index(value):
+            return strings.setdefault(value, len(strings))
+
+        fields = []
+        for record in records:
+            for field in record:
+                if field not in fields:
+                    fields.append(field)
+        field_indexes = [string_index(field) for field in fields]
+
+        slots = bytearray()
+        for record in records:
+            for field in fields:
+                if field in record:
+                    slots += SLOT.pack(*self._slot(record[field], string_index))
+                else:
+                    slots += SLOT.pack(ABSENT, 0)
+
+        encoded = [value.encode("utf-8") for value in strings]
+        offsets = [0]
+        for value in encoded:
+            offsets.append(offsets[-1] + len(value))
+
+        with open(path, "wb") as file:
+            file.write(
+                HEADER.pack(
+                    BINARY_MAGIC, BINARY_VERSION, len(fields), len(records), len(strings)
+                )
+            )
+            for index in field_indexes:
+                file.write(FIELD.pack(index))
+            file.write(slots)
+            for offset in offsets:
+                file.write(STRING_OFFSET.pack(offset))
+            file.write(b"".join(encoded))
+
+
+SNAPSHOT_FORMATS = {
+    ".py": PythonSnapshot(),
+    ".json": JsonSnapshot(),
+    ".jsonl": JsonLinesSnapshot(),
+    ".snap": BinarySnapshot(),
+}
+
+# Names accepted by the *_SNAPSHOT_FORMAT settings.
+FORMAT_EXTENSIONS = {
+    "python": ".py",
+    "json": ".json",
+    "jsonl": ".jsonl",
+    "binary": ".snap",
+}
+
+
+def snapshot_format(path):
+    """
+    Return the snapshot format for a data file, chosen by its extension.
+    """
+    extension = os.path.splitext(path)[1]
+    try:
+        return SNAPSHOT_FORMATS[extension]
+    except KeyError:
+        raise ValueError(f"Unknown snapshot format: {extension or path}")
+
+
+def snapshot_path(path, name):
+    """
+    Return the path a data file is kept at in the named format.
+    """
+    try:
+        extension = FORMAT_EXTENSIONS[name]
+    except KeyError:
+        raise ValueError(f"Unknown snapshot format: {name}")
+    return f"{os.path.splitext(path)[0]}{extension}"
+
+
+def read_snapshot(path, variable=None):
+    """
+    Read every record from a data file in any known format.
+    """
+    return snapshot_format(path).read(path, variable)
+
+
+def convert_snapshot(source, target, variable):
+    """
+    Rewrite the data file at source in the format of target.
+    """
+    records = snapshot_format(source).read(source, variable)
+    temp_path = f"{target}.tmp"
+    snapshot_format(target).write(temp_path, variable, records)
+    os.replace(temp_path, target)
+    return len(records)
+
+
+def ensure_snapshot(source, target, variable):
+    """
+    Convert source to target unless target already exists, and return target.
+    """
+    if not os.path.exists(target) and os.path.exists(source):
+        convert_snapshot(source, target, variable)
+    return target
+
+
+def verify_snapshots(paths):
+    """
+    Parse each data file and check that they all hold the same records.
+
+    Returns a list of problems, empty if every file is readable and equal.
+    """
+    problems = []
+    expected = None
+    for path in paths:
+        try:
+            records = read_snapshot(path)
+        except (OSError, ValueError, SnapshotError) as error:
+            problems.append(str(error))
+            continue
+        if expected is None:
+            expected = (path, records)
+        elif records != expected[1]:
+            problems.append(f"{path} differs from {expected[0]}")
+    return problems
+
+
+def main(argv=None):
+    """
+    Convert and verify data files from the command line.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m common.snapshot",
+        description="Convert and verify *_data files. The format follows the "
+        "extension: " + ", ".join(SNAPSHOT_FORMATS) + ".",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    convert = commands.add_parser("convert", help="rewrite a data file in another format")
+    convert.add_argument("source")
+    convert.add_argument("target")
+    convert.add_argument("variable", help="list name used by .py files, e.g. users")
+    verify = commands.add_parser(
+        "verify", help="check that data files parse and hold the same records"
+    )
+    verify.add_argument("paths", nargs="+")
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        try:
+            count = convert_snapshot(args.source, args.target, args.variable)
+        except (OSError, ValueError, SnapshotError) as error:
+            print(error, file=sys.stderr)
+            return 1
+        print(f"Wrote {count} {args.variable} to {args.target}")
+        return 0
+
+    problems = verify_snapshots(args.paths)
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    if not problems:
+        print(f"OK: {len(read_snapshot(args.paths[0]))} records")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+from .snapshot import SNAPSHOT_FORMATS, read_snapshot, snapshot_format
+
+DEFAULT_COUNTS = (1000, 10000, 100000)
+
+
+def make_records(count):
+    """
+    Build booking-like records with repeated emails and destinations.
+    """
+    destinations = ("Paris", "New York", "Tokyo", "Sydney", "Cairo")
+    return [
+        {
+            "id": index,
+            "user_email": f"user{index % 1000}@example.com",
+            "booking_date_time": "2024-11-21T12:30:00",
+            "departure_time": "2024-12-01T08:00:00",
+            "arrival_time": "2024-12-01T12:30:00",
+            "destination": destinations[index % len(destinations)],
+            "stay_duration_days": index % 14 + 1,
+        }
+        for index in range(count)
+    ]
+
+
+def time_load(path, repeat):
+    """
+    Return the best wall-clock time of reading path repeat times.
+    """
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        read_snapshot(path, "bookings")
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(counts=DEFAULT_COUNTS, repeat=3, directory=None):
+    """
+    Time loading each snapshot format at each record count.
+
+    Returns rows of (format extension, record count, seconds, file size).
+    """
+    rows = []
+    with tempfile.TemporaryDirectory(dir=directory) as temp_dir:
+        for count in counts:
+            records = make_records(count)
+            for extension in SNAPSHOT_FORMATS:
+                path = os.path.join(temp_dir, f"bookings_{count}{extension}")
+                snapshot_format(path).write(path, "bookings", records)
+                rows.append(
+                    (extension, count, time_load(path, repeat), os.path.getsize(path))
+                )
+    return rows
+
+
+def main(argv=None):
+    """
+    Print load time against record count for every snapshot format.
+    """
+    parser = argparse.ArgumentParser(prog="python -m common.snapshot_benchmark")
+    parser.add_argument("counts", nargs="*", type=int, default=list(DEFAULT_COUNTS))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'format':<8}{'records':>10}{'load ms':>12}{'size KiB':>12}")
+    for extension, count, seconds, size in run(args.counts, args.repeat):
+        print(f"{extension:<8}{count:>10}{seconds * 1000:>12.1f}{size / 1024:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
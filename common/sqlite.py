@@ -0,0 +1,78 @@
+import sqlite3
+import weakref
+import threading
+
+
+class ThreadConnection:
+    """
+    Holder for one thread's connection, kept in the pool's thread-local
+    storage so it is dropped when the thread ends.
+    """
+
+    __slots__ = ("connection", "close", "__weakref__")
+
+
+class ConnectionPool:
+    """
+    One SQLite connection per thread, opened in WAL journal mode.
+
+    WAL lets readers proceed while a writer holds the database, which is
+    what several request threads and worker processes need. A thread's
+    connection is reused for its whole life and closed once the thread has
+    ended, so servers that start a thread per request do not leak one.
+    """
+
+    def __init__(self, path, timeout=30):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def connection(self):
+        """
+        Return the calling thread's connection, opening it on first use.
+        """
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            # Connections stay with their thread; check_same_thread is off
+            # only so they can be closed from whichever thread drops them.
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            holder = ThreadConnection()
+            holder.connection = connection
+            # Runs when the thread's local storage is cleared at thread exit.
+            holder.close = weakref.finalize(holder, self._discard, connection)
+            self._local.holder = holder
+            with self._lock:
+                self._connections.append(connection)
+        return holder.connection
+
+    def _discard(self, connection):
+        with self._lock:
+            if connection in self._connections:
+                self._connections.remove(connection)
+        connection.close()
+
+    def release(self):
+        """
+        Close the calling thread's connection, if it has one. The next call
+        to connection() from this thread opens a new one.
+        """
+        holder = getattr(self._local, "holder", None)
+        if holder is not None:
+            self._local.holder = None
+            holder.close()
+
+    def close(self):
+        """
+        Close every connection opened by this pool.
+        """
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+        self._local = threading.local()
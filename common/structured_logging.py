@@ -0,0 +1,161 @@
+import os
+import sys
+import json
+import time
+import uuid
+import queue
+import atexit
+import logging
+import threading
+import contextvars
+from logging.handlers import QueueHandler, QueueListener
+from flask import g, request
+
+CORRELATION_HEADER = "X-Request-ID"
+
+correlation_id = contextvars.ContextVar("correlation_id", default=None)
+
+# Attributes every LogRecord has; anything else came in through ``extra``.
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "taskName"}
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+class CorrelationFilter(logging.Filter):
+    """
+    Stamp each record with the correlation id of the request that made it.
+
+    Runs on the calling thread, before the record is queued, so the id is
+    still in context.
+    """
+
+    def filter(self, record):
+        record.correlation_id = correlation_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format a record as one JSON object per line, with ``extra`` fields.
+    """
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name, value in vars(record).items():
+            if name not in RECORD_ATTRIBUTES and value is not None:
+                entry[name] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves message formatting to the listener thread.
+
+    The stock handler renders the message on the calling thread. Records
+    stay in this process, so they are queued as they are and the request
+    thread only pays for the level check and a queue put. Log arguments
+    should therefore not be mutated after the call.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def start_listener(stream=None):
+    """
+    Start the process-wide log listener and return its queue handler.
+
+    The queue is unbounded, so logging never blocks or drops on the
+    request thread; the listener thread does the formatting and writing.
+    """
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            log_queue = queue.SimpleQueue()
+            output = logging.StreamHandler(stream or sys.stdout)
+            output.setFormatter(JsonFormatter())
+            _listener = QueueListener(log_queue, output, respect_handler_level=True)
+            _listener.start()
+            atexit.register(stop_listener)
+        return DeferredQueueHandler(_listener.queue)
+
+
+def stop_listener():
+    """
+    Flush queued records, stop the listener thread and detach its queue
+    handler.
+    """
+    global _listener
+    with _listener_lock:
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            if isinstance(handler, DeferredQueueHandler):
+                root.removeHandler(handler)
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def configure_logging(app, level=None, stream=None):
+    """
+    Send this process's logs through the queue as JSON lines and give
+    every request a correlation id.
+
+    The id is taken from the X-Request-ID header, or generated, and is
+    echoed back in the response. LOG_LEVEL in the app config (or the
+    environment) sets the level; records below it are dropped before any
+    formatting is done. Output goes to stream, stdout by default.
+    """
+    level = level or app.config.get("LOG_LEVEL") or os.environ.get("LOG_LEVEL") or "INFO"
+    if isinstance(level, str):
+        level = level.upper()
+    root = logging.getLogger()
+    root.setLevel(level)
+    if not any(isinstance(handler, DeferredQueueHandler) for handler in root.handlers):
+        handler = start_listener(stream)
+        handler.addFilter(CorrelationFilter())
+        root.addHandler(handler)
+
+    logger = logging.getLogger(app.import_name)
+
+    @app.before_request
+    def start_request():
+        g.correlation_id = request.headers.get(CORRELATION_HEADER) or uuid.uuid4().hex
+        g.request_started = time.perf_counter()
+        correlation_id.set(g.correlation_id)
+
+    @app.after_request
+    def finish_request(response):
+        if "correlation_id" not in g:
+            return response
+        response.headers[CORRELATION_HEADER] = g.correlation_id
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "%s %s %s",
+                request.method,
+                request.path,
+                response.status_code,
+                extra={
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    "duration_ms": round(
+                        (time.perf_counter() - g.request_started) * 1000, 2
+                    ),
+                },
+            )
+        return response
+
+    @app.teardown_request
+    def end_request(error):
+        correlation_id.set(None)
+
+    return logger
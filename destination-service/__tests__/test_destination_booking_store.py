@@ -0,0 +1,128 @@
+import pytest
+from models.booking_store import BookingStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    """
+    Provide a booking store with a handful of bookings.
+    """
+    store = BookingStore(str(tmp_path / "bookings_data.py"))
+    store.replace(
+        [
+            {
+                "id": 3,
+                "user_email": "john@example.com",
+                "booking_date_time": "2024-11-23T09:45:00",
+                "departure_time": "2024-12-10T09:00:00",
+                "destination": "New York",
+            },
+            {
+                "id": 1,
+                "user_email": "john@example.com",
+                "booking_date_time": "2024-11-21T12:30:00",
+                "departure_time": "2024-12-01T08:00:00",
+                "destination": "Paris",
+            },
+            {
+                "id": 2,
+                "user_email": "jane@example.com",
+                "booking_date_time": "2024-11-22T15:00:00",
+                "departure_time": "2024-12-05T10:00:00",
+                "destination": "New York",
+            },
+        ]
+    )
+    return store
+
+
+def ids(bookings):
+    return [booking.id for booking in bookings]
+
+
+def test_equality_filters(store):
+    """
+    Test the hash indexes on destination and user_email.
+    """
+    assert ids(store.query(destination="New York")) == [2, 3]
+    assert ids(store.query(user_email="john@example.com")) == [1, 3]
+    assert ids(store.query(destination="New York", user_email="john@example.com")) == [3]
+    assert store.query(destination="Tokyo") == []
+
+
+def test_range_filters(store):
+    """
+    Test the sorted indexes on departure and booking times.
+    """
+    assert ids(store.query(departure_from="2024-12-05T10:00:00")) == [2, 3]
+    assert ids(store.query(departure_to="2024-12-05T10:00:00")) == [1, 2]
+    assert ids(
+        store.query(
+            departure_from="2024-12-02T00:00:00", departure_to="2024-12-06T00:00:00"
+        )
+    ) == [2]
+    assert ids(store.query(booked_to="2024-11-21T23:59:59")) == [1]
+
+
+def test_no_filters_returns_all(store):
+    """
+    Test that an empty query returns every booking.
+    """
+    assert ids(store.query()) == [3, 1, 2]
+
+
+def test_bookings_are_compact(store):
+    """
+    Test that bookings are slotted, with interned strings and epoch times.
+    """
+    first, _, third = store.all()
+    assert not hasattr(first, "__dict__")
+    assert first.departure_time == 1733821200
+    assert first.destination is third.destination
+    assert first.to_dict()["departure_time"] == "2024-12-10T09:00:00"
+
+
+def test_snapshot_keeps_iso_strings(store, tmp_path):
+    """
+    Test that bookings are written back to disk in their dict form.
+    """
+    store.put({"id": 5, "departure_time": "2025-01-01T00:00:00"})
+    store.compact()
+
+    with open(tmp_path / "bookings_data.py") as file:
+        content = file.read()
+    assert "'departure_time': '2025-01-01T00:00:00'" in content
+    assert BookingStore(str(tmp_path / "bookings_data.py")).get(5) == store.get(5)
+
+
+def test_index_follows_changes(store):
+    """
+    Test that the indexes are rebuilt after the data changes.
+    """
+    assert ids(store.query(destination="Tokyo")) == []
+    store.put({"id": 4, "destination": "Tokyo", "user_email": "amy@example.com"})
+    assert ids(store.query(destination="Tokyo")) == [4]
+
+
+def test_dict_form_round_trips_exactly(store, tmp_path):
+    """
+    Test that sub-second and offset timestamps and missing fields come
+    back exactly as given, while queries still compare instants.
+    """
+    booking = {
+        "id": 6,
+        "departure_time": "2024-12-01T08:00:00+02:00",
+        "arrival_time": "2024-12-01T12:30:00.250000",
+        "booking_date_time": "2024-11-21T12:30:00.5",
+    }
+    store.put(booking)
+    store.compact()
+
+    reloaded = BookingStore(str(tmp_path / "bookings_data.py")).get(6)
+    assert reloaded.to_dict() == booking
+    assert store.get(6).arrival_time == 1733056200.25
+    assert ids(
+        store.query(
+            departure_from="2024-12-01T06:00:00", departure_to="2024-12-01T06:00:00"
+        )
+    ) == [6]
@@ -2,10 +2,20 @@ import pytest
 from unittest.mock import patch
 from controllers.destination import (
     fetch_all_destinations,
+    fetch_destinations_page,
+    fetch_destination,
+    find_destinations,
+    complete_destination_names,
     create_destination,
+    create_destinations,
     remove_destination,
+    remove_destinations,
     get_all_bookings,
+    get_bookings_page,
+    find_bookings,
+    get_bookings_page_of,
 )
+from models.booking import Booking
 
 
 @pytest.fixture
@@ -49,6 +59,120 @@ def test_fetch_all_destinations(mock_load_destinations, mock_destinations):
     mock_load_destinations.assert_called_once()
 
 
+@patch("controllers.destination.load_destinations_page")
+def test_fetch_destinations_page(mock_load_page, mock_destinations):
+    """
+    Test fetch_destinations_page passes the cursor key to the model.
+    """
+    mock_load_page.return_value = (mock_destinations[:1], "1")
+
+    assert fetch_destinations_page(1, "0") == (mock_destinations[:1], "1")
+    mock_load_page.assert_called_once_with("0", 1)
+
+
+def test_page_cursor_type_checked():
+    """
+    Test that cursors of the wrong key type are rejected.
+    """
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        fetch_destinations_page(10, 5)
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        get_bookings_page(10, "5")
+
+
+@patch("controllers.destination.find_destination_by_id")
+def test_fetch_destination(mock_find, mock_destinations):
+    """
+    Test fetch_destination controller for an existing destination.
+    """
+    mock_find.return_value = mock_destinations[0]
+
+    assert fetch_destination("1") == mock_destinations[0]
+    mock_find.assert_called_once_with("1")
+
+
+@patch("controllers.destination.search_destinations")
+def test_find_destinations(mock_search, mock_destinations):
+    """
+    Test find_destinations passes the query through and checks it.
+    """
+    mock_search.return_value = mock_destinations[:1]
+
+    assert find_destinations("paris", 5) == mock_destinations[:1]
+    mock_search.assert_called_once_with("paris", 5, False)
+
+    with pytest.raises(ValueError, match="Query parameter q is required"):
+        find_destinations("  ")
+    with pytest.raises(ValueError, match="limit must be between 1 and 100"):
+        find_destinations("paris", 101)
+
+
+@patch("controllers.destination.autocomplete_destinations")
+def test_complete_destination_names(mock_autocomplete, mock_destinations):
+    """
+    Test that suggestions carry only the id and name.
+    """
+    mock_autocomplete.return_value = mock_destinations
+
+    assert complete_destination_names("p", 2) == [
+        {"id": "1", "name": "Paris"},
+        {"id": "2", "name": "New York"},
+    ]
+    mock_autocomplete.assert_called_once_with("p", 2)
+
+    with pytest.raises(ValueError, match="Query parameter prefix is required"):
+        complete_destination_names("")
+
+
+@patch("controllers.destination.add_destinations")
+def test_create_destinations_reports_per_item_errors(mock_add):
+    """
+    Test that valid items are stored together and invalid ones reported.
+    """
+    mock_add.side_effect = lambda destinations: destinations
+
+    created, errors = create_destinations(
+        [{"name": "Paris"}, {"location": "Nowhere"}, "Tokyo", {"name": "Lima"}]
+    )
+
+    mock_add.assert_called_once()
+    assert [d["name"] for d in created] == ["Paris", "Lima"]
+    assert errors == [
+        {"index": 1, "error": "Missing required fields"},
+        {"index": 2, "error": "Destination must be an object"},
+    ]
+    with pytest.raises(ValueError, match="Expected a list of destinations"):
+        create_destinations({"name": "Paris"})
+
+
+@patch("controllers.destination.delete_destinations_by_id")
+def test_remove_destinations_reports_missing_ids(mock_delete):
+    """
+    Test that unknown and malformed IDs are reported by index.
+    """
+    mock_delete.return_value = ["1"]
+
+    deleted, errors = remove_destinations(["1", 2, "3"])
+
+    mock_delete.assert_called_once_with(["1", "3"])
+    assert deleted == ["1"]
+    assert errors == [
+        {"index": 1, "error": "Destination ID must be a string"},
+        {"index": 2, "error": "Destination not found"},
+    ]
+
+
+@patch("controllers.destination.find_destination_by_id")
+def test_fetch_destination_not_found(mock_find):
+    """
+    Test fetch_destination controller for a missing destination.
+    """
+    mock_find.return_value = None
+
+    with pytest.raises(ValueError, match="Destination not found"):
+        fetch_destination("non-existent-id")
+
+
 @patch("controllers.destination.add_destination")
 def test_create_destination_success(mock_add_destination):
     """
@@ -91,6 +215,16 @@ def test_create_destination_missing_fields():
         create_destination(data)
 
 
+@pytest.mark.parametrize("field", ["name", "description", "location"])
+def test_create_destination_rejects_non_string_fields(field):
+    """
+    Test that text fields must be strings.
+    """
+    data = {"name": "Paris", field: 123}
+    with pytest.raises(ValueError, match=f"Field '{field}' must be a string"):
+        create_destination(data)
+
+
 @patch(
     "controllers.destination.delete_destination_by_id"
 )
@@ -134,6 +268,51 @@ def test_remove_destination_not_found(mock_delete_destination):
         remove_destination("non-existent-id")
 
 
+@patch("controllers.destination.query_bookings")
+def test_find_bookings_normalizes_dates(mock_query):
+    """
+    Test that date bounds are normalized before querying.
+    """
+    mock_query.return_value = []
+
+    find_bookings({"destination": "Paris", "departure_from": "2024-12-01"})
+
+    mock_query.assert_called_once_with(
+        destination="Paris", departure_from="2024-12-01T00:00:00"
+    )
+
+
+@patch("controllers.destination.query_bookings")
+def test_find_bookings_converts_offsets_to_utc(mock_query):
+    """
+    Test that bounds with an offset are converted to naive UTC.
+    """
+    mock_query.return_value = []
+
+    find_bookings({"departure_from": "2024-12-01T10:00:00+02:00"})
+
+    mock_query.assert_called_once_with(departure_from="2024-12-01T08:00:00")
+
+
+def test_find_bookings_rejects_bad_filters():
+    """
+    Test that unknown filters and malformed dates are rejected.
+    """
+    with pytest.raises(ValueError, match="Unknown filters: colour"):
+        find_bookings({"colour": "red"})
+    with pytest.raises(ValueError, match="departure_to must be an ISO-8601"):
+        find_bookings({"departure_to": "next week"})
+
+
+def test_get_bookings_page_of():
+    """
+    Test cutting pages out of a filtered booking list.
+    """
+    bookings = [{"id": 1}, {"id": 4}, {"id": 9}]
+    assert get_bookings_page_of(bookings, 2) == ([{"id": 1}, {"id": 4}], 4)
+    assert get_bookings_page_of(bookings, 2, 4) == ([{"id": 9}], None)
+
+
 @patch("controllers.destination.load_bookings")
 def test_get_all_bookings(mock_load_bookings):
     """
@@ -144,10 +323,11 @@ def test_get_all_bookings(mock_load_bookings):
         {"id": "102", "destination_id": "2", "user_id": "user2"},
     ]
 
-    mock_load_bookings.return_value = mock_bookings
+    mock_load_bookings.return_value = [Booking.from_dict(b) for b in mock_bookings]
 
     bookings = get_all_bookings()
 
     assert len(bookings) == 2
-    assert bookings == mock_bookings
+    assert [booking["id"] for booking in bookings] == ["101", "102"]
+    assert bookings[0]["destination_id"] == "1"
     mock_load_bookings.assert_called_once()
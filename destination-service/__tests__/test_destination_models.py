@@ -2,10 +2,17 @@ import pytest
 from unittest.mock import patch
 from models.destination import (
     add_destination,
+    add_destinations,
     delete_destination_by_id,
+    delete_destinations_by_id,
+    find_destination_by_id,
+    iter_bookings,
     load_bookings,
     generate_unique_id,
+    configure_destination_store,
 )
+from models.destination_store import DestinationStore
+from models.booking_store import BookingStore
 
 
 @pytest.fixture
@@ -30,14 +37,25 @@ def mock_bookings():
     ]
 
 
-@patch("models.destination.load_destinations")
+@pytest.fixture
+def destination_store(tmp_path, mock_destinations):
+    """
+    Provide an isolated destination store seeded with mock destinations.
+    """
+    store = DestinationStore(
+        str(tmp_path / "destination_data.py"), str(tmp_path / "destination_data.log")
+    )
+    store.replace(mock_destinations)
+    with patch("models.destination.destination_store", store):
+        yield store
+
+
 @patch("models.destination.save_destinations")
 @patch("models.destination.generate_unique_id")
-def test_add_destination(mock_generate_id, mock_save, mock_load, mock_destinations):
+def test_add_destination(mock_generate_id, mock_save, destination_store):
     """
-    Test adding a new destination.
+    Test adding a new destination appends to the log without a rewrite.
     """
-    mock_load.return_value = mock_destinations
     mock_generate_id.return_value = "mocked-id"
     new_destination = {"name": "Tokyo", "country": "Japan"}
 
@@ -50,28 +68,70 @@ def test_add_destination(mock_generate_id, mock_save, mock_load, mock_destinatio
     ]
 
     assert added_destination == {"id": "mocked-id", "name": "Tokyo", "country": "Japan"}
-    mock_save.assert_called_once_with(expected_destinations)
+    assert destination_store.all() == expected_destinations
+    mock_save.assert_not_called()
     mock_generate_id.assert_called_once()
 
 
-@patch("models.destination.load_destinations")
 @patch("models.destination.save_destinations")
-def test_delete_destination_by_id(mock_save, mock_load, mock_destinations):
+def test_delete_destination_by_id(mock_save, destination_store):
     """
     Test deleting a destination by ID.
     """
-    mock_load.return_value = mock_destinations
-
     result = delete_destination_by_id("1234")
     assert result is True
 
     updated_destinations = [{"id": "5678", "name": "New York", "country": "USA"}]
-    mock_save.assert_called_once_with(updated_destinations)
+    assert destination_store.all() == updated_destinations
+    mock_save.assert_not_called()
 
     result = delete_destination_by_id("non-existent-id")
     assert result is False
 
 
+def test_bulk_add_and_delete_write_once(destination_store):
+    """
+    Test that bulk changes reach the log in a single append each.
+    """
+    with patch.object(
+        destination_store.log, "append_many", wraps=destination_store.log.append_many
+    ) as mock_append:
+        added = add_destinations([{"name": "Tokyo"}, {"name": "Lima"}])
+        deleted = delete_destinations_by_id(["1234", added[0]["id"], "missing"])
+
+    assert mock_append.call_count == 2
+    assert deleted == ["1234", added[0]["id"]]
+    assert [d["name"] for d in destination_store.all()] == ["New York", "Lima"]
+
+
+def test_find_destination_by_id(destination_store):
+    """
+    Test looking up a destination by ID through the store index.
+    """
+    assert find_destination_by_id("5678") == {
+        "id": "5678",
+        "name": "New York",
+        "country": "USA",
+    }
+    assert find_destination_by_id("non-existent-id") is None
+
+
+def test_iter_bookings_in_batches(tmp_path):
+    """
+    Test that iter_bookings walks every booking across batches.
+    """
+    store = BookingStore(str(tmp_path / "bookings_data.py"))
+    store.replace([{"id": n, "destination": "Paris"} for n in range(7)])
+
+    with patch("models.destination.booking_store", store):
+        spy = patch.object(store, "page", wraps=store.page)
+        with spy as mock_page:
+            bookings = list(iter_bookings(batch_size=3))
+
+    assert [booking.id for booking in bookings] == list(range(7))
+    assert mock_page.call_count == 3
+
+
 @patch("test_destination_models.load_bookings")
 def test_load_bookings(mock_load):
     """
@@ -111,3 +171,33 @@ def test_generate_unique_id(mock_generate):
 
     assert unique_id == "mocked-uuid"
     mock_generate.assert_called_once()
+
+
+def test_configure_binary_snapshots(tmp_path):
+    """
+    Test that binary snapshot mode converts the .py files once.
+    """
+    destination_file = tmp_path / "destination_data.py"
+    destination_file.write_text("destinations = [{'name': 'Paris', 'id': 'p'}]")
+    bookings_file = tmp_path / "bookings_data.py"
+    bookings_file.write_text(
+        "bookings = [{'id': 1, 'destination': 'Paris', 'departure_time': '2024-12-01T08:00:00'}]"
+    )
+
+    try:
+        destinations, bookings = configure_destination_store(
+            {
+                "DESTINATION_SNAPSHOT_FORMAT": "binary",
+                "DESTINATION_DATA_FILE": str(destination_file),
+                "DESTINATION_LOG_FILE": str(tmp_path / "destination_data.log"),
+                "BOOKINGS_DATA_FILE": str(bookings_file),
+            }
+        )
+        assert destinations.path == str(tmp_path / "destination_data.snap")
+        assert destinations.get("p")["name"] == "Paris"
+        assert bookings.get(1).to_dict()["departure_time"] == "2024-12-01T08:00:00"
+    finally:
+        configure_destination_store({})
+
+    with pytest.raises(ValueError, match="Unknown snapshot format: xml"):
+        configure_destination_store({"DESTINATION_SNAPSHOT_FORMAT": "xml"})
@@ -0,0 +1,175 @@
+import pytest
+from models.search_index import (
+    SearchIndex,
+    PrefixIndex,
+    TrigramIndex,
+    tokenize,
+    trigrams,
+)
+from models.destination_store import DestinationStore
+
+DESTINATIONS = [
+    {"id": "1", "name": "Paris", "description": "City of Lights", "location": "France"},
+    {"id": "2", "name": "Tōkyō", "description": "Neon city", "location": "Japan"},
+    {"id": "3", "name": "Lyon", "description": "Food near Paris", "location": "France"},
+]
+
+
+@pytest.fixture
+def index():
+    """
+    Provide an index over the sample destinations.
+    """
+    index = SearchIndex()
+    for destination in DESTINATIONS:
+        index.add(destination["id"], destination)
+    return index
+
+
+def test_tokenize_folds_case_and_accents():
+    """
+    Test that tokens are case-folded words without accents.
+    """
+    assert tokenize("Tōkyō, the NEON city!") == ["tokyo", "the", "neon", "city"]
+    assert tokenize(None) == []
+
+
+def test_search_ranks_name_matches_first(index):
+    """
+    Test that a match in the name outranks one in the description.
+    """
+    assert [key for key, _ in index.search("paris")] == ["1", "3"]
+    assert [key for key, _ in index.search("TOKYO")] == ["2"]
+    assert [key for key, _ in index.search("france city", limit=1)] == ["1"]
+    assert index.search("berlin") == []
+
+
+def test_add_and_remove_are_incremental(index):
+    """
+    Test that documents can be replaced and removed in place.
+    """
+    index.add("2", {"name": "Osaka", "location": "Japan"})
+    assert index.search("tokyo") == []
+    assert [key for key, _ in index.search("osaka")] == ["2"]
+
+    index.remove("2")
+    index.remove("missing")
+    assert index.search("japan") == []
+    assert len(index) == 2
+    assert "japan" not in index.postings
+
+
+def test_prefix_index_completes_any_word():
+    """
+    Test prefix lookups on the start of any word in a name.
+    """
+    index = PrefixIndex()
+    index.add("1", "New York")
+    index.add("2", "Newcastle")
+    index.add("3", "Tōkyō")
+
+    assert index.complete("new") == ["1", "2"]
+    assert index.complete("New Y") == ["1"]
+    assert index.complete("york") == ["1"]
+    assert index.complete("TOK") == ["3"]
+    assert index.complete("new", limit=1) == ["1"]
+    assert index.complete("  ") == []
+
+    index.add("1", "Boston")
+    index.remove("2")
+    assert index.complete("new") == []
+    assert index.entries == [("boston", "1"), ("tokyo", "3")]
+
+
+def test_prefix_index_build_matches_adds():
+    """
+    Test that a bulk build gives the same index as adding one at a time.
+    """
+    names = [("3", "Tōkyō"), ("1", "New York"), ("2", "Newcastle"), ("4", None)]
+    added = PrefixIndex()
+    for key, name in names:
+        added.add(key, name)
+
+    built = PrefixIndex.build(names)
+    assert built.entries == added.entries
+    assert built.keys == added.keys
+    built.remove("1")
+    assert built.complete("new") == ["2"]
+
+
+def test_trigrams_are_padded():
+    """
+    Test that trigrams include the word start and end.
+    """
+    assert trigrams("abc") == {"  a", " ab", "abc", "bc "}
+
+
+def test_trigram_index_tolerates_typos():
+    """
+    Test that misspelled names and locations still match.
+    """
+    index = TrigramIndex()
+    for destination in DESTINATIONS:
+        index.add(destination["id"], destination)
+
+    assert [key for key, _ in index.search("Pariss")] == ["1"]
+    assert [key for key, _ in index.search("tokio")] == ["2"]
+    assert [key for key, _ in index.search("pariss frence")] == ["1", "3"]
+    assert index.search("xyz") == []
+    assert index.similar_words("pariss") == {"paris": 0.625}
+
+
+def test_trigram_index_forgets_removed_words():
+    """
+    Test that removing the last document using a word drops its trigrams.
+    """
+    index = TrigramIndex()
+    index.add("1", {"name": "Paris", "location": "France"})
+    index.add("2", {"name": "Nice", "location": "France"})
+    index.remove("1")
+
+    assert index.search("paris") == []
+    assert [key for key, _ in index.search("frnce")] == ["2"]
+    assert "par" not in index.postings
+    index.remove("2")
+    assert index.postings == {} and index.sizes == {}
+
+
+def test_store_keeps_index_in_step(tmp_path):
+    """
+    Test that the destination store indexes puts, deletes and reloads.
+    """
+    path = str(tmp_path / "destination_data.py")
+    store = DestinationStore(path)
+    store.replace(DESTINATIONS)
+    assert [d["id"] for d in store.search("france")] == ["1", "3"]
+
+    store.put({"id": "4", "name": "Nice", "description": "", "location": "France"})
+    store.delete("1")
+    assert sorted(d["id"] for d in store.search("france")) == ["3", "4"]
+
+    other = DestinationStore(path)
+    assert sorted(d["id"] for d in other.search("france")) == ["3", "4"]
+    store.put({"id": "5", "name": "Marseille", "location": "France"})
+    assert [d["id"] for d in other.search("marseille")] == ["5"]
+    assert [d["id"] for d in other.autocomplete("mar")] == ["5"]
+    assert [d["id"] for d in other.search("marseile", fuzzy=True)] == ["5"]
+    assert store.search("pariss", fuzzy=True) == []
+    assert [d["id"] for d in store.autocomplete("p")] == []
+
+
+def test_store_replays_malformed_records(tmp_path):
+    """
+    Test that records with non-string text fields in the log cannot break
+    indexing or replay.
+    """
+    assert tokenize(123) == []
+    path = str(tmp_path / "destination_data.py")
+    store = DestinationStore(path)
+    store.put({"id": "1", "name": 123, "description": ["x"], "location": None})
+    store.put({"id": "2", "name": "Paris", "location": "France"})
+
+    other = DestinationStore(path)
+    assert [d["id"] for d in other.all()] == ["1", "2"]
+    assert [d["id"] for d in other.search("paris")] == ["2"]
+    assert [d["id"] for d in other.autocomplete("pa")] == ["2"]
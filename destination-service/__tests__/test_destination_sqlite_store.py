@@ -0,0 +1,309 @@
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+from models.sqlite_store import (
+    SQLiteDatabase,
+    SQLiteDestinationStore,
+    SQLiteBookingStore,
+)
+from models.destination import configure_destination_store
+from models.booking_store import BookingStore
+from controllers.destination import find_bookings
+
+
+BOOKINGS = [
+    {
+        "id": 1,
+        "user_email": "john.doe@example.com",
+        "booking_date_time": "2024-11-21T12:30:00",
+        "departure_time": "2024-12-01T08:00:00",
+        "arrival_time": "2024-12-01T12:30:00",
+        "destination": "Paris",
+        "stay_duration_days": 5,
+    },
+    {
+        "id": 2,
+        "user_email": "jane.smith@example.com",
+        "booking_date_time": "2024-11-22T15:00:00",
+        "departure_time": "2024-12-05T10:00:00",
+        "arrival_time": "2024-12-05T14:30:00",
+        "destination": "New York",
+        "stay_duration_days": 7,
+    },
+    {
+        "id": 3,
+        "user_email": "john.doe@example.com",
+        "booking_date_time": "2024-11-23T09:45:00",
+        "departure_time": "2024-12-10T09:00:00",
+        "arrival_time": "2024-12-10T11:00:00",
+        "destination": "New York",
+        "stay_duration_days": 3,
+    },
+]
+
+
+@pytest.fixture
+def database(tmp_path):
+    """
+    Provide a freshly migrated database.
+    """
+    database = SQLiteDatabase(str(tmp_path / "destinations.sqlite3"))
+    yield database
+    database.close()
+
+
+def test_schema_is_versioned(database):
+    """
+    Test that a new database is migrated to the latest schema version.
+    """
+    assert database.created is True
+    version = database.connection().execute("PRAGMA user_version").fetchone()[0]
+    assert version == 4
+    assert database.migrate() == 4
+
+
+def open_database(path):
+    database = SQLiteDatabase(path)
+    database.close()
+    return database.created
+
+
+def test_parallel_workers_migrate_once(tmp_path):
+    """
+    Test that workers opening a new database together migrate it once.
+    """
+    path = str(tmp_path / "destinations.sqlite3")
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        created = list(executor.map(open_database, [path] * 4))
+    assert created.count(True) == 1
+
+
+def test_booking_indexes_exist(database):
+    """
+    Test that bookings have the secondary indexes.
+    """
+    names = {
+        row[0]
+        for row in database.connection().execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        )
+    }
+    assert {
+        "bookings_destination",
+        "bookings_user_email",
+        "bookings_departure_time",
+        "bookings_booking_date_time",
+    } <= names
+
+
+def test_destination_crud(database):
+    """
+    Test adding, fetching and deleting destinations.
+    """
+    store = SQLiteDestinationStore(database)
+    paris = {"name": "Paris", "description": "City of Lights", "location": "France", "id": "1"}
+    dhaka = {"name": "Dhaka", "description": "City of Dust", "location": "Bangladesh", "id": "2"}
+    store.put(paris)
+    store.put(dhaka)
+
+    assert store.get("1") == paris
+    assert store.all() == [paris, dhaka]
+    assert store.delete("1") is True
+    assert store.delete("1") is False
+    assert store.all() == [dhaka]
+
+
+def test_destination_search(database):
+    """
+    Test full-text search through the FTS5 index after upserts and deletes.
+    """
+    store = SQLiteDestinationStore(database)
+    store.replace(
+        [
+            {"name": "Paris", "description": "City of Lights", "location": "France", "id": "1"},
+            {"name": "Lyon", "description": "Food near Paris", "location": "France", "id": "2"},
+        ]
+    )
+    store.put({"name": "Tōkyō", "description": "Neon city", "location": "Japan", "id": "3"})
+
+    assert [d["id"] for d in store.search("paris")] == ["1", "2"]
+    assert [d["id"] for d in store.search("TOKYO")] == ["3"]
+    assert store.search("!!") == []
+
+    store.put({"name": "Osaka", "description": "", "location": "Japan", "id": "3"})
+    store.delete("1")
+    assert store.search("tokyo") == []
+    assert [d["id"] for d in store.search("paris")] == ["2"]
+
+
+def test_destination_fuzzy_search(database):
+    """
+    Test that fuzzy search follows writes to the table.
+    """
+    store = SQLiteDestinationStore(database)
+    store.put({"name": "Paris", "description": "", "location": "France", "id": "1"})
+    assert [d["id"] for d in store.search("pariss", fuzzy=True)] == ["1"]
+
+    store.put({"name": "Tokyo", "description": "", "location": "Japan", "id": "2"})
+    store.delete("1")
+    assert [d["id"] for d in store.search("tokio", fuzzy=True)] == ["2"]
+    assert store.search("pariss", fuzzy=True) == []
+
+
+def test_destination_autocomplete(database):
+    """
+    Test name prefix lookups through the FTS5 index.
+    """
+    store = SQLiteDestinationStore(database)
+    for destination_id, name in (("1", "New York"), ("2", "Newcastle"), ("3", "Tōkyō")):
+        store.put({"name": name, "description": "new", "location": "", "id": destination_id})
+
+    assert [d["id"] for d in store.autocomplete("new")] == ["1", "2"]
+    assert [d["id"] for d in store.autocomplete("new y")] == ["1"]
+    assert [d["id"] for d in store.autocomplete("york")] == ["1"]
+    assert [d["id"] for d in store.autocomplete("tok")] == ["3"]
+    assert store.autocomplete("") == []
+
+
+def test_destination_bulk_writes(database):
+    """
+    Test inserting and deleting many destinations in one transaction.
+    """
+    store = SQLiteDestinationStore(database)
+    store.put_many([{"name": name, "id": name.lower()} for name in ("Paris", "Lima", "Oslo")])
+    assert len(store) == 3
+    assert store.delete_many(["paris", "missing", "oslo", "paris"]) == ["paris", "oslo"]
+    assert [d["id"] for d in store.all()] == ["lima"]
+    assert [d["id"] for d in store.search("lima")] == ["lima"]
+
+
+def test_versions_change_on_write(database):
+    """
+    Test that the trigger-maintained versions move on every write.
+    """
+    destinations = SQLiteDestinationStore(database)
+    bookings = SQLiteBookingStore(database)
+    before = destinations.version
+    destinations.put({"name": "Paris", "id": "1"})
+    assert destinations.version > before
+    destinations.delete("1")
+    assert destinations.version > before + 1
+
+    before = bookings.version
+    bookings.replace(BOOKINGS)
+    assert bookings.version > before
+
+
+def test_pages_follow_primary_key(database):
+    """
+    Test keyset pagination over destinations and bookings.
+    """
+    destinations = SQLiteDestinationStore(database)
+    for destination_id in ("c", "a", "b"):
+        destinations.put({"name": destination_id.upper(), "id": destination_id})
+
+    items, next_key = destinations.page(limit=2)
+    assert [item["id"] for item in items] == ["a", "b"]
+    assert next_key == "b"
+    items, next_key = destinations.page(after=next_key, limit=2)
+    assert [item["id"] for item in items] == ["c"]
+    assert next_key is None
+
+    bookings = SQLiteBookingStore(database)
+    bookings.replace(BOOKINGS)
+    items, next_key = bookings.page(after=1, limit=1)
+    assert [item.id for item in items] == [2]
+    assert next_key == 2
+
+
+def test_later_pages_search_the_primary_key(database):
+    """
+    Test that a page after a cursor seeks on id instead of scanning.
+    """
+    bookings = SQLiteBookingStore(database)
+    bookings.replace(BOOKINGS)
+    connection = database.connection()
+    statements = []
+    connection.set_trace_callback(statements.append)
+    bookings.page(after=1, limit=1)
+    connection.set_trace_callback(None)
+
+    plan = connection.execute(f"EXPLAIN QUERY PLAN {statements[-1]}").fetchall()
+    assert any("SEARCH bookings USING INTEGER PRIMARY KEY" in row[-1] for row in plan)
+
+
+def test_booking_query_uses_filters(database):
+    """
+    Test filtering bookings by destination, email and departure range.
+    """
+    store = SQLiteBookingStore(database)
+    store.replace(BOOKINGS)
+
+    assert [b.to_dict() for b in store.all()] == BOOKINGS
+    assert [b.id for b in store.query(destination="New York")] == [2, 3]
+    assert [b.id for b in store.query(user_email="john.doe@example.com")] == [1, 3]
+    assert [
+        b.id
+        for b in store.query(
+            departure_from="2024-12-02T00:00:00", departure_to="2024-12-06T00:00:00"
+        )
+    ] == [2]
+    assert [
+        b.id
+        for b in store.query(destination="New York", user_email="john.doe@example.com")
+    ] == [3]
+    assert [b.id for b in store.query(booked_to="2024-11-22T15:00:00")] == [1, 2]
+
+
+def test_backends_agree_on_offset_bounds(database, tmp_path, mocker):
+    """
+    Test that a time bound with an offset selects the same bookings from
+    the SQLite and file backends.
+    """
+    sqlite_bookings = SQLiteBookingStore(database)
+    sqlite_bookings.replace(BOOKINGS)
+    file_bookings = BookingStore(str(tmp_path / "bookings_data.py"))
+    file_bookings.replace(BOOKINGS)
+
+    results = []
+    for store in (sqlite_bookings, file_bookings):
+        mocker.patch("models.destination.booking_store", store)
+        bookings = find_bookings({"departure_from": "2024-12-01T10:00:00+02:00"})
+        results.append([booking["id"] for booking in bookings])
+    assert results == [[1, 2, 3], [1, 2, 3]]
+
+
+def test_configure_sqlite_migrates_files(tmp_path):
+    """
+    Test that a new database is populated from the data files.
+    """
+    destination_file = tmp_path / "destination_data.py"
+    destination_file.write_text(
+        "destinations = [{'name': 'Paris', 'description': 'City of Lights', 'location': 'France', 'id': 'p'}]"
+    )
+    bookings_file = tmp_path / "bookings_data.py"
+    bookings_file.write_text(f"bookings = {BOOKINGS}")
+
+    destinations, bookings = configure_destination_store(
+        {
+            "DESTINATION_STORE_BACKEND": "sqlite",
+            "DESTINATION_DATA_FILE": str(destination_file),
+            "DESTINATION_LOG_FILE": str(tmp_path / "destination_data.log"),
+            "BOOKINGS_DATA_FILE": str(bookings_file),
+            "DESTINATION_DATABASE": str(tmp_path / "destinations.sqlite3"),
+        }
+    )
+    try:
+        assert isinstance(destinations, SQLiteDestinationStore)
+        assert destinations.get("p")["name"] == "Paris"
+        assert [b.to_dict() for b in bookings.all()] == BOOKINGS
+    finally:
+        destinations.database.close()
+        configure_destination_store({})
+
+
+def test_configure_unknown_backend():
+    """
+    Test that an unknown backend name is rejected.
+    """
+    with pytest.raises(ValueError, match="Unknown destination store backend"):
+        configure_destination_store({"DESTINATION_STORE_BACKEND": "redis"})
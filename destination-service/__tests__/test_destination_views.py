@@ -1,8 +1,11 @@
+import json
 import pytest
 from flask import Flask
 from flask_jwt_extended import JWTManager, create_access_token
 from unittest.mock import patch
 from views.destination import destination_blueprint
+from models.destination_store import DestinationStore
+from common.pagination import encode_cursor
 
 
 @pytest.fixture
@@ -73,6 +76,148 @@ def test_get_destinations(mock_fetch, client):
     mock_fetch.assert_called_once()
 
 
+@patch("views.destination.destinations_version")
+@patch("views.destination.fetch_all_destinations")
+def test_get_destinations_cached_per_version(mock_fetch, mock_version, client):
+    """
+    Test that the encoded list is reused until the data version changes.
+    """
+    mock_version.return_value = 1
+    mock_fetch.return_value = [{"id": "1", "name": "Paris"}]
+
+    first = client.get("/destinations")
+    second = client.get("/destinations")
+
+    assert first.data == second.data
+    mock_fetch.assert_called_once()
+
+    mock_version.return_value = 2
+    mock_fetch.return_value = [{"id": "2", "name": "Tokyo"}]
+
+    third = client.get("/destinations")
+
+    assert third.get_json() == [{"id": "2", "name": "Tokyo"}]
+    assert mock_fetch.call_count == 2
+
+
+@patch("views.destination.fetch_all_destinations")
+def test_get_destinations_not_modified(mock_fetch, client):
+    """
+    Test that a matching If-None-Match returns 304 without a body.
+    """
+    mock_fetch.return_value = [{"id": "1", "name": "Paris"}]
+
+    response = client.get("/destinations")
+    etag = response.headers["ETag"]
+
+    response = client.get("/destinations", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+
+    response = client.get("/destinations", headers={"If-None-Match": '"stale"'})
+    assert response.status_code == 200
+
+
+@patch("views.destination.get_all_bookings")
+def test_view_all_bookings_not_modified(mock_get_bookings, client, admin_token):
+    """
+    Test that bookings honour If-None-Match for admins.
+    """
+    mock_get_bookings.return_value = [{"id": 1, "destination": "Paris"}]
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    etag = client.get("/bookings", headers=headers).headers["ETag"]
+    response = client.get("/bookings", headers={**headers, "If-None-Match": etag})
+
+    assert response.status_code == 304
+    mock_get_bookings.assert_called_once()
+
+
+def test_get_destinations_paginated(client, tmp_path):
+    """
+    Test walking the destination list page by page.
+    """
+    store = DestinationStore(str(tmp_path / "destination_data.py"))
+    store.replace([{"id": str(n), "name": f"City {n}"} for n in range(5)])
+
+    with patch("models.destination.destination_store", store):
+        response = client.get("/destinations?limit=2")
+        page = response.get_json()
+        assert [item["id"] for item in page["items"]] == ["0", "1"]
+        assert page["next_cursor"] == encode_cursor("1")
+        assert 'rel="next"' in response.headers["Link"]
+
+        ids = [item["id"] for item in page["items"]]
+        while page["next_cursor"]:
+            page = client.get(
+                f"/destinations?limit=2&cursor={page['next_cursor']}"
+            ).get_json()
+            ids += [item["id"] for item in page["items"]]
+
+    assert ids == ["0", "1", "2", "3", "4"]
+
+
+def test_get_destinations_bad_limit(client):
+    """
+    Test that an invalid page size is rejected.
+    """
+    response = client.get("/destinations?limit=0")
+    assert response.status_code == 400
+    assert "limit must be" in response.get_json()["error"]
+
+
+@patch("views.destination.get_bookings_page")
+def test_view_bookings_paginated(mock_page, client, admin_token):
+    """
+    Test that bookings return a page with a next cursor.
+    """
+    mock_page.return_value = ([{"id": 1}, {"id": 2}], 2)
+
+    response = client.get(
+        "/bookings?limit=2", headers={"Authorization": f"Bearer {admin_token}"}
+    )
+
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "items": [{"id": 1}, {"id": 2}],
+        "next_cursor": encode_cursor(2),
+    }
+    assert "Link" in response.headers
+    mock_page.assert_called_once_with(2, None)
+
+
+@patch("views.destination.fetch_destination")
+def test_get_destination(mock_fetch, client):
+    """
+    Test retrieving a single destination by ID.
+    """
+    mock_fetch.return_value = {
+        "id": "1",
+        "name": "Paris",
+        "description": "City of Lights",
+        "location": "France",
+    }
+
+    response = client.get("/destinations/1")
+
+    assert response.status_code == 200
+    assert response.get_json()["name"] == "Paris"
+    mock_fetch.assert_called_once_with("1")
+
+
+@patch("views.destination.fetch_destination")
+def test_get_destination_not_found(mock_fetch, client):
+    """
+    Test retrieving a destination that does not exist.
+    """
+    mock_fetch.side_effect = ValueError("Destination not found")
+
+    response = client.get("/destinations/missing")
+
+    assert response.status_code == 404
+    assert response.get_json()["error"] == "Destination not found"
+
+
 @patch("views.destination.create_destination")
 def test_add_destination_success(mock_create, client, admin_token):
     """
@@ -203,3 +348,156 @@ def test_view_all_bookings_no_token(client):
     response = client.get("/bookings")
     assert response.status_code == 401
     assert response.get_json()["msg"] == "Missing Authorization Header"
+
+
+@patch("views.destination.stream_bookings")
+def test_export_bookings_ndjson(mock_stream, client, admin_token):
+    """
+    Test that the export streams one JSON object per line.
+    """
+    bookings = [{"id": n, "destination": "Paris"} for n in range(3)]
+    mock_stream.return_value = iter(bookings)
+
+    response = client.get(
+        "/bookings/export", headers={"Authorization": f"Bearer {admin_token}"}
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert response.is_streamed
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line) for line in lines] == bookings
+
+
+def test_export_bookings_unauthorized(client, user_token):
+    """
+    Test that non-admins cannot export bookings.
+    """
+    response = client.get(
+        "/bookings/export", headers={"Authorization": f"Bearer {user_token}"}
+    )
+    assert response.status_code == 403
+
+
+@patch("views.destination.find_bookings")
+def test_view_bookings_filtered(mock_find, client, admin_token):
+    """
+    Test that query parameters are passed through as filters.
+    """
+    mock_find.return_value = [{"id": 2, "destination": "New York"}]
+
+    response = client.get(
+        "/bookings?destination=New+York&departure_from=2024-12-01",
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+
+    assert response.status_code == 200
+    assert response.get_json() == [{"id": 2, "destination": "New York"}]
+    mock_find.assert_called_once_with(
+        {"destination": "New York", "departure_from": "2024-12-01"}
+    )
+
+
+def test_view_bookings_bad_filter(client, admin_token):
+    """
+    Test that an unknown filter is a 400.
+    """
+    response = client.get(
+        "/bookings?colour=red", headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Unknown filters: colour"
+
+
+def test_search_destinations(client, tmp_path):
+    """
+    Test searching destinations through the full-text index.
+    """
+    store = DestinationStore(str(tmp_path / "destination_data.py"))
+    store.replace(
+        [
+            {"id": "1", "name": "Paris", "description": "City of Lights", "location": "France"},
+            {"id": "2", "name": "Lyon", "description": "Near Paris", "location": "France"},
+        ]
+    )
+    with patch("models.destination.destination_store", store):
+        response = client.get("/destinations/search?q=paris&limit=1")
+        assert response.status_code == 200
+        assert [d["id"] for d in response.get_json()] == ["1"]
+
+        response = client.get("/destinations/search?q=")
+        assert response.status_code == 400
+        assert response.get_json()["error"] == "Query parameter q is required"
+
+        response = client.get("/destinations/search?q=paris&limit=many")
+        assert response.status_code == 400
+
+        response = client.get("/destinations/search?q=pariss")
+        assert response.get_json() == []
+        response = client.get("/destinations/search?q=pariss&fuzzy=true")
+        assert [d["id"] for d in response.get_json()] == ["1"]
+
+
+def test_autocomplete_destinations(client, tmp_path):
+    """
+    Test name suggestions for a prefix.
+    """
+    store = DestinationStore(str(tmp_path / "destination_data.py"))
+    store.replace(
+        [
+            {"id": "1", "name": "New York", "description": "", "location": "USA"},
+            {"id": "2", "name": "Paris", "description": "", "location": "France"},
+        ]
+    )
+    with patch("models.destination.destination_store", store):
+        response = client.get("/destinations/autocomplete?prefix=yo")
+        assert response.status_code == 200
+        assert response.get_json() == [{"id": "1", "name": "New York"}]
+
+        response = client.get("/destinations/autocomplete")
+        assert response.status_code == 400
+
+
+def test_bulk_create_and_delete(client, admin_token, user_token, tmp_path):
+    """
+    Test bulk endpoints with per-item errors and status codes.
+    """
+    store = DestinationStore(str(tmp_path / "destination_data.py"))
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    with patch("models.destination.destination_store", store):
+        response = client.post(
+            "/destinations/bulk",
+            json=[{"name": "Paris"}, {"name": "Lima"}],
+            headers=headers,
+        )
+        assert response.status_code == 201
+        ids = [d["id"] for d in response.get_json()["created"]]
+        assert len(store) == 2
+
+        response = client.post(
+            "/destinations/bulk", json=[{"name": "Oslo"}, {}], headers=headers
+        )
+        assert response.status_code == 207
+        assert response.get_json()["errors"] == [
+            {"index": 1, "error": "Missing required fields"}
+        ]
+
+        response = client.post("/destinations/bulk", json=[{}], headers=headers)
+        assert response.status_code == 400
+
+        response = client.delete(
+            "/destinations/bulk", json=ids + ["missing"], headers=headers
+        )
+        assert response.status_code == 207
+        assert response.get_json()["deleted"] == ids
+        assert [d["name"] for d in store.all()] == ["Oslo"]
+
+        response = client.delete("/destinations/bulk", json=["missing"], headers=headers)
+        assert response.status_code == 404
+
+        response = client.post(
+            "/destinations/bulk",
+            json=[{"name": "Rome"}],
+            headers={"Authorization": f"Bearer {user_token}"},
+        )
+        assert response.status_code == 401
@@ -1,10 +1,28 @@
+import os
+import sys
+
+# Make the shared ``common`` package importable when run from this directory.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
 from flask import Flask
-from flask_jwt_extended import JWTManager
 from flasgger import Swagger
+from common.auth import CachedJWTManager
+from common.structured_logging import configure_logging
 from views.destination import destination_blueprint
+from models.destination import configure_destination_store
 
 app = Flask(__name__)
 app.config["JWT_SECRET_KEY"] = "shared-secret-key"
+# "file" keeps data in the *_data.py files; "sqlite" uses an indexed database
+app.config["DESTINATION_STORE_BACKEND"] = os.environ.get(
+    "DESTINATION_STORE_BACKEND", "file"
+)
+# "python" snapshots are the *_data.py files; "json", "jsonl" and "binary"
+# (mmap-read .snap) files are converted from them on first start
+app.config["DESTINATION_SNAPSHOT_FORMAT"] = os.environ.get(
+    "DESTINATION_SNAPSHOT_FORMAT", "python"
+)
+configure_destination_store(app.config)
 swagger = Swagger(
     app,
     template={
@@ -28,7 +46,9 @@ swagger = Swagger(
         "security": [{"Bearer": []}],  # Apply Bearer authentication globally
     },
 )
-jwt = JWTManager(app)
+jwt = CachedJWTManager(app)
+# JSON-lines logs written by a background thread; LOG_LEVEL sets the level
+configure_logging(app)
 
 # Register the blueprint
 app.register_blueprint(destination_blueprint)
@@ -1,5 +1,18 @@
 from .destination import (
     create_destination,
+    create_destinations,
     remove_destination,
+    remove_destinations,
     fetch_all_destinations,
+    fetch_destinations_page,
+    destinations_version,
+    fetch_destination,
+    find_destinations,
+    complete_destination_names,
+    get_all_bookings,
+    get_bookings_page,
+    stream_bookings,
+    find_bookings,
+    get_bookings_page_of,
+    bookings_version,
 )
@@ -1,10 +1,29 @@
+import bisect
+from datetime import datetime, timezone
+from models.repository import BOOKING_FILTERS
 from models.destination import (
     load_destinations,
+    load_destinations_page,
+    get_destinations_version,
+    find_destination_by_id,
+    search_destinations,
+    autocomplete_destinations,
     add_destination,
+    add_destinations,
     delete_destination_by_id,
+    delete_destinations_by_id,
     load_bookings,
+    load_bookings_page,
+    iter_bookings,
+    query_bookings,
+    get_bookings_version,
 )
 
+DEFAULT_SEARCH_LIMIT = 20
+DEFAULT_AUTOCOMPLETE_LIMIT = 10
+MAX_SEARCH_LIMIT = 100
+MAX_BULK_ITEMS = 10000
+
 
 def fetch_all_destinations():
     """
@@ -13,21 +32,113 @@ def fetch_all_destinations():
     return load_destinations()
 
 
-def create_destination(data):
+def fetch_destinations_page(limit, after=None):
     """
-    Controller to validate and create a new destination.
+    Controller to fetch one page of destinations.
+    """
+    if after is not None and not isinstance(after, str):
+        raise ValueError("Invalid cursor")
+    return load_destinations_page(after, limit)
+
+
+def destinations_version():
+    """
+    Controller to fetch the version of the destination list.
+
+    Every create_destination and remove_destination moves it forward.
+    """
+    return get_destinations_version()
+
+
+def fetch_destination(destination_id):
+    """
+    Controller to fetch a single destination.
+    """
+    destination = find_destination_by_id(destination_id)
+    if not destination:
+        raise ValueError("Destination not found")
+    return destination
+
+
+def find_destinations(query, limit=DEFAULT_SEARCH_LIMIT, fuzzy=False):
+    """
+    Controller to search destinations by name, description and location.
     """
+    if not query or not query.strip():
+        raise ValueError("Query parameter q is required")
+    if not 1 <= limit <= MAX_SEARCH_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_SEARCH_LIMIT}")
+    return search_destinations(query, limit, fuzzy)
+
+
+def complete_destination_names(prefix, limit=DEFAULT_AUTOCOMPLETE_LIMIT):
+    """
+    Controller to suggest destination names for a typed prefix.
+    """
+    if not prefix or not prefix.strip():
+        raise ValueError("Query parameter prefix is required")
+    if not 1 <= limit <= MAX_SEARCH_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_SEARCH_LIMIT}")
+    return [
+        {"id": destination["id"], "name": destination["name"]}
+        for destination in autocomplete_destinations(prefix, limit)
+    ]
+
+
+def validate_destination(data):
+    """
+    Check a destination payload and return the fields to store.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Destination must be an object")
     required_fields = ["name"]
     if any(field not in data for field in required_fields):
         raise ValueError("Missing required fields")
 
-    new_destination = {
+    destination = {
         "name": data["name"],
         "description": data.get("description", ""),
         "location": data.get("location", ""),
     }
+    for field, value in destination.items():
+        if not isinstance(value, str):
+            raise ValueError(f"Field '{field}' must be a string")
+    return destination
+
 
-    return add_destination(new_destination)
+def check_bulk_size(items, what):
+    """
+    Check that a bulk request body is a list of a reasonable size.
+    """
+    if not isinstance(items, list):
+        raise ValueError(f"Expected a list of {what}")
+    if len(items) > MAX_BULK_ITEMS:
+        raise ValueError(f"At most {MAX_BULK_ITEMS} {what} per request")
+
+
+def create_destination(data):
+    """
+    Controller to validate and create a new destination.
+    """
+    return add_destination(validate_destination(data))
+
+
+def create_destinations(items):
+    """
+    Controller to validate and create many destinations at once.
+
+    Every valid item is stored in one write. Returns the created
+    destinations and a list of {"index", "error"} for rejected items.
+    """
+    check_bulk_size(items, "destinations")
+    accepted = []
+    errors = []
+    for index, item in enumerate(items):
+        try:
+            accepted.append(validate_destination(item))
+        except ValueError as e:
+            errors.append({"index": index, "error": str(e)})
+    return add_destinations(accepted), errors
 
 
 def remove_destination(destination_id):
@@ -38,8 +149,96 @@ def remove_destination(destination_id):
         raise ValueError("Destination not found")
 
 
+def remove_destinations(destination_ids):
+    """
+    Controller to delete many destinations at once.
+
+    Returns the deleted IDs and a list of {"index", "error"} for IDs that
+    were invalid or not found.
+    """
+    check_bulk_size(destination_ids, "destination IDs")
+    errors = []
+    requested = []
+    for index, destination_id in enumerate(destination_ids):
+        if isinstance(destination_id, str):
+            requested.append((index, destination_id))
+        else:
+            errors.append({"index": index, "error": "Destination ID must be a string"})
+
+    deleted = delete_destinations_by_id([item[1] for item in requested])
+    found = set(deleted)
+    for index, destination_id in requested:
+        if destination_id not in found:
+            errors.append({"index": index, "error": "Destination not found"})
+    errors.sort(key=lambda error: error["index"])
+    return deleted, errors
+
+
+def get_bookings_page(limit, after=None):
+    """
+    Fetch one page of bookings from the data source.
+    """
+    if after is not None and not isinstance(after, int):
+        raise ValueError("Invalid cursor")
+    bookings, next_key = load_bookings_page(after, limit)
+    return [booking.to_dict() for booking in bookings], next_key
+
+
+def bookings_version():
+    """
+    Controller to fetch the version of the booking data.
+    """
+    return get_bookings_version()
+
+
 def get_all_bookings():
     """
     Fetch all bookings from the data source.
     """
-    return load_bookings()
+    return [booking.to_dict() for booking in load_bookings()]
+
+
+def find_bookings(filters):
+    """
+    Fetch the bookings matching the given query filters.
+
+    Time bounds accept any ISO-8601 date or datetime and are normalized to
+    the stored format, naive UTC, before either backend compares them.
+    """
+    unknown = set(filters) - set(BOOKING_FILTERS)
+    if unknown:
+        raise ValueError(f"Unknown filters: {', '.join(sorted(unknown))}")
+
+    normalized = {}
+    for name, value in filters.items():
+        if BOOKING_FILTERS[name][1] != "==":
+            try:
+                moment = datetime.fromisoformat(value)
+            except ValueError:
+                raise ValueError(f"{name} must be an ISO-8601 date or datetime")
+            if moment.tzinfo is not None:
+                moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+            value = moment.isoformat()
+        normalized[name] = value
+    return [booking.to_dict() for booking in query_bookings(**normalized)]
+
+
+def get_bookings_page_of(bookings, limit, after=None):
+    """
+    Cut one page out of a list of bookings ordered by ID.
+    """
+    if after is not None and not isinstance(after, int):
+        raise ValueError("Invalid cursor")
+    start = 0
+    if after is not None:
+        start = bisect.bisect_right([booking["id"] for booking in bookings], after)
+    page = bookings[start : start + limit]
+    more = start + limit < len(bookings)
+    return page, (page[-1]["id"] if more and page else None)
+
+
+def stream_bookings():
+    """
+    Iterate over all bookings without loading them into one list.
+    """
+    return (booking.to_dict() for booking in iter_bookings())
@@ -1,6 +1,19 @@
 from .destination import (
     load_destinations,
+    load_destinations_page,
+    get_destinations_version,
     save_destinations,
     add_destination,
+    add_destinations,
+    delete_destinations_by_id,
+    find_destination_by_id,
+    search_destinations,
+    autocomplete_destinations,
     generate_unique_id,
+    load_bookings,
+    load_bookings_page,
+    iter_bookings,
+    query_bookings,
+    get_bookings_version,
+    configure_destination_store,
 )
@@ -0,0 +1,122 @@
+import sys
+from datetime import datetime, timezone
+
+BOOKING_FIELDS = (
+    "id",
+    "user_email",
+    "booking_date_time",
+    "departure_time",
+    "arrival_time",
+    "destination",
+    "stay_duration_days",
+)
+TIME_FIELDS = ("booking_date_time", "departure_time", "arrival_time")
+INTERNED_FIELDS = ("user_email", "destination")
+# Marks a field the dict form did not have, so to_dict leaves it out.
+ABSENT = object()
+
+
+def to_epoch(value):
+    """
+    Convert an ISO-8601 timestamp to seconds since the epoch: an integer
+    for whole seconds, a float otherwise.
+
+    Timestamps without an offset are taken to be UTC.
+    """
+    if value is None:
+        return None
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    if moment.microsecond:
+        return moment.timestamp()
+    return int(moment.timestamp())
+
+
+def from_epoch(value):
+    """
+    Convert epoch seconds back to the ISO-8601 form bookings are stored in.
+    """
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value, timezone.utc).replace(tzinfo=None).isoformat()
+
+
+class Booking:
+    """
+    Compact in-memory booking.
+
+    Fields live in slots instead of a per-instance dict, timestamps are
+    epoch numbers instead of ISO strings, and emails and destination names
+    are interned so every booking for the same value shares one string.
+    Keys outside BOOKING_FIELDS are kept in ``extra``.
+
+    Timestamps that from_epoch would not give back verbatim, such as ones
+    with an offset, keep their original text in ``raw``, and fields the
+    dict form lacked are marked ABSENT there, so to_dict returns exactly
+    what from_dict was given.
+    """
+
+    __slots__ = BOOKING_FIELDS + ("extra", "raw")
+
+    def __init__(self, **fields):
+        for field in BOOKING_FIELDS:
+            setattr(self, field, None)
+        self.extra = None
+        self.raw = None
+        for field, value in fields.items():
+            setattr(self, field, value)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a booking from its dict form. Bookings are passed through.
+        """
+        if isinstance(data, cls):
+            return data
+        booking = cls()
+        raw = {field: ABSENT for field in BOOKING_FIELDS if field not in data}
+        for field, value in data.items():
+            if field in TIME_FIELDS:
+                text = value
+                value = to_epoch(text)
+                if from_epoch(value) != text:
+                    raw[field] = text
+            elif field in INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            elif field not in BOOKING_FIELDS:
+                if booking.extra is None:
+                    booking.extra = {}
+                booking.extra[field] = value
+                continue
+            setattr(booking, field, value)
+        booking.raw = raw or None
+        return booking
+
+    def to_dict(self):
+        """
+        Return the dict form with ISO-8601 timestamps.
+        """
+        data = {}
+        raw = self.raw or {}
+        for field in BOOKING_FIELDS:
+            if field in raw:
+                if raw[field] is not ABSENT:
+                    data[field] = raw[field]
+                continue
+            value = getattr(self, field)
+            data[field] = from_epoch(value) if field in TIME_FIELDS else value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __eq__(self, other):
+        if not isinstance(other, Booking):
+            return NotImplemented
+        return all(
+            getattr(self, field) == getattr(other, field)
+            for field in self.__slots__
+        )
+
+    def __repr__(self):
+        return f"Booking({self.to_dict()!r})"
@@ -0,0 +1,135 @@
+import bisect
+from common.log_store import LogStore
+from .repository import BookingRepository, BOOKING_FILTERS
+from .booking import Booking, TIME_FIELDS, to_epoch
+
+
+class BookingIndex:
+    """
+    Secondary indexes over a set of bookings.
+
+    Equality filters use hash indexes from value to booking ids. Time range
+    filters use a sorted list of epoch timestamps with a parallel list of
+    ids, so a range is two bisects and a slice.
+    """
+
+    def __init__(self, bookings):
+        self.hashed = {}
+        self.sorted = {}
+        for field, comparison in BOOKING_FILTERS.values():
+            if comparison == "==":
+                self.hashed.setdefault(field, {})
+            else:
+                self.sorted.setdefault(field, [])
+
+        for booking in bookings:
+            booking_id = booking.id
+            for field, index in self.hashed.items():
+                index.setdefault(getattr(booking, field), []).append(booking_id)
+            for field, pairs in self.sorted.items():
+                value = getattr(booking, field)
+                if value is not None:
+                    pairs.append((value, booking_id))
+
+        for field, pairs in self.sorted.items():
+            pairs.sort(key=lambda pair: pair[0])
+            self.sorted[field] = (
+                [value for value, _ in pairs],
+                [booking_id for _, booking_id in pairs],
+            )
+
+    def candidates(self, field, comparison, value):
+        """
+        Return the ids of bookings satisfying one filter.
+        """
+        if comparison == "==":
+            return self.hashed[field].get(value, [])
+        values, ids = self.sorted[field]
+        if comparison == ">=":
+            return ids[bisect.bisect_left(values, value) :]
+        return ids[: bisect.bisect_right(values, value)]
+
+
+def matches(booking, filters):
+    """
+    Return True if a booking satisfies every filter.
+    """
+    for name, value in filters.items():
+        field, comparison = BOOKING_FILTERS[name]
+        actual = getattr(booking, field)
+        if comparison == "==":
+            if actual != value:
+                return False
+        elif actual is None:
+            return False
+        elif comparison == ">=" and actual < value:
+            return False
+        elif comparison == "<=" and actual > value:
+            return False
+    return True
+
+
+class BookingStore(LogStore, BookingRepository):
+    """
+    Resident copy of bookings_data.py, reloaded when the file changes.
+
+    Records are held as compact Booking objects. Secondary indexes for
+    query() are rebuilt from them the first time they are needed after a
+    change.
+    """
+
+    variable = "bookings"
+    ordered = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._index = None
+        self._index_version = None
+
+    def key(self, record):
+        return record.id
+
+    def decode(self, record):
+        return Booking.from_dict(record)
+
+    def encode(self, record):
+        return Booking.from_dict(record).to_dict()
+
+    def _current_index(self):
+        version = self.version
+        if self._index_version != version:
+            with self._lock:
+                self._index = BookingIndex(self._records.values())
+                self._index_version = version
+        return self._index
+
+    def query(self, **filters):
+        """
+        Return bookings matching every given filter, ordered by id.
+
+        The most selective filter supplies the candidates and the rest are
+        checked per candidate, so a query costs O(log N + k).
+        """
+        filters = {
+            name: to_epoch(value) if BOOKING_FILTERS[name][0] in TIME_FIELDS else value
+            for name, value in filters.items()
+            if value is not None
+        }
+        if not filters:
+            return self.all()
+
+        index = self._current_index()
+        candidates = min(
+            (
+                index.candidates(*BOOKING_FILTERS[name], value)
+                for name, value in filters.items()
+            ),
+            key=len,
+        )
+
+        bookings = []
+        for booking_id in sorted(candidates):
+            booking = self._records.get(booking_id)
+            if booking is not None and matches(booking, filters):
+                bookings.append(booking)
+        return bookings
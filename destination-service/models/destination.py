@@ -1,12 +1,69 @@
 import os
-import ast
 import uuid
+from common.snapshot import ensure_snapshot, snapshot_path
+from .destination_store import DestinationStore
+from .booking_store import BookingStore
+from .sqlite_store import SQLiteDatabase, SQLiteDestinationStore, SQLiteBookingStore
 
 
 DESTINATION_DATA_FILE = os.path.join(
     os.path.dirname(__file__), "../destination_data.py"
 )
+DESTINATION_LOG_FILE = os.path.join(
+    os.path.dirname(__file__), "../destination_data.log"
+)
 BOOKINGS_DATA_FILE = os.path.join(os.path.dirname(__file__), "../bookings_data.py")
+DESTINATION_DATABASE_FILE = os.path.join(
+    os.path.dirname(__file__), "../destination_data.sqlite3"
+)
+
+destination_store = DestinationStore(DESTINATION_DATA_FILE, DESTINATION_LOG_FILE)
+booking_store = BookingStore(BOOKINGS_DATA_FILE)
+
+
+def configure_destination_store(config):
+    """
+    Select the destination and booking storage backend from the app config.
+
+    DESTINATION_STORE_BACKEND is "file" (default) or "sqlite". A newly
+    created SQLite database is populated from destination_data.py and
+    bookings_data.py.
+
+    With the file backend, DESTINATION_SNAPSHOT_FORMAT picks the snapshot
+    format: "python" (default), "json", "jsonl" or "binary" (mmap-read
+    .snap). Snapshots other than python live next to the .py files and are
+    converted from them the first time.
+    """
+    global destination_store, booking_store
+    backend = config.get("DESTINATION_STORE_BACKEND", "file")
+    destination_file = config.get("DESTINATION_DATA_FILE", DESTINATION_DATA_FILE)
+    bookings_file = config.get("BOOKINGS_DATA_FILE", BOOKINGS_DATA_FILE)
+    snapshot = config.get("DESTINATION_SNAPSHOT_FORMAT", "python")
+    destination_file = ensure_snapshot(
+        destination_file, snapshot_path(destination_file, snapshot), "destinations"
+    )
+    bookings_file = ensure_snapshot(
+        bookings_file, snapshot_path(bookings_file, snapshot), "bookings"
+    )
+    file_destinations = DestinationStore(
+        destination_file,
+        config.get("DESTINATION_LOG_FILE", DESTINATION_LOG_FILE),
+    )
+    file_bookings = BookingStore(bookings_file)
+    if backend == "file":
+        destination_store, booking_store = file_destinations, file_bookings
+    elif backend == "sqlite":
+        database = SQLiteDatabase(
+            config.get("DESTINATION_DATABASE", DESTINATION_DATABASE_FILE)
+        )
+        destination_store = SQLiteDestinationStore(database)
+        booking_store = SQLiteBookingStore(database)
+        if database.created:
+            destination_store.replace(file_destinations.all())
+            booking_store.replace(file_bookings.all())
+    else:
+        raise ValueError(f"Unknown destination store backend: {backend}")
+    return destination_store, booking_store
 
 
 def generate_unique_id():
@@ -16,56 +73,125 @@ def generate_unique_id():
     return str(uuid.uuid4())
 
 
+def get_destinations_version():
+    """
+    Return the current version of the destination data.
+    """
+    return destination_store.version
+
+
 def load_destinations():
     """
-    Load destinations from the destination_data.py file.
+    Load all destinations from the configured store.
     """
-    try:
-        with open(DESTINATION_DATA_FILE, "r") as file:
-            content = file.read()
-            return ast.literal_eval(content.split("=", 1)[1].strip())
-    except (FileNotFoundError, SyntaxError, ValueError):
-        return []
+    return destination_store.all()
 
 
 def save_destinations(destinations):
     """
-    Save destinations to the destination_data.py file.
+    Replace all destinations in the configured store.
     """
-    with open(DESTINATION_DATA_FILE, "w") as file:
-        file.write(f"destinations = {destinations}")
+    destination_store.replace(destinations)
+
+
+def load_destinations_page(after=None, limit=50):
+    """
+    Load one page of destinations ordered by ID.
+    """
+    return destination_store.page(after, limit)
+
+
+def find_destination_by_id(destination_id):
+    """
+    Find a destination by ID.
+    """
+    return destination_store.get(destination_id)
+
+
+def search_destinations(query, limit=20, fuzzy=False):
+    """
+    Find the destinations best matching a free-text query, tolerating typos
+    in names and locations when fuzzy is set.
+    """
+    return destination_store.search(query, limit, fuzzy)
+
+
+def autocomplete_destinations(prefix, limit=10):
+    """
+    Find destinations with a word in their name starting with prefix.
+    """
+    return destination_store.autocomplete(prefix, limit)
 
 
 def add_destination(destination):
     """
     Add a new destination.
     """
-    destinations = load_destinations()
     destination["id"] = generate_unique_id()
-    destinations.append(destination)
-    save_destinations(destinations)
+    destination_store.put(destination)
     return destination
 
 
+def add_destinations(destinations):
+    """
+    Add several new destinations with a single write.
+    """
+    for destination in destinations:
+        destination["id"] = generate_unique_id()
+    destination_store.put_many(destinations)
+    return destinations
+
+
 def delete_destination_by_id(destination_id):
     """
     Delete a destination by ID.
     """
-    destinations = load_destinations()
-    updated_destinations = [d for d in destinations if d["id"] != destination_id]
-    if len(destinations) == len(updated_destinations):
-        return False  # Not found
-    save_destinations(updated_destinations)
-    return True  # Success
+    return destination_store.delete(destination_id)
+
+
+def delete_destinations_by_id(destination_ids):
+    """
+    Delete several destinations by ID with a single write. Returns the IDs
+    that existed.
+    """
+    return destination_store.delete_many(destination_ids)
+
+
+def get_bookings_version():
+    """
+    Return the current version of the booking data.
+    """
+    return booking_store.version
 
 
 def load_bookings():
     """
-    Load bookings from the bookings_data.py file.
+    Load all bookings from the configured store as Booking objects.
+    """
+    return booking_store.all()
+
+
+def load_bookings_page(after=None, limit=50):
+    """
+    Load one page of bookings ordered by ID.
+    """
+    return booking_store.page(after, limit)
+
+
+def query_bookings(**filters):
+    """
+    Load the bookings matching the given filters, ordered by ID.
+    """
+    return booking_store.query(**filters)
+
+
+def iter_bookings(batch_size=500):
+    """
+    Yield every booking in ID order, fetching batch_size at a time.
     """
-    try:
-        with open(BOOKINGS_DATA_FILE, "r") as file:
-            content = file.read()
-            return ast.literal_eval(content.split("=", 1)[1].strip())
-    except (FileNotFoundError, SyntaxError, ValueError):
-        return []
+    after = None
+    while True:
+        bookings, after = booking_store.page(after, batch_size)
+        yield from bookings
+        if after is None:
+            return
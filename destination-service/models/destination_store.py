@@ -0,0 +1,60 @@
+from common.log_store import LogStore
+from .repository import DestinationRepository
+from .search_index import SearchIndex, PrefixIndex, TrigramIndex
+
+
+class DestinationStore(LogStore, DestinationRepository):
+    """
+    Resident destination store keyed by destination id.
+
+    Additions and deletions are appended to a log instead of rewriting
+    destination_data.py, which is refreshed by background compaction.
+    Full-text, trigram and name prefix indexes follow every change as it
+    is applied.
+    """
+
+    variable = "destinations"
+    ordered = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._search_index = SearchIndex()
+        self._prefix_index = PrefixIndex()
+        self._trigram_index = TrigramIndex()
+
+    def key(self, record):
+        return record.get("id")
+
+    def on_change(self, key, record):
+        if record is None:
+            self._search_index.remove(key)
+            self._prefix_index.remove(key)
+            self._trigram_index.remove(key)
+        else:
+            self._search_index.add(key, record)
+            self._prefix_index.add(key, record.get("name"))
+            self._trigram_index.add(key, record)
+
+    def on_reset(self):
+        self._search_index = SearchIndex()
+        self._prefix_index = PrefixIndex.build(
+            (key, record.get("name")) for key, record in self._records.items()
+        )
+        self._trigram_index = TrigramIndex()
+        for key, record in self._records.items():
+            self._search_index.add(key, record)
+            self._trigram_index.add(key, record)
+
+    def search(self, query, limit=20, fuzzy=False):
+        self.refresh()
+        with self._lock:
+            index = self._trigram_index if fuzzy else self._search_index
+            return [self._records[key] for key, _ in index.search(query, limit)]
+
+    def autocomplete(self, prefix, limit=10):
+        self.refresh()
+        with self._lock:
+            return [
+                self._records[key]
+                for key in self._prefix_index.complete(prefix, limit)
+            ]
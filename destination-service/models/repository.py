@@ -0,0 +1,127 @@
+# Booking query filters: name -> (field, comparison). Time bounds are
+# inclusive ISO-8601 strings, which sort chronologically.
+BOOKING_FILTERS = {
+    "user_email": ("user_email", "=="),
+    "destination": ("destination", "=="),
+    "departure_from": ("departure_time", ">="),
+    "departure_to": ("departure_time", "<="),
+    "booked_from": ("booking_date_time", ">="),
+    "booked_to": ("booking_date_time", "<="),
+}
+
+
+class DestinationRepository:
+    """
+    Interface implemented by the destination storage backends.
+    """
+
+    @property
+    def version(self):
+        """
+        Value that changes whenever the stored destinations change.
+        """
+        raise NotImplementedError
+
+    def all(self):
+        """
+        Return every destination in insertion order.
+        """
+        raise NotImplementedError
+
+    def page(self, after=None, limit=50):
+        """
+        Return up to limit destinations with ids greater than after, in id
+        order, and the id to continue from (None on the last page).
+        """
+        raise NotImplementedError
+
+    def get(self, destination_id):
+        """
+        Return the destination with the given id, or None.
+        """
+        raise NotImplementedError
+
+    def search(self, query, limit=20, fuzzy=False):
+        """
+        Return up to limit destinations whose name, description or location
+        match words in query, most relevant first. With fuzzy, names and
+        locations also match misspelled words by trigram similarity.
+        """
+        raise NotImplementedError
+
+    def autocomplete(self, prefix, limit=10):
+        """
+        Return up to limit destinations with a word in their name starting
+        with prefix.
+        """
+        raise NotImplementedError
+
+    def put(self, destination):
+        """
+        Insert or replace a destination and return it.
+        """
+        raise NotImplementedError
+
+    def delete(self, destination_id):
+        """
+        Delete a destination. Returns False if it does not exist.
+        """
+        raise NotImplementedError
+
+    def put_many(self, destinations):
+        """
+        Insert or replace several destinations in one write and return them.
+        """
+        raise NotImplementedError
+
+    def delete_many(self, destination_ids):
+        """
+        Delete several destinations in one write. Returns the ids that
+        existed.
+        """
+        raise NotImplementedError
+
+    def replace(self, destinations):
+        """
+        Replace every stored destination.
+        """
+        raise NotImplementedError
+
+
+class BookingRepository:
+    """
+    Interface implemented by the booking storage backends.
+    """
+
+    @property
+    def version(self):
+        """
+        Value that changes whenever the stored bookings change.
+        """
+        raise NotImplementedError
+
+    def all(self):
+        """
+        Return every booking ordered by id.
+        """
+        raise NotImplementedError
+
+    def page(self, after=None, limit=50):
+        """
+        Return up to limit bookings with ids greater than after, in id
+        order, and the id to continue from (None on the last page).
+        """
+        raise NotImplementedError
+
+    def query(self, **filters):
+        """
+        Return bookings matching every filter in BOOKING_FILTERS that is
+        given, ordered by id.
+        """
+        raise NotImplementedError
+
+    def replace(self, bookings):
+        """
+        Replace every stored booking.
+        """
+        raise NotImplementedError
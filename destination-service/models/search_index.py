@@ -0,0 +1,278 @@
+import re
+import math
+import heapq
+import bisect
+import unicodedata
+from collections import Counter
+
+# Matches in the name count more than matches in the location, and those
+# more than matches in the description.
+FIELD_WEIGHTS = {"name": 3.0, "location": 2.0, "description": 1.0}
+
+TOKEN = re.compile(r"\w+")
+
+# Fields whose words are matched despite typos, and the lowest trigram
+# similarity that still counts as a match.
+FUZZY_FIELDS = ("name", "location")
+FUZZY_THRESHOLD = 0.3
+
+
+def tokenize(text):
+    """
+    Split text into case-folded words with accents removed. Anything but a
+    non-empty string has no words, so a malformed stored record can never
+    break an index rebuild.
+    """
+    if not text or not isinstance(text, str):
+        return []
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return TOKEN.findall(text)
+
+
+class SearchIndex:
+    """
+    Inverted index over destination text fields ranked with BM25.
+
+    Term frequencies and document lengths are weighted per field by
+    FIELD_WEIGHTS. Documents are added and removed one at a time, so the
+    index never has to be rebuilt for a single change.
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self.postings = {}
+        self.lengths = {}
+        self.terms = {}
+        self.total_length = 0.0
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def add(self, key, document):
+        """
+        Index a document under key, replacing any earlier version.
+        """
+        self.remove(key)
+        frequencies = {}
+        length = 0.0
+        for field, weight in FIELD_WEIGHTS.items():
+            for term in tokenize(document.get(field)):
+                frequencies[term] = frequencies.get(term, 0.0) + weight
+                length += weight
+        for term, frequency in frequencies.items():
+            self.postings.setdefault(term, {})[key] = frequency
+        self.terms[key] = tuple(frequencies)
+        self.lengths[key] = length
+        self.total_length += length
+
+    def remove(self, key):
+        """
+        Drop the document stored under key, if any.
+        """
+        terms = self.terms.pop(key, None)
+        if terms is None:
+            return
+        for term in terms:
+            posting = self.postings[term]
+            del posting[key]
+            if not posting:
+                del self.postings[term]
+        self.total_length -= self.lengths.pop(key)
+
+    def search(self, query, limit=20):
+        """
+        Return up to limit (key, score) pairs for the query, best first.
+        """
+        count = len(self.lengths)
+        if not count:
+            return []
+        average_length = self.total_length / count or 1.0
+        scores = {}
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for key, frequency in posting.items():
+                norm = self.k1 * (
+                    1 - self.b + self.b * self.lengths[key] / average_length
+                )
+                scores[key] = scores.get(key, 0.0) + idf * frequency * (
+                    self.k1 + 1
+                ) / (frequency + norm)
+        return heapq.nsmallest(
+            limit, scores.items(), key=lambda item: (-item[1], item[0])
+        )
+
+
+def name_keys(name):
+    """
+    Return the normalized name starting at each of its words.
+    """
+    tokens = tokenize(name)
+    return {" ".join(tokens[start:]) for start in range(len(tokens))}
+
+
+class PrefixIndex:
+    """
+    Sorted array of normalized names for prefix lookups.
+
+    Each name is stored once per word it contains, starting at that word,
+    so "york" completes "New York". A lookup is one bisect and a scan of
+    the matches; adds and deletes are one insort or delete per word.
+    """
+
+    def __init__(self):
+        self.entries = []
+        self.keys = {}
+
+    @classmethod
+    def build(cls, names):
+        """
+        Return an index of (key, name) pairs with distinct keys, sorted
+        once instead of one insort per word.
+        """
+        index = cls()
+        for key, name in names:
+            texts = name_keys(name)
+            index.entries.extend((text, key) for text in texts)
+            index.keys[key] = texts
+        index.entries.sort()
+        return index
+
+    def add(self, key, name):
+        """
+        Index a name under key, replacing any earlier name.
+        """
+        self.remove(key)
+        texts = name_keys(name)
+        for text in texts:
+            bisect.insort(self.entries, (text, key))
+        self.keys[key] = texts
+
+    def remove(self, key):
+        """
+        Drop the name stored under key, if any.
+        """
+        for text in self.keys.pop(key, ()):
+            del self.entries[bisect.bisect_left(self.entries, (text, key))]
+
+    def complete(self, prefix, limit=10):
+        """
+        Return up to limit keys whose names have a word starting with
+        prefix, in order of the matching text.
+        """
+        prefix = " ".join(tokenize(prefix))
+        if not prefix:
+            return []
+        keys = []
+        position = bisect.bisect_left(self.entries, (prefix,))
+        while position < len(self.entries) and len(keys) < limit:
+            text, key = self.entries[position]
+            if not text.startswith(prefix):
+                break
+            if key not in keys:
+                keys.append(key)
+            position += 1
+        return keys
+
+
+def trigrams(word):
+    """
+    Return the set of trigrams of a word padded with two leading spaces and
+    one trailing space, so short words and word starts count.
+    """
+    padded = f"  {word} "
+    return {padded[start : start + 3] for start in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    Typo-tolerant word lookup over destination names and locations.
+
+    Every distinct word is indexed once by its trigrams. A query word is
+    compared with the words sharing at least one trigram, counted in bulk
+    with Counter.update, and similarity is shared trigrams over the union
+    of both words' trigrams.
+    """
+
+    def __init__(self, threshold=FUZZY_THRESHOLD):
+        self.threshold = threshold
+        self.postings = {}
+        self.word_keys = {}
+        self.key_words = {}
+        self.sizes = {}
+
+    def add(self, key, document):
+        """
+        Index the fuzzy fields of a document under key.
+        """
+        self.remove(key)
+        words = set()
+        for field in FUZZY_FIELDS:
+            words.update(tokenize(document.get(field)))
+        for word in words:
+            keys = self.word_keys.get(word)
+            if keys is None:
+                keys = self.word_keys[word] = set()
+                grams = trigrams(word)
+                for trigram in grams:
+                    self.postings.setdefault(trigram, set()).add(word)
+                self.sizes[word] = len(grams)
+            keys.add(key)
+        self.key_words[key] = words
+
+    def remove(self, key):
+        """
+        Drop the document stored under key, if any.
+        """
+        for word in self.key_words.pop(key, ()):
+            keys = self.word_keys[word]
+            keys.discard(key)
+            if keys:
+                continue
+            del self.word_keys[word]
+            del self.sizes[word]
+            for trigram in trigrams(word):
+                posting = self.postings[trigram]
+                posting.discard(word)
+                if not posting:
+                    del self.postings[trigram]
+
+    def similar_words(self, word):
+        """
+        Return {indexed word: similarity} for words close enough to word.
+        """
+        grams = trigrams(word)
+        shared = Counter()
+        for trigram in grams:
+            posting = self.postings.get(trigram)
+            if posting:
+                shared.update(posting)
+        similar = {}
+        for candidate, count in shared.items():
+            similarity = count / (len(grams) + self.sizes[candidate] - count)
+            if similarity >= self.threshold:
+                similar[candidate] = similarity
+        return similar
+
+    def search(self, query, limit=20):
+        """
+        Return up to limit (key, score) pairs, best first. A document
+        scores the best similarity it reaches for each query word, summed.
+        """
+        scores = {}
+        for term in set(tokenize(query)):
+            best = {}
+            for word, similarity in self.similar_words(term).items():
+                for key in self.word_keys[word]:
+                    if similarity > best.get(key, 0.0):
+                        best[key] = similarity
+            for key, similarity in best.items():
+                scores[key] = scores.get(key, 0.0) + similarity
+        return heapq.nsmallest(
+            limit, scores.items(), key=lambda item: (-item[1], item[0])
+        )
@@ -0,0 +1,401 @@
+import sqlite3
+from operator import attrgetter, itemgetter
+from common.sqlite import ConnectionPool
+from .repository import DestinationRepository, BookingRepository, BOOKING_FILTERS
+from .booking import Booking
+from .search_index import FIELD_WEIGHTS, TrigramIndex, tokenize
+
+# Each entry upgrades the schema by one version (PRAGMA user_version).
+MIGRATIONS = [
+    """
+    CREATE TABLE destinations (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        description TEXT,
+        location TEXT
+    );
+    CREATE TABLE bookings (
+        id INTEGER PRIMARY KEY,
+        user_email TEXT,
+        booking_date_time TEXT,
+        departure_time TEXT,
+        arrival_time TEXT,
+        destination TEXT,
+        stay_duration_days INTEGER
+    );
+    CREATE INDEX bookings_destination ON bookings (destination);
+    CREATE INDEX bookings_user_email ON bookings (user_email);
+    CREATE INDEX bookings_departure_time ON bookings (departure_time);
+    """,
+    """
+    CREATE TABLE versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL);
+    INSERT INTO versions (name, version) VALUES ('destinations', 0), ('bookings', 0);
+    CREATE TRIGGER destinations_insert AFTER INSERT ON destinations BEGIN
+        UPDATE versions SET version = version + 1 WHERE name = 'destinations';
+    END;
+    CREATE TRIGGER destinations_update AFTER UPDATE ON destinations BEGIN
+        UPDATE versions SET version = version + 1 WHERE name = 'destinations';
+    END;
+    CREATE TRIGGER destinations_delete AFTER DELETE ON destinations BEGIN
+        UPDATE versions SET version = version + 1 WHERE name = 'destinations';
+    END;
+    CREATE TRIGGER bookings_insert AFTER INSERT ON bookings BEGIN
+        UPDATE versions SET version = version + 1 WHERE name = 'bookings';
+    END;
+    CREATE TRIGGER bookings_update AFTER UPDATE ON bookings BEGIN
+        UPDATE versions SET version = version + 1 WHERE name = 'bookings';
+    END;
+    CREATE TRIGGER bookings_delete AFTER DELETE ON bookings BEGIN
+        UPDATE versions SET version = version + 1 WHERE name = 'bookings';
+    END;
+    """,
+    """
+    CREATE INDEX bookings_booking_date_time ON bookings (booking_date_time);
+    """,
+    """
+    CREATE VIRTUAL TABLE destinations_search USING fts5(
+        name, description, location,
+        content = 'destinations',
+        tokenize = 'unicode61 remove_diacritics 2'
+    );
+    INSERT INTO destinations_search (destinations_search) VALUES ('rebuild');
+    CREATE TRIGGER destinations_search_insert AFTER INSERT ON destinations BEGIN
+        INSERT INTO destinations_search (rowid, name, description, location)
+        VALUES (new.rowid, new.name, new.description, new.location);
+    END;
+    CREATE TRIGGER destinations_search_delete AFTER DELETE ON destinations BEGIN
+        INSERT INTO destinations_search
+            (destinations_search, rowid, name, description, location)
+        VALUES ('delete', old.rowid, old.name, old.description, old.location);
+    END;
+    CREATE TRIGGER destinations_search_update AFTER UPDATE ON destinations BEGIN
+        INSERT INTO destinations_search
+            (destinations_search, rowid, name, description, location)
+        VALUES ('delete', old.rowid, old.name, old.description, old.location);
+        INSERT INTO destinations_search (rowid, name, description, location)
+        VALUES (new.rowid, new.name, new.description, new.location);
+    END;
+    """,
+]
+
+# Upserts update rows in place, so the update triggers keep the full-text
+# index in step. INSERT OR REPLACE would delete without firing triggers.
+UPSERT_DESTINATION = (
+    "INSERT INTO destinations (name, description, location, id)"
+    " VALUES (?, ?, ?, ?) ON CONFLICT (id) DO UPDATE SET"
+    " name = excluded.name, description = excluded.description,"
+    " location = excluded.location"
+)
+
+DESTINATION_COLUMNS = ("name", "description", "location", "id")
+BOOKING_COLUMNS = (
+    "id",
+    "user_email",
+    "booking_date_time",
+    "departure_time",
+    "arrival_time",
+    "destination",
+    "stay_duration_days",
+)
+
+
+def split_statements(script):
+    """
+    Split an SQL script into complete statements, keeping trigger bodies
+    whole.
+    """
+    statements = []
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            statements.append(statement.strip())
+            statement = ""
+    if statement.strip():
+        statements.append(statement.strip())
+    return statements
+
+
+class SQLiteDatabase:
+    """
+    Destination-service database file with versioned schema migrations.
+    """
+
+    def __init__(self, path, timeout=30):
+        self.path = path
+        self.pool = ConnectionPool(path, timeout)
+        self.created = self.migrate() == 0
+
+    def connection(self):
+        return self.pool.connection()
+
+    def migrate(self):
+        """
+        Apply pending migrations and return the version found on disk.
+
+        The version is read and every migration applied inside one
+        immediate transaction, so workers starting together wait for each
+        other and only the first one migrates. executescript would commit
+        on its own, so scripts are run one statement at a time.
+        """
+        connection = self.connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            for number, script in enumerate(MIGRATIONS[version:], start=version + 1):
+                for statement in split_statements(script):
+                    connection.execute(statement)
+                connection.execute(f"PRAGMA user_version = {number}")
+        except BaseException:
+            connection.rollback()
+            raise
+        connection.commit()
+        return version
+
+    def version(self, name):
+        """
+        Return the change counter the triggers keep for a table.
+        """
+        row = (
+            self.connection()
+            .execute("SELECT version FROM versions WHERE name = ?", (name,))
+            .fetchone()
+        )
+        return row[0]
+
+    def page_rows(self, select, after, limit):
+        """
+        Run select for up to limit + 1 rows with ids greater than after.
+
+        The first page is read without a WHERE clause and later ones with
+        ``id > ?`` alone, so SQLite can seek on the primary key; a combined
+        ``? IS NULL OR id > ?`` condition makes it scan the whole table.
+        """
+        if after is None:
+            return self.connection().execute(
+                f"{select} ORDER BY id LIMIT ?", (limit + 1,)
+            )
+        return self.connection().execute(
+            f"{select} WHERE id > ? ORDER BY id LIMIT ?", (after, limit + 1)
+        )
+
+    @staticmethod
+    def split_page(records, limit, key=itemgetter("id")):
+        """
+        Trim a limit + 1 row fetch to a page and its continuation key.
+        """
+        if len(records) > limit:
+            return records[:limit], key(records[limit - 1])
+        return records, None
+
+    def close(self):
+        self.pool.close()
+
+
+class SQLiteDestinationStore(DestinationRepository):
+    """
+    Destinations table with a primary-key index on id and an FTS5
+    full-text index over name, description and location.
+
+    Fuzzy search uses an in-memory trigram index, rebuilt from the table
+    the first time it is needed after the destinations version moves.
+    """
+
+    def __init__(self, database):
+        self.database = database
+        self._trigram_index = None
+        self._trigram_version = None
+
+    @property
+    def version(self):
+        return self.database.version("destinations")
+
+    def _to_destination(self, row):
+        return dict(zip(DESTINATION_COLUMNS, row))
+
+    def _to_row(self, destination):
+        return tuple(destination.get(column) for column in DESTINATION_COLUMNS)
+
+    def all(self):
+        rows = self.database.connection().execute(
+            "SELECT name, description, location, id FROM destinations ORDER BY rowid"
+        )
+        return [self._to_destination(row) for row in rows]
+
+    def page(self, after=None, limit=50):
+        rows = self.database.page_rows(
+            "SELECT name, description, location, id FROM destinations", after, limit
+        )
+        return self.database.split_page(
+            [self._to_destination(row) for row in rows], limit
+        )
+
+    def get(self, destination_id):
+        row = (
+            self.database.connection()
+            .execute(
+                "SELECT name, description, location, id FROM destinations WHERE id = ?",
+                (destination_id,),
+            )
+            .fetchone()
+        )
+        return self._to_destination(row) if row else None
+
+    def _fuzzy_search(self, query, limit):
+        version = self.version
+        if self._trigram_version != version:
+            index = TrigramIndex()
+            for destination in self.all():
+                index.add(destination["id"], destination)
+            self._trigram_index, self._trigram_version = index, version
+        destinations = []
+        for key, _ in self._trigram_index.search(query, limit):
+            destination = self.get(key)
+            if destination is not None:
+                destinations.append(destination)
+        return destinations
+
+    def search(self, query, limit=20, fuzzy=False):
+        if fuzzy:
+            return self._fuzzy_search(query, limit)
+        terms = tokenize(query)
+        if not terms:
+            return []
+        weights = ", ".join(
+            str(FIELD_WEIGHTS[field]) for field in ("name", "description", "location")
+        )
+        rows = self.database.connection().execute(
+            "SELECT d.name, d.description, d.location, d.id"
+            " FROM destinations_search JOIN destinations d"
+            " ON d.rowid = destinations_search.rowid"
+            " WHERE destinations_search MATCH ?"
+            f" ORDER BY bm25(destinations_search, {weights}), d.id LIMIT ?",
+            (" OR ".join(f'"{term}"' for term in terms), limit),
+        )
+        return [self._to_destination(row) for row in rows]
+
+    def autocomplete(self, prefix, limit=10):
+        terms = tokenize(prefix)
+        if not terms:
+            return []
+        rows = self.database.connection().execute(
+            "SELECT d.name, d.description, d.location, d.id"
+            " FROM destinations_search JOIN destinations d"
+            " ON d.rowid = destinations_search.rowid"
+            " WHERE destinations_search MATCH ? ORDER BY d.name, d.id LIMIT ?",
+            (f'name : "{" ".join(terms)}" *', limit),
+        )
+        return [self._to_destination(row) for row in rows]
+
+    def put(self, destination):
+        with self.database.connection() as connection:
+            connection.execute(UPSERT_DESTINATION, self._to_row(destination))
+        return destination
+
+    def delete(self, destination_id):
+        with self.database.connection() as connection:
+            cursor = connection.execute(
+                "DELETE FROM destinations WHERE id = ?", (destination_id,)
+            )
+        return cursor.rowcount > 0
+
+    def put_many(self, destinations):
+        destinations = list(destinations)
+        with self.database.connection() as connection:
+            connection.executemany(
+                UPSERT_DESTINATION,
+                [self._to_row(destination) for destination in destinations],
+            )
+        return destinations
+
+    def delete_many(self, destination_ids):
+        deleted = []
+        with self.database.connection() as connection:
+            for destination_id in dict.fromkeys(destination_ids):
+                cursor = connection.execute(
+                    "DELETE FROM destinations WHERE id = ?", (destination_id,)
+                )
+                if cursor.rowcount:
+                    deleted.append(destination_id)
+        return deleted
+
+    def replace(self, destinations):
+        with self.database.connection() as connection:
+            connection.execute("DELETE FROM destinations")
+            connection.executemany(
+                UPSERT_DESTINATION,
+                [self._to_row(destination) for destination in destinations],
+            )
+
+    def __len__(self):
+        return (
+            self.database.connection()
+            .execute("SELECT COUNT(*) FROM destinations")
+            .fetchone()[0]
+        )
+
+class SQLiteBookingStore(BookingRepository):
+    """
+    Bookings table with secondary indexes on destination, user_email,
+    departure_time and booking_date_time.
+    """
+
+    def __init__(self, database):
+        self.database = database
+
+    @property
+    def version(self):
+        return self.database.version("bookings")
+
+    def _to_booking(self, row):
+        return Booking.from_dict(dict(zip(BOOKING_COLUMNS, row)))
+
+    def all(self):
+        rows = self.database.connection().execute(
+            f"SELECT {', '.join(BOOKING_COLUMNS)} FROM bookings ORDER BY id"
+        )
+        return [self._to_booking(row) for row in rows]
+
+    def page(self, after=None, limit=50):
+        rows = self.database.page_rows(
+            f"SELECT {', '.join(BOOKING_COLUMNS)} FROM bookings", after, limit
+        )
+        return self.database.split_page(
+            [self._to_booking(row) for row in rows], limit, attrgetter("id")
+        )
+
+    def query(self, **filters):
+        """
+        Return bookings matching every given filter, ordered by id.
+
+        Each filter column has its own index.
+        """
+        clauses = []
+        params = []
+        for name, value in filters.items():
+            if value is None:
+                continue
+            field, comparison = BOOKING_FILTERS[name]
+            clauses.append(f"{field} {'=' if comparison == '==' else comparison} ?")
+            params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.database.connection().execute(
+            f"SELECT {', '.join(BOOKING_COLUMNS)} FROM bookings{where} ORDER BY id",
+            params,
+        )
+        return [self._to_booking(row) for row in rows]
+
+    def replace(self, bookings):
+        placeholders = ", ".join("?" for _ in BOOKING_COLUMNS)
+        with self.database.connection() as connection:
+            connection.execute("DELETE FROM bookings")
+            connection.executemany(
+                f"INSERT OR REPLACE INTO bookings ({', '.join(BOOKING_COLUMNS)})"
+                f" VALUES ({placeholders})",
+                [
+                    tuple(record.get(column) for column in BOOKING_COLUMNS)
+                    for record in (
+                        Booking.from_dict(booking).to_dict() for booking in bookings
+                    )
+                ],
+            )
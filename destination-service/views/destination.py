@@ -1,20 +1,71 @@
-from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    jsonify,
+    request,
+    stream_with_context,
+)
 from controllers.destination import (
     fetch_all_destinations,
+    fetch_destinations_page,
+    destinations_version,
+    fetch_destination,
+    find_destinations,
+    complete_destination_names,
+    DEFAULT_SEARCH_LIMIT,
+    DEFAULT_AUTOCOMPLETE_LIMIT,
     create_destination,
+    create_destinations,
     remove_destination,
+    remove_destinations,
     get_all_bookings,
+    get_bookings_page,
+    stream_bookings,
+    find_bookings,
+    get_bookings_page_of,
+    bookings_version,
 )
+from common.auth import admin_required
+from common.response_cache import cached_json_response, etag_json_response
+from common.pagination import wants_page, parse_page_args, page_response
 
 destination_blueprint = Blueprint("destination", __name__)
 
 
+def bulk_status(done, errors, success_status, failure_status):
+    """
+    Pick the status of a bulk response: success when nothing failed,
+    failure when nothing succeeded, 207 Multi-Status otherwise.
+    """
+    if not errors:
+        return success_status
+    if not done:
+        return failure_status
+    return 207
+
+
 @destination_blueprint.route("/destinations", methods=["GET"])
 def get_destinations():
     """
     Retrieve all destinations
     ---
+    parameters:
+      - name: limit
+        in: query
+        required: false
+        type: integer
+        description: Page size (1-1000). Returns a page instead of the full list.
+      - name: cursor
+        in: query
+        required: false
+        type: string
+        description: next_cursor from the previous page
+      - name: If-None-Match
+        in: header
+        required: false
+        type: string
+        description: ETag from a previous response
     responses:
       200:
         description: List of all destinations
@@ -35,12 +86,166 @@ def get_destinations():
               location:
                 type: string
                 description: Destination location
+      304:
+        description: Not modified since the ETag in If-None-Match
+      400:
+        description: Invalid limit or cursor
+    """
+    if wants_page(request.args):
+        try:
+            limit, after = parse_page_args(request.args)
+            return page_response(*fetch_destinations_page(limit, after))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+    return cached_json_response(
+        "destinations", destinations_version(), fetch_all_destinations
+    )
+
+
+@destination_blueprint.route("/destinations/search", methods=["GET"])
+def search_destinations():
+    """
+    Search destinations by name, description and location
+    ---
+    parameters:
+      - name: q
+        in: query
+        required: true
+        type: string
+        description: Words to search for; case and accents are ignored
+      - name: limit
+        in: query
+        required: false
+        type: integer
+        description: Maximum number of results (1-100, default 20)
+      - name: fuzzy
+        in: query
+        required: false
+        type: boolean
+        description: Also match misspelled names and locations ("Pariss", "Tokio")
+    responses:
+      200:
+        description: Matching destinations, most relevant first
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              id:
+                type: string
+              name:
+                type: string
+              description:
+                type: string
+              location:
+                type: string
+      304:
+        description: Not modified since the given ETag
+      400:
+        description: Missing query or invalid limit
+    """
+    try:
+        limit = int(request.args.get("limit", DEFAULT_SEARCH_LIMIT))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    try:
+        results = find_destinations(
+            request.args.get("q", ""),
+            limit,
+            request.args.get("fuzzy", "").lower() in ("1", "true", "yes"),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return etag_json_response(results)
+
+
+@destination_blueprint.route("/destinations/autocomplete", methods=["GET"])
+def autocomplete_destinations():
+    """
+    Suggest destination names for a typed prefix
+    ---
+    parameters:
+      - name: prefix
+        in: query
+        required: true
+        type: string
+        description: Start of any word in the name; case and accents are ignored
+      - name: limit
+        in: query
+        required: false
+        type: integer
+        description: Maximum number of suggestions (1-100, default 10)
+    responses:
+      200:
+        description: Matching destination names
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              id:
+                type: string
+              name:
+                type: string
+      304:
+        description: Not modified since the given ETag
+      400:
+        description: Missing prefix or invalid limit
+    """
+    try:
+        limit = int(request.args.get("limit", DEFAULT_AUTOCOMPLETE_LIMIT))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    try:
+        names = complete_destination_names(request.args.get("prefix", ""), limit)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return etag_json_response(names)
+
+
+@destination_blueprint.route(
+    "/destinations/<string:destination_id>", methods=["GET"]
+)
+def get_destination(destination_id):
+    """
+    Retrieve a destination by ID
+    ---
+    parameters:
+      - name: destination_id
+        in: path
+        required: true
+        type: string
+        description: ID of the destination to retrieve
+    responses:
+      200:
+        description: The destination
+        schema:
+          type: object
+          properties:
+            id:
+              type: string
+              description: Destination ID
+            name:
+              type: string
+              description: Destination name
+            description:
+              type: string
+              description: Destination description
+            location:
+              type: string
+              description: Destination location
+      404:
+        description: Destination not found
     """
-    return jsonify(fetch_all_destinations()), 200
+    try:
+        return jsonify(fetch_destination(destination_id)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
 
 
 @destination_blueprint.route("/destinations", methods=["POST"])
-@jwt_required()
+@admin_required(status=401)
 def add_destination():
     """
     Add a new destination (Admins Only)
@@ -74,10 +279,6 @@ def add_destination():
       401:
         description: Unauthorized or not an admin
     """
-    claims = get_jwt()
-    if claims.get("role") != "Admin":
-        return jsonify({"error": "Access denied. Admins only."}), 401
-
     try:
         data = request.get_json()
         destination = create_destination(data)
@@ -97,7 +298,7 @@ def add_destination():
 @destination_blueprint.route(
     "/destinations/<string:destination_id>", methods=["DELETE"]
 )
-@jwt_required()
+@admin_required(status=401)
 def delete_destination(destination_id):
     """
     Delete a destination (Admins Only)
@@ -118,10 +319,6 @@ def delete_destination(destination_id):
       404:
         description: Destination not found
     """
-    claims = get_jwt()
-    if claims.get("role") != "Admin":
-        return jsonify({"error": "Access denied. Admins only."}), 401
-
     try:
         remove_destination(destination_id)
         return jsonify({"message": "Destination deleted successfully"}), 200
@@ -129,14 +326,149 @@ def delete_destination(destination_id):
         return jsonify({"error": str(e)}), 404
 
 
+@destination_blueprint.route("/destinations/bulk", methods=["POST"])
+@admin_required(status=401)
+def add_destinations_bulk():
+    """
+    Add many destinations in one request (Admins Only)
+    ---
+    security:
+      - Bearer: []
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              name:
+                type: string
+                example: Paris
+              description:
+                type: string
+                example: City of Lights
+              location:
+                type: string
+                example: France
+    responses:
+      201:
+        description: All destinations added
+      207:
+        description: Some destinations added; see errors
+      400:
+        description: Body is not a list, or no destination was valid
+      401:
+        description: Unauthorized or not an admin
+    """
+    try:
+        created, errors = create_destinations(request.get_json())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return (
+        jsonify({"created": created, "errors": errors}),
+        bulk_status(created, errors, 201, 400),
+    )
+
+
+@destination_blueprint.route("/destinations/bulk", methods=["DELETE"])
+@admin_required(status=401)
+def delete_destinations_bulk():
+    """
+    Delete many destinations in one request (Admins Only)
+    ---
+    security:
+      - Bearer: []
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: array
+          items:
+            type: string
+          description: IDs of the destinations to delete
+    responses:
+      200:
+        description: All destinations deleted
+      207:
+        description: Some destinations deleted; see errors
+      400:
+        description: Body is not a list
+      401:
+        description: Unauthorized or not an admin
+      404:
+        description: None of the destinations were found
+    """
+    try:
+        deleted, errors = remove_destinations(request.get_json())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return (
+        jsonify({"deleted": deleted, "errors": errors}),
+        bulk_status(deleted, errors, 200, 404),
+    )
+
+
 @destination_blueprint.route("/bookings", methods=["GET"])
-@jwt_required()
+@admin_required(status=403)
 def view_all_bookings():
     """
     View all bookings (Admins Only)
     ---
     security:
       - Bearer: []
+    parameters:
+      - name: limit
+        in: query
+        required: false
+        type: integer
+        description: Page size (1-1000). Returns a page instead of the full list.
+      - name: cursor
+        in: query
+        required: false
+        type: string
+        description: next_cursor from the previous page
+      - name: user_email
+        in: query
+        required: false
+        type: string
+        description: Only bookings made by this email
+      - name: destination
+        in: query
+        required: false
+        type: string
+        description: Only bookings for this destination
+      - name: departure_from
+        in: query
+        required: false
+        type: string
+        format: date-time
+        description: Earliest departure_time (inclusive, ISO-8601)
+      - name: departure_to
+        in: query
+        required: false
+        type: string
+        format: date-time
+        description: Latest departure_time (inclusive, ISO-8601)
+      - name: booked_from
+        in: query
+        required: false
+        type: string
+        format: date-time
+        description: Earliest booking_date_time (inclusive, ISO-8601)
+      - name: booked_to
+        in: query
+        required: false
+        type: string
+        format: date-time
+        description: Latest booking_date_time (inclusive, ISO-8601)
+      - name: If-None-Match
+        in: header
+        required: false
+        type: string
+        description: ETag from a previous response
     responses:
       200:
         description: List of all bookings
@@ -169,16 +501,67 @@ def view_all_bookings():
               stay_duration_days:
                 type: integer
                 description: Duration of stay in days
+      304:
+        description: Not modified since the ETag in If-None-Match
+      400:
+        description: Invalid limit, cursor or filter
       401:
         description: Unauthorized access
       403:
         description: Forbidden - Admin access required
     """
-    # Check admin role
-    claims = get_jwt()
-    if claims.get("role") != "Admin":
-        return jsonify({"error": "Access denied. Admins only."}), 403
+    filters = {
+        name: value
+        for name, value in request.args.items()
+        if name not in ("limit", "cursor")
+    }
+    try:
+        if filters:
+            bookings = find_bookings(filters)
+            if wants_page(request.args):
+                limit, after = parse_page_args(request.args)
+                return page_response(*get_bookings_page_of(bookings, limit, after))
+            return etag_json_response(bookings)
+
+        if wants_page(request.args):
+            limit, after = parse_page_args(request.args)
+            return page_response(*get_bookings_page(limit, after))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     # Fetch all bookings
-    bookings = get_all_bookings()
-    return jsonify(bookings), 200
+    return cached_json_response("bookings", bookings_version(), get_all_bookings)
+
+
+@destination_blueprint.route("/bookings/export", methods=["GET"])
+@admin_required(status=403)
+def export_bookings():
+    """
+    Export all bookings as newline-delimited JSON (Admins Only)
+    ---
+    security:
+      - Bearer: []
+    produces:
+      - application/x-ndjson
+    responses:
+      200:
+        description: One booking JSON object per line, streamed
+      401:
+        description: Unauthorized access
+      403:
+        description: Forbidden - Admin access required
+    """
+    def generate(batch_size=500):
+        dumps = current_app.json.dumps
+        lines = []
+        for booking in stream_bookings():
+            lines.append(dumps(booking) + "\n")
+            if len(lines) >= batch_size:
+                yield "".join(lines)
+                lines = []
+        if lines:
+            yield "".join(lines)
+
+    return Response(
+        stream_with_context(generate()), mimetype="application/x-ndjson"
+    )
@@ -0,0 +1,51 @@
+import pytest
+import hash_calibration
+
+
+def fake_cost(method, repeat=3):
+    """
+    Pretend verify time grows linearly with the method's cost parameter.
+    """
+    name, *args = method.split(":")
+    if name == "scrypt":
+        return int(args[0]) / 2**15 * 0.1
+    return int(args[1]) / 100_000 * 0.05
+
+
+def test_calibrate_scrypt_stays_under_target(mocker):
+    """
+    Test that the largest n within the target is picked.
+    """
+    mocker.patch("hash_calibration.time_method", side_effect=fake_cost)
+    method, rows = hash_calibration.calibrate_scrypt(0.25)
+    assert method == "scrypt:65536:8:1"
+    assert [row[0] for row in rows][-2:] == ["scrypt:32768:8:1", "scrypt:65536:8:1"]
+
+    method, _ = hash_calibration.calibrate_scrypt(0.0001)
+    assert method == "scrypt:4096:8:1"
+
+
+def test_calibrate_pbkdf2_scales_iterations(mocker):
+    """
+    Test that pbkdf2 iterations are scaled from the probe to the target.
+    """
+    mocker.patch("hash_calibration.time_method", side_effect=fake_cost)
+    method, rows = hash_calibration.calibrate_pbkdf2(0.3)
+    assert method == "pbkdf2:sha256:600000"
+    assert rows[-1] == (method, pytest.approx(0.3))
+
+
+def test_time_method_measures_verify():
+    """
+    Test timing a real, cheap hash method.
+    """
+    assert hash_calibration.time_method("pbkdf2:sha256:1000", repeat=1) > 0
+
+
+def test_main_prints_method(mocker, capsys):
+    """
+    Test the command-line output.
+    """
+    mocker.patch("hash_calibration.time_method", side_effect=fake_cost)
+    assert hash_calibration.main(["--target-ms", "250"]) == 0
+    assert "PASSWORD_HASH_METHOD=scrypt:65536:8:1" in capsys.readouterr().out
@@ -0,0 +1,146 @@
+import sqlite3
+import threading
+import pytest
+from models.sqlite_user_store import SQLiteUserStore
+from models.user_store import UserStore
+from models.user import configure_user_store
+
+
+@pytest.fixture
+def store(tmp_path):
+    """
+    Provide an SQLite user store in a temporary database.
+    """
+    store = SQLiteUserStore(str(tmp_path / "users.sqlite3"))
+    yield store
+    store.close()
+
+
+def make_user(email, role="User"):
+    return {"email": email, "name": "Test User", "password": "hash", "role": role}
+
+
+def test_add_and_find(store):
+    """
+    Test that users are found by normalized email.
+    """
+    store.add(make_user("Test@Example.com"))
+    user = store.find("test@example.com")
+    assert user == make_user("Test@Example.com")
+    assert store.find("missing@example.com") is None
+
+
+def test_duplicate_email_rejected(store):
+    """
+    Test that the unique index rejects a second registration.
+    """
+    store.add(make_user("test@example.com"))
+    with pytest.raises(ValueError, match="Email already registered"):
+        store.add(make_user("TEST@example.com"))
+    assert len(store) == 1
+
+
+def test_wal_mode(store):
+    """
+    Test that the database runs in WAL journal mode.
+    """
+    mode = store._connection().execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_connection_per_thread(store):
+    """
+    Test that each thread gets its own connection.
+    """
+    connections = []
+    thread = threading.Thread(target=lambda: connections.append(store._connection()))
+    thread.start()
+    thread.join()
+    assert connections[0] is not store._connection()
+
+
+def test_connection_closes_when_thread_ends(store):
+    """
+    Test that a thread keeps one connection while it runs and that the
+    connection is closed once the thread has finished.
+    """
+    seen = []
+
+    def request():
+        seen.append(store._connection())
+        store.find("test@example.com")
+        seen.append(store._connection())
+
+    opened = list(store.pool._connections)
+    thread = threading.Thread(target=request)
+    thread.start()
+    thread.join()
+
+    assert seen[0] is seen[1]
+    assert store.pool._connections == opened
+    with pytest.raises(sqlite3.ProgrammingError):
+        seen[0].execute("SELECT 1")
+
+
+def test_replace_keeps_order(store):
+    """
+    Test that replace stores users in the given order.
+    """
+    users = [make_user("b@example.com"), make_user("a@example.com", "Admin")]
+    store.add(make_user("old@example.com"))
+    store.replace(users)
+    assert store.all() == users
+
+
+def test_configure_sqlite_seeds_from_file(tmp_path):
+    """
+    Test that a new SQLite database is seeded from the flat file.
+    """
+    data_file = str(tmp_path / "user_data.py")
+    UserStore(data_file).replace([make_user("seed@example.com")])
+
+    store = configure_user_store(
+        {
+            "USER_STORE_BACKEND": "sqlite",
+            "USER_DATA_FILE": data_file,
+            "USER_LOG_FILE": str(tmp_path / "user_data.log"),
+            "USER_DATABASE": str(tmp_path / "users.sqlite3"),
+        }
+    )
+    try:
+        assert isinstance(store, SQLiteUserStore)
+        assert store.find("seed@example.com") is not None
+    finally:
+        store.close()
+        configure_user_store({})
+
+
+def test_add_many(store):
+    """
+    Test that a batch skips emails that are already taken.
+    """
+    store.add(make_user("one@example.com"))
+    added, taken = store.add_many(
+        [make_user("ONE@example.com"), make_user("two@example.com"), make_user("Two@example.com")]
+    )
+    assert [user["email"] for user in added] == ["two@example.com"]
+    assert [user["email"] for user in taken] == ["ONE@example.com", "Two@example.com"]
+    assert len(store) == 2
+
+
+def test_set_password(store):
+    """
+    Test replacing a stored password hash.
+    """
+    store.add(make_user("one@example.com"))
+    assert store.set_password("ONE@example.com", "new-hash") is True
+    assert store.find("one@example.com")["password"] == "new-hash"
+    assert store.set_password("missing@example.com", "new-hash") is False
+
+
+def test_configure_unknown_backend():
+    """
+    Test that an unknown backend name is rejected.
+    """
+    with pytest.raises(ValueError, match="Unknown user store backend"):
+        configure_user_store({"USER_STORE_BACKEND": "redis"})
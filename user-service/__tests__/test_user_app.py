@@ -3,6 +3,8 @@ from flask import Flask
 from flask_jwt_extended import JWTManager, create_access_token
 from werkzeug.security import generate_password_hash
 from views.user import user_blueprint
+from models.user_store import UserStore
+from models.refresh_token import RefreshTokenStore
 from flasgger import Swagger
 
 
@@ -50,7 +52,7 @@ def client(app):
 
 
 @pytest.fixture
-def setup_test_users(mocker):
+def setup_test_users(mocker, tmp_path):
     """
     Mock user data for tests.
     """
@@ -69,9 +71,13 @@ def setup_test_users(mocker):
         },
     ]
 
-    mocker.patch("models.user.load_users", return_value=test_users)
-
-    mocker.patch("models.user.save_users")
+    store = UserStore(str(tmp_path / "user_data.py"))
+    store.replace(test_users)
+    mocker.patch("models.user.user_store", store)
+    mocker.patch(
+        "models.refresh_token.refresh_token_store",
+        RefreshTokenStore(str(tmp_path / "refresh_tokens.py")),
+    )
 
 
 @pytest.fixture
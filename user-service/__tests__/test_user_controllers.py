@@ -57,6 +57,23 @@ def test_register_user_missing_fields(setup_user_data):
         register_user(incomplete_data)
 
 
+@pytest.mark.parametrize("field", ["email", "password", "name", "role"])
+def test_register_user_rejects_non_string_fields(setup_user_data, field):
+    """
+    Test that registration fields must be strings, so values like NaN never
+    reach the user data file.
+    """
+    data = {
+        "email": "typed@example.com",
+        "password": "password",
+        "name": "Typed User",
+        "role": "User",
+    }
+    data[field] = float("nan")
+    with pytest.raises(ValueError, match=f"Field '{field}' must be a string"):
+        register_user(data)
+
+
 def test_register_user_invalid_role(setup_user_data):
     """
     Test user registration with an invalid role.
@@ -0,0 +1,122 @@
+import pytest
+from werkzeug.security import check_password_hash, generate_password_hash
+from controllers import hashing
+from controllers.hashing import HashingPool, HashingUnavailable
+from controllers.user import authenticate_user
+from models.user_store import UserStore
+
+
+@pytest.fixture
+def pool():
+    """
+    Provide a single-process hashing pool that is shut down afterwards.
+    """
+    pool = HashingPool(workers=1, max_pending=1)
+    yield pool
+    pool.shutdown()
+
+
+def test_pool_hashes_in_worker(pool):
+    """
+    Test hashing and checking passwords in a worker process.
+    """
+    password_hash = pool.hash("secret")
+    assert check_password_hash(password_hash, "secret")
+    assert pool.check(password_hash, "secret") is True
+    assert pool.check(password_hash, "wrong") is False
+
+
+def test_pool_rejects_when_full(pool):
+    """
+    Test that a call beyond the queue limit fails fast.
+    """
+    pool._slots.acquire()
+    with pytest.raises(HashingUnavailable, match="Too many pending"):
+        pool.hash("secret")
+    pool._slots.release()
+    assert pool.check(pool.hash("secret"), "secret") is True
+
+
+def test_pool_times_out():
+    """
+    Test that a slow hash raises instead of holding the request.
+    """
+    pool = HashingPool(workers=1, timeout=0.0001)
+    try:
+        with pytest.raises(HashingUnavailable, match="timed out"):
+            pool.hash("secret")
+    finally:
+        pool.shutdown()
+
+
+def test_hash_many_keeps_one_chunk_per_worker(mocker):
+    """
+    Test that bulk hashing uses the shared pool without taking more than
+    one queue slot per worker.
+    """
+    pool = HashingPool(workers=1, max_pending=4, method="pbkdf2:sha256:1000")
+    submitted = []
+    submit = pool._submit
+
+    def tracked(*args, **kwargs):
+        assert all(future.done() for future in submitted)
+        submitted.append(submit(*args, **kwargs))
+        return submitted[-1]
+
+    mocker.patch.object(pool, "_submit", side_effect=tracked)
+    try:
+        hashes = pool.hash_many(["a", "b", "c", "d", "e"])
+    finally:
+        pool.shutdown()
+    assert len(submitted) == 5
+    assert [check_password_hash(h, p) for h, p in zip(hashes, "abcde")] == [True] * 5
+
+
+def test_configure_hashing_pool(mocker):
+    """
+    Test that the pool is rebuilt from config values.
+    """
+    mocker.patch.object(hashing, "hashing_pool", HashingPool(workers=0))
+    pool = hashing.configure_hashing_pool(
+        {"HASH_WORKERS": "0", "HASH_QUEUE_LIMIT": "3", "HASH_TIMEOUT": "2.5"}
+    )
+    assert hashing.hashing_pool is pool
+    assert (pool.workers, pool.max_pending, pool.timeout) == (0, 3, 2.5)
+    assert hashing.check_password(hashing.hash_password("secret"), "secret")
+
+
+def test_needs_rehash_compares_parameters():
+    """
+    Test that hashes made with other parameters are flagged.
+    """
+    assert hashing.hash_method("scrypt") == "scrypt:32768:8:1"
+    assert hashing.hash_method("pbkdf2") == "pbkdf2:sha256:1000000"
+    old_hash = generate_password_hash("secret", "pbkdf2:sha256:1000")
+    assert hashing.needs_rehash(old_hash, "pbkdf2:sha256:2000") is True
+    assert hashing.needs_rehash(old_hash, "pbkdf2:sha256:1000") is False
+    with pytest.raises(ValueError, match="Invalid hash method"):
+        hashing.hash_method("md5")
+
+
+def test_login_rehashes_outdated_hash(mocker, tmp_path):
+    """
+    Test that a successful login rewrites an outdated hash in the store.
+    """
+    store = UserStore(str(tmp_path / "user_data.py"))
+    old_hash = generate_password_hash("secret", "pbkdf2:sha256:1000")
+    store.replace([{"email": "a@example.com", "name": "A", "password": old_hash, "role": "User"}])
+    mocker.patch("models.user.user_store", store)
+    mocker.patch.object(
+        hashing, "hashing_pool", HashingPool(workers=0, method="pbkdf2:sha256:2000")
+    )
+
+    authenticate_user({"email": "a@example.com", "password": "secret"})
+    new_hash = store.find("a@example.com")["password"]
+    assert new_hash.startswith("pbkdf2:sha256:2000$")
+    assert check_password_hash(new_hash, "secret")
+
+    spy = mocker.spy(store, "set_password")
+    authenticate_user({"email": "a@example.com", "password": "secret"})
+    with pytest.raises(ValueError, match="Invalid credentials"):
+        authenticate_user({"email": "a@example.com", "password": "wrong"})
+    assert spy.call_count == 0
@@ -0,0 +1,126 @@
+import json
+import pytest
+from werkzeug.security import check_password_hash
+from controllers import hashing
+from controllers.hashing import HashingPool, hash_passwords
+from controllers.user import import_users
+from models.user_store import UserStore
+import user_import
+
+
+@pytest.fixture
+def store(mocker, tmp_path):
+    """
+    Provide an isolated user store with one registered user.
+    """
+    store = UserStore(str(tmp_path / "user_data.py"))
+    store.replace(
+        [{"email": "taken@example.com", "name": "Taken", "password": "hash", "role": "User"}]
+    )
+    mocker.patch("models.user.user_store", store)
+    return store
+
+
+def make_user(email, role="User"):
+    return {"email": email, "password": "secret", "name": "New User", "role": role}
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_hash_passwords_keeps_order(mocker, workers):
+    """
+    Test that pooled and in-process hashing give verifiable hashes in order.
+    """
+    pool = HashingPool(workers=workers, method="pbkdf2:sha256:1000")
+    mocker.patch.object(hashing, "hashing_pool", pool)
+    try:
+        hashes = hash_passwords(["a", "b", "c"])
+    finally:
+        pool.shutdown()
+    assert [check_password_hash(h, p) for h, p in zip(hashes, "abc")] == [True] * 3
+    assert hash_passwords([]) == []
+
+
+def test_import_users_reports_per_item_errors(store, mocker):
+    """
+    Test that valid users are stored in one write and the rest reported.
+    """
+    spy = mocker.spy(store, "put_many")
+
+    added, errors = import_users(
+        [
+            make_user("one@example.com"),
+            make_user("TAKEN@example.com"),
+            make_user("two@example.com", role="Root"),
+            {"email": "three@example.com"},
+            make_user("One@Example.com"),
+            make_user("four@example.com", role="Admin"),
+        ]
+    )
+
+    assert [user["email"] for user in added] == ["one@example.com", "four@example.com"]
+    assert [(error["index"], error["error"]) for error in errors] == [
+        (1, "Email already registered"),
+        (2, "Invalid role. Allowed roles: User, Admin"),
+        (3, "Missing fields: password, name, role"),
+        (4, "Email already registered"),
+    ]
+    assert spy.call_count == 1
+    assert check_password_hash(store.find("four@example.com")["password"], "secret")
+    with pytest.raises(ValueError, match="At most 1 users per request"):
+        import_users([make_user("a@example.com")] * 2, max_items=1)
+
+
+def test_import_users_race_is_reported(store, mocker):
+    """
+    Test that an email registered while hashing is reported, not stored.
+    """
+    mocker.patch(
+        "controllers.user.hash_passwords",
+        side_effect=lambda passwords: store.add(
+            make_user("late@example.com")
+        )
+        and ["hash"] * len(passwords),
+    )
+
+    added, errors = import_users([make_user("late@example.com")])
+
+    assert added == []
+    assert errors == [{"index": 0, "error": "Email already registered"}]
+
+
+def test_cli_imports_file(store, mocker, tmp_path, capsys):
+    """
+    Test the command-line import from a JSON-lines file.
+    """
+    mocker.patch("user_import.configure_user_store")
+    mocker.patch.object(hashing, "hashing_pool", hashing.hashing_pool)
+    path = tmp_path / "users.jsonl"
+    path.write_text(
+        "\n".join(
+            json.dumps(user)
+            for user in (make_user("cli@example.com"), make_user("taken@example.com"))
+        )
+    )
+
+    assert user_import.main([str(path), "--workers", "1"]) == 1
+    captured = capsys.readouterr()
+    assert "Imported 1 users, rejected 1" in captured.out
+    assert "record 1: Email already registered" in captured.err
+    assert store.find("cli@example.com") is not None
+
+
+def test_cli_uses_hash_settings_from_environment(store, mocker, monkeypatch, tmp_path):
+    """
+    Test that the CLI hashes with PASSWORD_HASH_METHOD like the service.
+    """
+    mocker.patch("user_import.configure_user_store")
+    mocker.patch.object(hashing, "hashing_pool", hashing.hashing_pool)
+    monkeypatch.setenv("PASSWORD_HASH_METHOD", "pbkdf2:sha256:1000")
+    monkeypatch.setenv("HASH_WORKERS", "4")
+    path = tmp_path / "users.json"
+    path.write_text(json.dumps([make_user("env@example.com")]))
+
+    assert user_import.main([str(path), "--workers", "0"]) == 0
+    assert hashing.hashing_pool.workers == 0
+    password_hash = store.find("env@example.com")["password"]
+    assert password_hash.startswith("pbkdf2:sha256:1000$")
@@ -12,30 +12,33 @@ from models.user import (
 TEST_USER_DATA_FILE = os.path.join(os.path.dirname(__file__), "test_user_data.py")
 
 USER_DATA_FILE = os.path.join(os.path.dirname(__file__), "../user_data.py")
+USER_LOG_FILE = os.path.join(os.path.dirname(__file__), "../user_data.log")
 
 
 @pytest.fixture(autouse=True)
 def setup_and_teardown():
     """
     Set up a clean test environment by backing up the original user_data.py
-    and restoring it after the tests.
+    and its log and restoring them after the tests.
     """
-    backup_file = f"{USER_DATA_FILE}.bak"
-
-    if os.path.exists(USER_DATA_FILE):
-        if os.path.exists(backup_file):
-            os.remove(backup_file)
-        os.rename(USER_DATA_FILE, backup_file)
+    for path in (USER_DATA_FILE, USER_LOG_FILE):
+        backup_file = f"{path}.bak"
+        if os.path.exists(path):
+            if os.path.exists(backup_file):
+                os.remove(backup_file)
+            os.rename(path, backup_file)
 
     with open(USER_DATA_FILE, "w") as file:
         file.write("users = []")
 
     yield
 
-    if os.path.exists(backup_file):
-        if os.path.exists(USER_DATA_FILE):
-            os.remove(USER_DATA_FILE)
-        os.rename(backup_file, USER_DATA_FILE)
+    for path in (USER_DATA_FILE, USER_LOG_FILE):
+        backup_file = f"{path}.bak"
+        if os.path.exists(path):
+            os.remove(path)
+        if os.path.exists(backup_file):
+            os.rename(backup_file, path)
 
 
 def test_load_users_empty():
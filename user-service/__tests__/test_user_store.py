@@ -0,0 +1,223 @@
+import os
+import threading
+import pytest
+from common.log_store import file_lock
+from models.user_store import UserStore, normalize_email
+from models.user import configure_user_store
+from models.refresh_token import RefreshTokenStore
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    """
+    Provide a user data file seeded with one user.
+    """
+    path = tmp_path / "user_data.py"
+    path.write_text(
+        "users = [{'email': 'Test@Example.com', 'name': 'Test User', 'password': 'hash', 'role': 'User'}]"
+    )
+    return str(path)
+
+
+def test_normalize_email():
+    """
+    Test that emails are trimmed and case-folded.
+    """
+    assert normalize_email("  Test@Example.COM ") == "test@example.com"
+
+
+def test_find_uses_normalized_email(data_file):
+    """
+    Test that lookups ignore case and surrounding whitespace.
+    """
+    store = UserStore(data_file)
+    user = store.find("test@example.com ")
+    assert user is not None
+    assert user["name"] == "Test User"
+    assert store.find("missing@example.com") is None
+
+
+def test_file_is_parsed_once(data_file, mocker):
+    """
+    Test that repeated lookups reuse the resident copy.
+    """
+    store = UserStore(data_file)
+    spy = mocker.spy(store, "_read_snapshot")
+    store.find("test@example.com")
+    store.find("test@example.com")
+    store.all()
+    assert spy.call_count == 1
+
+
+def test_reload_after_external_change(data_file):
+    """
+    Test that a file rewritten by someone else is picked up.
+    """
+    store = UserStore(data_file)
+    assert store.find("other@example.com") is None
+
+    with open(data_file, "w") as file:
+        file.write(
+            "users = [{'email': 'other@example.com', 'name': 'Other', 'password': 'hash', 'role': 'Admin'}]"
+        )
+    os.utime(data_file, ns=(0, 0))
+
+    assert store.find("other@example.com")["role"] == "Admin"
+    assert store.find("test@example.com") is None
+
+
+def test_add_persists_and_indexes(data_file):
+    """
+    Test that added users are indexed and written to disk.
+    """
+    store = UserStore(data_file)
+    store.add({"email": "new@example.com", "name": "New", "password": "x"})
+
+    assert store.find("NEW@example.com")["name"] == "New"
+    assert len(UserStore(data_file).all()) == 2
+
+
+def test_missing_file_is_empty(tmp_path):
+    """
+    Test that a missing data file loads as an empty store.
+    """
+    store = UserStore(str(tmp_path / "absent.py"))
+    assert store.all() == []
+    assert store.find("test@example.com") is None
+
+
+def test_add_appends_to_log(data_file):
+    """
+    Test that adding a user leaves the snapshot untouched.
+    """
+    with open(data_file) as file:
+        snapshot = file.read()
+
+    store = UserStore(data_file)
+    store.add({"email": "logged@example.com", "name": "Logged", "password": "x"})
+
+    with open(data_file) as file:
+        assert file.read() == snapshot
+    assert os.path.getsize(store.log.path) > 0
+
+
+def test_second_process_sees_appended_user(data_file):
+    """
+    Test that another store over the same files tails new log entries.
+    """
+    reader = UserStore(data_file)
+    writer = UserStore(data_file)
+    assert reader.find("late@example.com") is None
+
+    writer.add({"email": "late@example.com", "name": "Late", "password": "x"})
+
+    assert reader.find("late@example.com")["name"] == "Late"
+
+
+def test_add_rejects_duplicate_email(data_file):
+    """
+    Test that registering a taken email raises instead of overwriting.
+    """
+    store = UserStore(data_file)
+    with pytest.raises(ValueError, match="Email already registered"):
+        store.add({"email": "TEST@example.com", "name": "Dup", "password": "x"})
+    assert store.find("test@example.com")["name"] == "Test User"
+
+
+def test_add_waits_for_other_process(data_file):
+    """
+    Test that add re-checks the email after another process holding the
+    lock file registered it, instead of overwriting that account.
+    """
+    store = UserStore(data_file)
+    other = UserStore(data_file)
+    errors = []
+
+    def register():
+        try:
+            store.add({"email": "race@example.com", "name": "Second", "password": "x"})
+        except ValueError as error:
+            errors.append(error)
+
+    with file_lock(other.lock_path):
+        thread = threading.Thread(target=register)
+        thread.start()
+        thread.join(0.2)
+        assert thread.is_alive()
+        other.put({"email": "race@example.com", "name": "First", "password": "x"})
+    thread.join()
+
+    assert len(errors) == 1
+    assert UserStore(data_file).find("race@example.com")["name"] == "First"
+
+
+def test_configure_json_snapshot(data_file, tmp_path):
+    """
+    Test that a JSON snapshot is converted from user_data.py and used.
+    """
+    try:
+        store = configure_user_store(
+            {
+                "USER_SNAPSHOT_FORMAT": "json",
+                "USER_DATA_FILE": data_file,
+                "USER_LOG_FILE": str(tmp_path / "user_data.log"),
+            }
+        )
+        assert store.path == str(tmp_path / "user_data.json")
+        assert store.find("test@example.com")["name"] == "Test User"
+    finally:
+        configure_user_store({})
+
+
+def test_login_drops_expired_sessions(tmp_path):
+    """
+    Test that starting a session deletes the expired ones, including after
+    a rotation moved a session's expiry.
+    """
+    now = [100]
+    store = RefreshTokenStore(str(tmp_path / "refresh_tokens.py"), clock=lambda: now[0])
+    store.start("old", "a@example.com", "j1", 150)
+    store.start("rotated", "b@example.com", "j2", 150)
+    store.rotate("rotated", "j2", "j3", 300)
+    store.start("forever", "c@example.com", "j4", None)
+
+    now[0] = 200
+    store.start("new", "d@example.com", "j5", 400)
+
+    assert sorted(record["family"] for record in store.all()) == [
+        "forever",
+        "new",
+        "rotated",
+    ]
+    reloaded = RefreshTokenStore(str(tmp_path / "refresh_tokens.py"), clock=lambda: 350)
+    reloaded.start("later", "e@example.com", "j6", 500)
+    assert sorted(record["family"] for record in reloaded.all()) == [
+        "forever",
+        "later",
+        "new",
+    ]
+
+
+def test_rotate_waits_for_other_process(tmp_path):
+    """
+    Test that a rotation re-checks the token after another process holding
+    the lock file rotated it first.
+    """
+    path = str(tmp_path / "refresh_tokens.py")
+    store = RefreshTokenStore(path)
+    other = RefreshTokenStore(path)
+    store.start("family", "a@example.com", "j1", None)
+    results = []
+
+    thread = threading.Thread(
+        target=lambda: results.append(store.rotate("family", "j1", "j3", None))
+    )
+    with file_lock(other.lock_path):
+        thread.start()
+        thread.join(0.2)
+        assert thread.is_alive()
+        other.put({**other.get("family"), "jti": "j2"})
+    thread.join()
+
+    assert results == [False]
+    assert RefreshTokenStore(path).get("family")["jti"] == "j2"
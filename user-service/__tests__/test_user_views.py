@@ -1,18 +1,24 @@
 import pytest
 from flask import Flask
-from flask_jwt_extended import JWTManager, create_access_token
+from flask_jwt_extended import create_access_token
 from views.user import user_blueprint
+from controllers.hashing import HashingUnavailable
+import models.user
+from models.user_store import UserStore
+from models.refresh_token import RefreshTokenStore
+from common.auth import CachedJWTManager
 from werkzeug.security import generate_password_hash
 
 
 @pytest.fixture
-def app():
+def app(tmp_path):
     """
     Create a Flask app for testing.
     """
     app = Flask(__name__)
     app.config["JWT_SECRET_KEY"] = "test-secret-key"
-    JWTManager(app)
+    app.config["JWT_REVOCATION_FILE"] = str(tmp_path / "revoked_tokens.py")
+    CachedJWTManager(app)
     app.register_blueprint(user_blueprint)
     return app
 
@@ -26,7 +32,7 @@ def client(app):
 
 
 @pytest.fixture
-def mock_user_data(mocker):
+def mock_user_data(mocker, tmp_path):
     """
     Mock user data and prevent overwriting the actual data file.
     """
@@ -45,9 +51,13 @@ def mock_user_data(mocker):
         },
     ]
 
-    mocker.patch("models.user.load_users", return_value=test_users)
-
-    mocker.patch("models.user.save_users")
+    store = UserStore(str(tmp_path / "user_data.py"))
+    store.replace(test_users)
+    mocker.patch("models.user.user_store", store)
+    mocker.patch(
+        "models.refresh_token.refresh_token_store",
+        RefreshTokenStore(str(tmp_path / "refresh_tokens.py")),
+    )
 
 
 @pytest.fixture
@@ -172,3 +182,188 @@ def test_profile_access(client, user_token, mock_user_data):
     profile = response.get_json()
     assert profile["email"] == "user@example.com"
     assert profile["role"] == "User"
+
+
+def test_profile_not_modified(client, user_token, mock_user_data):
+    """
+    Test that a matching If-None-Match returns 304 without a body.
+    """
+    headers = {"Authorization": f"Bearer {user_token}"}
+    response = client.get("/profile", headers=headers)
+    etag = response.headers["ETag"]
+
+    response = client.get("/profile", headers={**headers, "If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.data == b""
+
+
+def test_import_users(client, mock_user_data, admin_token):
+    """
+    Test bulk import through the admin endpoint.
+    """
+    response = client.post(
+        "/users/import",
+        json=[
+            {"email": "bulk@example.com", "password": "pw", "name": "Bulk", "role": "User"},
+            {"email": "user@example.com", "password": "pw", "name": "Dup", "role": "User"},
+        ],
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+
+    assert response.status_code == 207
+    assert response.get_json() == {
+        "imported": ["bulk@example.com"],
+        "errors": [{"index": 1, "error": "Email already registered"}],
+    }
+
+
+def test_import_users_admin_only(client, mock_user_data, user_token):
+    """
+    Test that regular users cannot import users.
+    """
+    response = client.post(
+        "/users/import", json=[], headers={"Authorization": f"Bearer {user_token}"}
+    )
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize(
+    "path, target",
+    [
+        ("/register", "controllers.user.hash_password"),
+        ("/login", "controllers.user.check_password"),
+    ],
+)
+def test_hashing_overload_returns_503(client, mock_user_data, mocker, path, target):
+    """
+    Test that a saturated hashing pool sheds load with 503 and Retry-After.
+    """
+    mocker.patch(target, side_effect=HashingUnavailable("Too many pending password hashes"))
+    response = client.post(
+        path,
+        json={
+            "email": "user@example.com" if path == "/login" else "new@example.com",
+            "password": "password_user",
+            "name": "New",
+            "role": "User",
+        },
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def login(client, email="user@example.com", password="password_user"):
+    return client.post("/login", json={"email": email, "password": password}).get_json()
+
+
+def test_refresh_rotates_tokens(client, mock_user_data):
+    """
+    Test that a refresh token gives new tokens once and then stops working.
+    """
+    tokens = login(client)
+    response = client.post(
+        "/refresh", headers={"Authorization": f"Bearer {tokens['refresh_token']}"}
+    )
+    assert response.status_code == 200
+    renewed = response.get_json()
+    assert renewed["refresh_token"] != tokens["refresh_token"]
+
+    profile = client.get(
+        "/profile", headers={"Authorization": f"Bearer {renewed['token']}"}
+    )
+    assert profile.get_json() == {"email": "user@example.com", "role": "User"}
+
+    response = client.post(
+        "/refresh", headers={"Authorization": f"Bearer {renewed['refresh_token']}"}
+    )
+    assert response.status_code == 200
+
+
+def test_refresh_reuse_revokes_session(client, mock_user_data):
+    """
+    Test that replaying a rotated refresh token revokes the whole session.
+    """
+    tokens = login(client)
+    other = login(client)
+    old = {"Authorization": f"Bearer {tokens['refresh_token']}"}
+    renewed = client.post("/refresh", headers=old).get_json()
+
+    response = client.post("/refresh", headers=old)
+    assert response.status_code == 401
+    assert response.get_json() == {"error": "Refresh token has already been used"}
+
+    for token in (renewed["refresh_token"], tokens["refresh_token"]):
+        response = client.post("/refresh", headers={"Authorization": f"Bearer {token}"})
+        assert response.get_json() == {"msg": "Token has been revoked"}
+    response = client.get(
+        "/profile", headers={"Authorization": f"Bearer {renewed['token']}"}
+    )
+    assert response.status_code == 401
+
+    # Other sessions of the same user are unaffected.
+    response = client.post(
+        "/refresh", headers={"Authorization": f"Bearer {other['refresh_token']}"}
+    )
+    assert response.status_code == 200
+
+
+def test_refresh_uses_current_role(client, mock_user_data):
+    """
+    Test that a refresh picks up a role change made since login.
+    """
+    tokens = login(client)
+    store = models.user.user_store
+    store.put({**store.find("user@example.com"), "role": "Admin"})
+
+    response = client.post(
+        "/refresh", headers={"Authorization": f"Bearer {tokens['refresh_token']}"}
+    )
+    profile = client.get(
+        "/profile", headers={"Authorization": f"Bearer {response.get_json()['token']}"}
+    )
+    assert profile.get_json()["role"] == "Admin"
+
+
+def test_refresh_rejects_deleted_user(client, mock_user_data):
+    """
+    Test that a refresh fails, and the session ends, once the user is gone.
+    """
+    tokens = login(client)
+    models.user.user_store.delete("user@example.com")
+
+    headers = {"Authorization": f"Bearer {tokens['refresh_token']}"}
+    response = client.post("/refresh", headers=headers)
+    assert response.status_code == 401
+    assert response.get_json() == {"error": "User no longer exists"}
+    response = client.get(
+        "/profile", headers={"Authorization": f"Bearer {tokens['token']}"}
+    )
+    assert response.status_code == 401
+
+
+def test_refresh_needs_refresh_token(client, mock_user_data):
+    """
+    Test that an access token cannot be used to refresh.
+    """
+    tokens = login(client)
+    response = client.post(
+        "/refresh", headers={"Authorization": f"Bearer {tokens['token']}"}
+    )
+    assert response.status_code == 422
+
+
+def test_corrupt_data_file_is_a_server_error(client, mocker, tmp_path):
+    """
+    Test that an unreadable user data file gives a 500 that does not
+    reveal the file's path, instead of a 400.
+    """
+    path = tmp_path / "user_data.py"
+    path.write_text("users = [")
+    mocker.patch("models.user.user_store", UserStore(str(path)))
+
+    response = client.post(
+        "/login", json={"email": "user@example.com", "password": "password_user"}
+    )
+    assert response.status_code == 500
+    assert str(tmp_path) not in response.get_data(as_text=True)
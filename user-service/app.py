@@ -1,10 +1,31 @@
+import os
+import sys
+
+# Make the shared ``common`` package importable when run from this directory.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
 from flask import Flask
-from flask_jwt_extended import JWTManager
 from flasgger import Swagger
+from common.auth import CachedJWTManager
+from common.structured_logging import configure_logging
 from views.user import user_blueprint
+from models.user import configure_user_store
+from models.refresh_token import configure_refresh_token_store
+from controllers.hashing import configure_hashing_pool, HASH_SETTINGS
 
 app = Flask(__name__)
 app.config["JWT_SECRET_KEY"] = "shared-secret-key"
+# "file" keeps users in user_data.py; "sqlite" is safe across worker processes
+app.config["USER_STORE_BACKEND"] = os.environ.get("USER_STORE_BACKEND", "file")
+# "python" keeps user_data.py; "json", "jsonl" and "binary" are converted from it
+app.config["USER_SNAPSHOT_FORMAT"] = os.environ.get("USER_SNAPSHOT_FORMAT", "python")
+configure_user_store(app.config)
+configure_refresh_token_store(app.config)
+# Password hashing runs in worker processes; see controllers/hashing.py
+for name in HASH_SETTINGS:
+    if name in os.environ:
+        app.config[name] = os.environ[name]
+configure_hashing_pool(app.config)
 swagger = Swagger(
     app,
     template={
@@ -28,7 +49,10 @@ swagger = Swagger(
         "security": [{"Bearer": []}],  # Apply Bearer authentication globally
     },
 )
-jwt = JWTManager(app)
+jwt = CachedJWTManager(app)
+# JSON-lines logs written by a background thread; LOG_LEVEL sets the level
+configure_logging(app)
+
 
 # Register blueprints
 app.register_blueprint(user_blueprint)
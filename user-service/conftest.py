@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Make the shared ``common`` package importable when running the tests.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -1,5 +1,13 @@
 from .user import (
     register_user,
+    import_users,
     authenticate_user,
     fetch_profile,
 )
+from .session import (
+    open_session,
+    refresh_session,
+    RefreshTokenReused,
+    RefreshUserMissing,
+)
+from .hashing import HashingUnavailable, configure_hashing_pool
@@ -0,0 +1,222 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from werkzeug.security import (
+    generate_password_hash,
+    check_password_hash,
+    DEFAULT_PBKDF2_ITERATIONS,
+)
+
+# Requests allowed to wait for a hash at once, per worker, and how long one
+# request waits before giving up.
+DEFAULT_QUEUE_PER_WORKER = 8
+DEFAULT_HASH_TIMEOUT = 10.0
+# werkzeug method string; hash_calibration.py suggests one for this host.
+DEFAULT_HASH_METHOD = "scrypt"
+# Settings read by configure_hashing_pool, also taken from the environment.
+HASH_SETTINGS = (
+    "HASH_WORKERS",
+    "HASH_QUEUE_LIMIT",
+    "HASH_TIMEOUT",
+    "PASSWORD_HASH_METHOD",
+)
+
+
+class HashingUnavailable(Exception):
+    """
+    The hashing pool is saturated or a hash took longer than the timeout.
+    """
+
+
+def hash_method(method):
+    """
+    Return a werkzeug hash method with every parameter spelled out, as it
+    appears at the start of the hashes it produces.
+    """
+    name, *args = method.split(":")
+    if name == "scrypt":
+        n, r, p = args or (2**15, 8, 1)
+        return f"scrypt:{int(n)}:{int(r)}:{int(p)}"
+    if name == "pbkdf2" and len(args) <= 2:
+        hash_name = args[0] if args else "sha256"
+        iterations = args[1] if len(args) == 2 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{hash_name}:{int(iterations)}"
+    raise ValueError(f"Invalid hash method: {method}")
+
+
+def hash_chunk(passwords, method):
+    """
+    Hash a list of passwords in one worker call.
+    """
+    return [generate_password_hash(password, method) for password in passwords]
+
+
+def needs_rehash(password_hash, method):
+    """
+    Return True if password_hash was made with other parameters than method.
+    """
+    return password_hash.split("$", 1)[0] != hash_method(method)
+
+
+class HashingPool:
+    """
+    Bounded process pool for password hashing and checking.
+
+    Key derivation is CPU-bound and holds the GIL, so it runs in worker
+    processes and request threads only wait on the result. At most
+    max_pending calls may be queued or running; beyond that, and when a
+    call outlives timeout, HashingUnavailable is raised so the caller can
+    shed load instead of piling up. With workers=0 hashing runs inline.
+    New hashes are made with method.
+
+    Bulk imports go through hash_many, which shares the same processes and
+    queue slots but never holds more than one slot per worker.
+    """
+
+    def __init__(
+        self,
+        workers=None,
+        max_pending=None,
+        timeout=DEFAULT_HASH_TIMEOUT,
+        method=DEFAULT_HASH_METHOD,
+    ):
+        self.method = hash_method(method)
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        if max_pending is None:
+            max_pending = max(1, self.workers) * DEFAULT_QUEUE_PER_WORKER
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _submit(self, function, *args, blocking=False):
+        if not self._slots.acquire(blocking=blocking):
+            raise HashingUnavailable("Too many pending password hashes")
+        try:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                future = self._executor.submit(function, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is held until the worker is done, even if we stop waiting.
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _run(self, function, *args):
+        if not self.workers:
+            return function(*args)
+        future = self._submit(function, *args)
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            raise HashingUnavailable("Password hashing timed out")
+
+    def hash(self, password):
+        """
+        Return a salted hash of password.
+        """
+        return self._run(generate_password_hash, password, self.method)
+
+    def check(self, password_hash, password):
+        """
+        Return True if password matches password_hash.
+        """
+        return self._run(check_password_hash, password_hash, password)
+
+    def hash_many(self, passwords):
+        """
+        Return salted hashes of passwords, in order.
+
+        The batch is split into chunks with at most one per worker in
+        flight, so request hashes keep the rest of the queue. Chunks wait
+        for a free slot instead of failing, and are not timed out.
+        """
+        passwords = list(passwords)
+        if not self.workers or len(passwords) < 2:
+            return hash_chunk(passwords, self.method)
+        size = max(1, len(passwords) // (self.workers * 4))
+        pending = deque()
+        hashes = []
+        for start in range(0, len(passwords), size):
+            if len(pending) >= self.workers:
+                hashes.extend(pending.popleft().result())
+            pending.append(
+                self._submit(
+                    hash_chunk,
+                    passwords[start : start + size],
+                    self.method,
+                    blocking=True,
+                )
+            )
+        while pending:
+            hashes.extend(pending.popleft().result())
+        return hashes
+
+    def shutdown(self):
+        """
+        Stop the worker processes, if any were started.
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+
+hashing_pool = HashingPool(workers=0)
+
+
+def configure_hashing_pool(config):
+    """
+    Replace the hashing pool from the app config.
+
+    HASH_WORKERS is the number of worker processes (default: one per CPU,
+    0 hashes on the request thread), HASH_QUEUE_LIMIT the number of hashes
+    that may be pending at once and HASH_TIMEOUT the seconds a request
+    waits for one. PASSWORD_HASH_METHOD is the werkzeug method for new
+    hashes, e.g. "scrypt:16384:8:1" or "pbkdf2:sha256:600000".
+    """
+    global hashing_pool
+    workers = config.get("HASH_WORKERS")
+    max_pending = config.get("HASH_QUEUE_LIMIT")
+    hashing_pool.shutdown()
+    hashing_pool = HashingPool(
+        workers=None if workers is None else int(workers),
+        max_pending=None if max_pending is None else int(max_pending),
+        timeout=float(config.get("HASH_TIMEOUT", DEFAULT_HASH_TIMEOUT)),
+        method=config.get("PASSWORD_HASH_METHOD", DEFAULT_HASH_METHOD),
+    )
+    return hashing_pool
+
+
+def hash_password(password):
+    """
+    Hash one password through the configured pool.
+    """
+    return hashing_pool.hash(password)
+
+
+def check_password(password_hash, password):
+    """
+    Check one password through the configured pool.
+    """
+    return hashing_pool.check(password_hash, password)
+
+
+def password_needs_rehash(password_hash):
+    """
+    Return True if password_hash is not made with the configured method.
+    """
+    return needs_rehash(password_hash, hashing_pool.method)
+
+
+def hash_passwords(passwords):
+    """
+    Hash a batch of passwords through the configured pool, keeping their
+    order.
+    """
+    return hashing_pool.hash_many(passwords)
@@ -0,0 +1,82 @@
+import uuid
+from flask_jwt_extended import create_access_token, create_refresh_token, decode_token
+from common.auth import revoke_id
+from models.user import find_user_by_email
+from models.refresh_token import (
+    start_session,
+    rotate_session,
+    find_session,
+    end_session,
+)
+
+
+class RefreshTokenReused(Exception):
+    """
+    A refresh token was presented after it had already been rotated.
+    """
+
+
+class RefreshUserMissing(Exception):
+    """
+    A refresh token was presented for a user who no longer exists.
+    """
+
+
+def create_tokens(email, role, family):
+    """
+    Return an access token and a refresh token for a session, and the
+    refresh token's claims.
+    """
+    claims = {"role": role, "family": family}
+    access_token = create_access_token(identity=email, additional_claims=claims)
+    refresh_token = create_refresh_token(identity=email, additional_claims=claims)
+    return access_token, refresh_token, decode_token(refresh_token)
+
+
+def open_session(user):
+    """
+    Start a login session. Returns (access_token, refresh_token).
+    """
+    family = uuid.uuid4().hex
+    access_token, refresh_token, claims = create_tokens(
+        user["email"], user["role"], family
+    )
+    start_session(family, user["email"], claims["jti"], claims.get("exp"))
+    return access_token, refresh_token
+
+
+def revoke_session(family, claims):
+    """
+    Revoke a login session in every service and forget it.
+    """
+    session = find_session(family)
+    revoke_id(family, session["exp"] if session else claims.get("exp"))
+    end_session(family)
+
+
+def refresh_session(claims):
+    """
+    Exchange a verified refresh token for a new access and refresh token.
+
+    The user is looked up again so the new tokens carry their current
+    role; if the account is gone the session is revoked and
+    RefreshUserMissing is raised. The presented token stops being valid.
+    If it had already been exchanged, the whole session is revoked, in
+    every service, and RefreshTokenReused is raised.
+    """
+    family = claims.get("family")
+    user = find_user_by_email(claims["sub"])
+    if user is None:
+        if family is not None:
+            revoke_session(family, claims)
+        raise RefreshUserMissing("User no longer exists")
+    access_token, refresh_token, new_claims = create_tokens(
+        user["email"], user["role"], family
+    )
+    if family is None or not rotate_session(
+        family, claims["jti"], new_claims["jti"], new_claims.get("exp")
+    ):
+        if family is not None:
+            revoke_session(family, claims)
+        raise RefreshTokenReused("Refresh token has already been used")
+    return access_token, refresh_token
@@ -1,31 +1,51 @@
 from models.user import (
     find_user_by_email,
     add_user,
-    validate_password,
+    add_users,
+    update_password,
+)
+from models.user_store import normalize_email
+from .hashing import (
+    HashingUnavailable,
+    hash_password,
+    hash_passwords,
+    check_password,
+    password_needs_rehash,
 )
-from werkzeug.security import generate_password_hash
 
 
-def register_user(data):
+def validate_registration(data):
     """
-    Controller to validate and register a new user.
+    Check the fields of a registration request.
     """
+    if not isinstance(data, dict):
+        raise ValueError("User must be an object")
     required_fields = ["email", "password", "name", "role"]
     missing_fields = [field for field in required_fields if not data.get(field)]
     if missing_fields:
         raise ValueError(f"Missing fields: {', '.join(missing_fields)}")
+    for field in required_fields:
+        if not isinstance(data[field], str):
+            raise ValueError(f"Field '{field}' must be a string")
 
     # Validate role
     valid_roles = ["User", "Admin"]
     if data["role"] not in valid_roles:
         raise ValueError(f"Invalid role. Allowed roles: {', '.join(valid_roles)}")
 
+
+def register_user(data):
+    """
+    Controller to validate and register a new user.
+    """
+    validate_registration(data)
+
     # Check if email is already registered
     if find_user_by_email(data["email"]):
         raise ValueError("Email already registered")
 
     # Add the new user
-    hashed_password = generate_password_hash(data["password"])
+    hashed_password = hash_password(data["password"])
     return add_user(
         {
             "email": data["email"],
@@ -36,6 +56,55 @@ def register_user(data):
     )
 
 
+def import_users(items, max_items=None):
+    """
+    Controller to register many users at once.
+
+    Items are checked like register_user, passwords are hashed through the
+    hashing pool, and every accepted user is stored in one write. Returns
+    the added users and a list of {"index", "error"} for rejected items.
+    """
+    if not isinstance(items, list):
+        raise ValueError("Expected a list of users")
+    if max_items is not None and len(items) > max_items:
+        raise ValueError(f"At most {max_items} users per request")
+
+    accepted = []
+    errors = []
+    seen = set()
+    for index, item in enumerate(items):
+        try:
+            validate_registration(item)
+            key = normalize_email(item["email"])
+            if key in seen or find_user_by_email(item["email"]):
+                raise ValueError("Email already registered")
+        except ValueError as e:
+            errors.append({"index": index, "error": str(e)})
+            continue
+        seen.add(key)
+        accepted.append((index, item))
+
+    hashes = hash_passwords([item["password"] for _, item in accepted])
+    users = [
+        {
+            "email": item["email"],
+            "name": item["name"],
+            "password": hashed_password,
+            "role": item["role"],
+        }
+        for (_, item), hashed_password in zip(accepted, hashes)
+    ]
+    added, taken = add_users(users)
+
+    # Emails registered by someone else while the batch was being hashed
+    taken = {id(user) for user in taken}
+    for (index, _), user in zip(accepted, users):
+        if id(user) in taken:
+            errors.append({"index": index, "error": "Email already registered"})
+    errors.sort(key=lambda error: error["index"])
+    return added, errors
+
+
 def authenticate_user(data):
     """
     Controller to authenticate a user.
@@ -44,9 +113,17 @@ def authenticate_user(data):
         raise ValueError("Email and password are required")
 
     user = find_user_by_email(data["email"])
-    if not user or not validate_password(user["password"], data["password"]):
+    if not user or not check_password(user["password"], data["password"]):
         raise ValueError("Invalid credentials")
 
+    # Bring hashes made with older parameters up to the configured method
+    # while the plain password is at hand. Login succeeds either way.
+    if password_needs_rehash(user["password"]):
+        try:
+            update_password(user["email"], hash_password(data["password"]))
+        except HashingUnavailable:
+            pass
+
     return user
 
 
@@ -0,0 +1,90 @@
+import os
+import sys
+
+# Make the shared ``common`` package importable when run from this directory.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import time
+import argparse
+from werkzeug.security import generate_password_hash, check_password_hash
+from controllers.hashing import hash_method
+
+DEFAULT_TARGET_MS = 250
+# scrypt cost n is a power of two; memory use is 128 * n * r bytes.
+SCRYPT_N_RANGE = range(12, 21)
+SCRYPT_R = 8
+SCRYPT_P = 1
+# pbkdf2 is timed at PBKDF2_PROBE iterations and scaled linearly.
+PBKDF2_PROBE = 100_000
+PBKDF2_STEP = 10_000
+
+
+def time_method(method, repeat=3):
+    """
+    Return the best time in seconds to verify a password hashed with method.
+    """
+    password_hash = generate_password_hash("calibration", method)
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        check_password_hash(password_hash, "calibration")
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def calibrate_scrypt(target, repeat=3):
+    """
+    Return (method, rows) for the largest scrypt n that verifies within
+    target seconds, or the smallest if none does, with the (method,
+    seconds) rows measured on the way.
+    """
+    rows = []
+    for exponent in SCRYPT_N_RANGE:
+        method = f"scrypt:{2**exponent}:{SCRYPT_R}:{SCRYPT_P}"
+        seconds = time_method(method, repeat)
+        if rows and seconds > target:
+            break
+        rows.append((method, seconds))
+    return rows[-1][0], rows
+
+
+def calibrate_pbkdf2(target, repeat=3):
+    """
+    Return (method, rows) for the pbkdf2-sha256 iteration count that
+    verifies in about target seconds.
+    """
+    probe = f"pbkdf2:sha256:{PBKDF2_PROBE}"
+    seconds = time_method(probe, repeat)
+    iterations = round(PBKDF2_PROBE * target / seconds) // PBKDF2_STEP * PBKDF2_STEP
+    method = f"pbkdf2:sha256:{max(PBKDF2_STEP, iterations)}"
+    return method, [(probe, seconds), (method, time_method(method, repeat))]
+
+
+CALIBRATORS = {"scrypt": calibrate_scrypt, "pbkdf2": calibrate_pbkdf2}
+
+
+def main(argv=None):
+    """
+    Benchmark password hashing on this host and print the method to set as
+    PASSWORD_HASH_METHOD for the target verify latency.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python hash_calibration.py",
+        description="Pick password hash parameters for a target login latency.",
+    )
+    parser.add_argument("--target-ms", type=float, default=DEFAULT_TARGET_MS)
+    parser.add_argument("--scheme", choices=sorted(CALIBRATORS), default="scrypt")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    method, rows = CALIBRATORS[args.scheme](args.target_ms / 1000, args.repeat)
+    print(f"{'method':<28}{'verify ms':>12}")
+    for row_method, seconds in rows:
+        print(f"{row_method:<28}{seconds * 1000:>12.1f}")
+    print(f"PASSWORD_HASH_METHOD={hash_method(method)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,5 +3,15 @@ from .user import (
     save_users,
     find_user_by_email,
     add_user,
+    add_users,
+    update_password,
     validate_password,
+    configure_user_store,
+)
+from .refresh_token import (
+    start_session,
+    rotate_session,
+    find_session,
+    end_session,
+    configure_refresh_token_store,
 )
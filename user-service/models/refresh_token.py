@@ -0,0 +1,103 @@
+import os
+import time
+from common.log_store import ExpiringLogStore, file_lock
+
+REFRESH_TOKEN_FILE = os.path.join(os.path.dirname(__file__), "../refresh_tokens.py")
+
+
+class RefreshTokenStore(ExpiringLogStore):
+    """
+    The current refresh token of every login session.
+
+    A session ("family") starts at login and its refresh token is rotated
+    on every /refresh. Only the latest token's jti is kept, so presenting
+    an older one means it was copied and used twice.
+
+    Each login drops the sessions that have expired, found through the
+    expiry heap rather than a scan.
+    """
+
+    variable = "sessions"
+
+    def __init__(self, path, log_path=None, clock=time.time):
+        super().__init__(path, log_path)
+        self.clock = clock
+
+    def key(self, record):
+        return record["family"]
+
+    def start(self, family, email, jti, exp):
+        """
+        Record a new session, dropping expired ones, with one log append.
+        """
+        now = self.clock()
+        with self._lock:
+            self._refresh_locked()
+            entries = [{"op": "delete", "key": key} for key in self._expired(now)]
+            entries.append(
+                {
+                    "op": "put",
+                    "record": {"family": family, "email": email, "jti": jti, "exp": exp},
+                }
+            )
+            self.log.append_many(entries)
+            self._refresh_locked()
+            self._maybe_compact()
+
+    def rotate(self, family, jti, new_jti, exp):
+        """
+        Make new_jti the session's token if jti is still the current one.
+        Returns False if it is not, which means jti was reused.
+
+        The store's lock file is held from the check through the append, so
+        two workers given the same token cannot both rotate it.
+        """
+        with file_lock(self.lock_path), self._lock:
+            self._refresh_locked()
+            record = self._records.get(family)
+            if record is None or record["jti"] != jti:
+                return False
+            self.put({**record, "jti": new_jti, "exp": exp})
+            return True
+
+
+refresh_token_store = RefreshTokenStore(REFRESH_TOKEN_FILE)
+
+
+def configure_refresh_token_store(config):
+    """
+    Select the refresh token file from REFRESH_TOKEN_FILE in the app config.
+    """
+    global refresh_token_store
+    refresh_token_store = RefreshTokenStore(
+        config.get("REFRESH_TOKEN_FILE", REFRESH_TOKEN_FILE)
+    )
+    return refresh_token_store
+
+
+def start_session(family, email, jti, exp):
+    """
+    Record the first refresh token of a login session.
+    """
+    refresh_token_store.start(family, email, jti, exp)
+
+
+def rotate_session(family, jti, new_jti, exp):
+    """
+    Replace a session's refresh token. Returns False on reuse.
+    """
+    return refresh_token_store.rotate(family, jti, new_jti, exp)
+
+
+def find_session(family):
+    """
+    Return the session record of a family, or None.
+    """
+    return refresh_token_store.get(family)
+
+
+def end_session(family):
+    """
+    Forget a session.
+    """
+    return refresh_token_store.delete(family)
@@ -0,0 +1,45 @@
+class UserRepository:
+    """
+    Interface implemented by the user storage backends.
+
+    ``add`` must raise ValueError("Email already registered") when the
+    normalized email is taken, so concurrent registrations cannot both win.
+    """
+
+    def all(self):
+        """
+        Return every user in registration order.
+        """
+        raise NotImplementedError
+
+    def find(self, email):
+        """
+        Return the user registered under email, or None.
+        """
+        raise NotImplementedError
+
+    def add(self, user):
+        """
+        Store a new user and return it.
+        """
+        raise NotImplementedError
+
+    def add_many(self, users):
+        """
+        Store several new users in one write. Returns (added, taken), where
+        taken are the users whose email was already registered.
+        """
+        raise NotImplementedError
+
+    def set_password(self, email, password_hash):
+        """
+        Replace the stored password hash of a user. Returns False if no
+        user is registered under email.
+        """
+        raise NotImplementedError
+
+    def replace(self, users):
+        """
+        Replace every stored user.
+        """
+        raise NotImplementedError
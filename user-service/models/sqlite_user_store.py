@@ -0,0 +1,121 @@
+import sqlite3
+from common.sqlite import ConnectionPool
+from .repository import UserRepository
+from .user_store import normalize_email
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL,
+    email_key TEXT NOT NULL,
+    name TEXT,
+    password TEXT,
+    role TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS users_email_key ON users (email_key);
+"""
+
+COLUMNS = ("email", "name", "password", "role")
+
+
+class SQLiteUserStore(UserRepository):
+    """
+    SQLite user store with a unique index on normalized email.
+
+    The database runs in WAL mode so readers never block the writer, and
+    each thread gets its own connection. The unique index makes concurrent
+    registrations from several worker processes safe.
+    """
+
+    def __init__(self, path, timeout=30):
+        self.path = path
+        self.pool = ConnectionPool(path, timeout)
+        with self._connection() as connection:
+            connection.executescript(SCHEMA)
+
+    def _connection(self):
+        return self.pool.connection()
+
+    def close(self):
+        """
+        Close every connection opened by this store.
+        """
+        self.pool.close()
+
+    def _to_user(self, row):
+        return dict(zip(COLUMNS, row))
+
+    def _to_row(self, user):
+        return (
+            user.get("email"),
+            normalize_email(user.get("email")),
+            user.get("name"),
+            user.get("password"),
+            user.get("role"),
+        )
+
+    def all(self):
+        rows = self._connection().execute(
+            "SELECT email, name, password, role FROM users ORDER BY id"
+        )
+        return [self._to_user(row) for row in rows]
+
+    def find(self, email):
+        row = (
+            self._connection()
+            .execute(
+                "SELECT email, name, password, role FROM users WHERE email_key = ?",
+                (normalize_email(email),),
+            )
+            .fetchone()
+        )
+        return self._to_user(row) if row else None
+
+    def add(self, user):
+        try:
+            with self._connection() as connection:
+                connection.execute(
+                    "INSERT INTO users (email, email_key, name, password, role)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    self._to_row(user),
+                )
+        except sqlite3.IntegrityError:
+            raise ValueError("Email already registered")
+        return user
+
+    def add_many(self, users):
+        added = []
+        taken = []
+        with self._connection() as connection:
+            for user in users:
+                cursor = connection.execute(
+                    "INSERT INTO users (email, email_key, name, password, role)"
+                    " VALUES (?, ?, ?, ?, ?) ON CONFLICT (email_key) DO NOTHING",
+                    self._to_row(user),
+                )
+                (added if cursor.rowcount else taken).append(user)
+        return added, taken
+
+    def set_password(self, email, password_hash):
+        with self._connection() as connection:
+            cursor = connection.execute(
+                "UPDATE users SET password = ? WHERE email_key = ?",
+                (password_hash, normalize_email(email)),
+            )
+        return cursor.rowcount > 0
+
+    def replace(self, users):
+        rows = {}
+        for user in users:
+            row = self._to_row(user)
+            rows.setdefault(row[1], row)
+        with self._connection() as connection:
+            connection.execute("DELETE FROM users")
+            connection.executemany(
+                "INSERT INTO users (email, email_key, name, password, role)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows.values(),
+            )
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM users").fetchone()[0]
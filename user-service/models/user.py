@@ -1,46 +1,88 @@
 import os
-import ast
 from werkzeug.security import check_password_hash
+from common.snapshot import ensure_snapshot, snapshot_path
+from .user_store import UserStore
+from .sqlite_user_store import SQLiteUserStore
 
 USER_DATA_FILE = os.path.join(os.path.dirname(__file__), "../user_data.py")
+USER_LOG_FILE = os.path.join(os.path.dirname(__file__), "../user_data.log")
+USER_DATABASE_FILE = os.path.join(os.path.dirname(__file__), "../user_data.sqlite3")
+
+user_store = UserStore(USER_DATA_FILE, USER_LOG_FILE)
+
+
+def configure_user_store(config):
+    """
+    Select the user storage backend from the app config.
+
+    USER_STORE_BACKEND is "file" (default) or "sqlite". A new, empty SQLite
+    database is seeded from user_data.py so switching backends keeps the
+    existing accounts.
+
+    USER_SNAPSHOT_FORMAT picks the file backend's snapshot format: "python"
+    (default), "json", "jsonl" or "binary". Snapshots other than python are
+    converted from user_data.py the first time.
+    """
+    global user_store
+    backend = config.get("USER_STORE_BACKEND", "file")
+    data_file = config.get("USER_DATA_FILE", USER_DATA_FILE)
+    data_file = ensure_snapshot(
+        data_file,
+        snapshot_path(data_file, config.get("USER_SNAPSHOT_FORMAT", "python")),
+        "users",
+    )
+    file_store = UserStore(data_file, config.get("USER_LOG_FILE", USER_LOG_FILE))
+    if backend == "file":
+        user_store = file_store
+    elif backend == "sqlite":
+        user_store = SQLiteUserStore(config.get("USER_DATABASE", USER_DATABASE_FILE))
+        if not len(user_store):
+            user_store.replace(file_store.all())
+    else:
+        raise ValueError(f"Unknown user store backend: {backend}")
+    return user_store
 
 
 def load_users():
     """
-    Load users from the user_data.py file.
+    Load all users from the configured store.
     """
-    try:
-        with open(USER_DATA_FILE, "r") as file:
-            content = file.read()
-            return ast.literal_eval(content.split("=", 1)[1].strip())
-    except (FileNotFoundError, SyntaxError, ValueError):
-        return []
+    return user_store.all()
 
 
 def save_users(users):
     """
-    Save the users list to the user_data.py file.
+    Replace all users in the configured store.
     """
-    with open(USER_DATA_FILE, "w") as file:
-        file.write(f"users = {users}")
+    user_store.replace(users)
 
 
 def find_user_by_email(email):
     """
     Find a user by email.
     """
-    users = load_users()
-    return next((user for user in users if user["email"] == email), None)
+    return user_store.find(email)
 
 
 def add_user(user_data):
     """
     Add a new user to the database.
     """
-    users = load_users()
-    users.append(user_data)
-    save_users(users)
-    return user_data
+    return user_store.add(user_data)
+
+
+def add_users(users):
+    """
+    Add several new users with a single write. Returns (added, taken).
+    """
+    return user_store.add_many(users)
+
+
+def update_password(email, password_hash):
+    """
+    Store a new password hash for a user.
+    """
+    return user_store.set_password(email, password_hash)
 
 
 def validate_password(stored_password, provided_password):
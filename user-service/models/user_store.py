@@ -0,0 +1,74 @@
+from common.log_store import LogStore, file_lock
+from .repository import UserRepository
+
+
+def normalize_email(email):
+    """
+    Normalize an email address for use as an index key.
+    """
+    return email.strip().lower() if isinstance(email, str) else email
+
+
+class UserStore(LogStore, UserRepository):
+    """
+    Flat-file user store indexed by normalized email.
+
+    The user_data.py snapshot is parsed once and kept in memory together
+    with the append-only log of registrations made since the last
+    compaction. Changes made by another process are picked up by comparing
+    file signatures on every access.
+
+    Writes that check for a taken email hold the store's lock file from the
+    check until the append, so a registration in another worker process
+    cannot slip in between and be overwritten.
+    """
+
+    variable = "users"
+
+    def key(self, record):
+        return normalize_email(record.get("email"))
+
+    def find(self, email):
+        """
+        Return the user registered under email, or None.
+        """
+        return self.get(normalize_email(email))
+
+    def add(self, user):
+        """
+        Add a user with a single log append.
+        """
+        with file_lock(self.lock_path), self._lock:
+            if self.find(user.get("email")):
+                raise ValueError("Email already registered")
+            return self.put(user)
+
+    def set_password(self, email, password_hash):
+        """
+        Replace a user's password hash with a single log append.
+        """
+        with file_lock(self.lock_path), self._lock:
+            user = self.find(email)
+            if user is None:
+                return False
+            self.put({**user, "password": password_hash})
+            return True
+
+    def add_many(self, users):
+        """
+        Add several users with a single log append.
+        """
+        added = []
+        taken = []
+        keys = set()
+        with file_lock(self.lock_path), self._lock:
+            self._refresh_locked()
+            for user in users:
+                key = self.key(user)
+                if key in keys or key in self._records:
+                    taken.append(user)
+                else:
+                    keys.add(key)
+                    added.append(user)
+            self.put_many(added)
+        return added, taken
@@ -0,0 +1,57 @@
+import os
+import sys
+
+# Make the shared ``common`` package importable when run from this directory.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+from common.snapshot import SnapshotError, read_snapshot
+from controllers.user import import_users
+from models.user import configure_user_store
+from controllers.hashing import configure_hashing_pool, HASH_SETTINGS
+
+
+def main(argv=None):
+    """
+    Import users from a .json, .jsonl or .py file of registration records.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python user_import.py",
+        description="Register users in bulk with parallel password hashing.",
+    )
+    parser.add_argument("path", help="records with email, password, name and role")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="hashing processes (default: HASH_WORKERS, else CPUs)",
+    )
+    args = parser.parse_args(argv)
+
+    configure_user_store(
+        {
+            "USER_STORE_BACKEND": os.environ.get("USER_STORE_BACKEND", "file"),
+            "USER_SNAPSHOT_FORMAT": os.environ.get("USER_SNAPSHOT_FORMAT", "python"),
+        }
+    )
+    # Same hashing settings as the service, so imported hashes match it
+    hashing = {name: os.environ[name] for name in HASH_SETTINGS if name in os.environ}
+    if args.workers is not None:
+        hashing["HASH_WORKERS"] = args.workers
+    pool = configure_hashing_pool(hashing)
+    try:
+        added, errors = import_users(read_snapshot(args.path))
+    except (OSError, ValueError, SnapshotError) as error:
+        print(error, file=sys.stderr)
+        return 1
+    finally:
+        pool.shutdown()
+
+    for error in errors:
+        print(f"record {error['index']}: {error['error']}", file=sys.stderr)
+    print(f"Imported {len(added)} users, rejected {len(errors)}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
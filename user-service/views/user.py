@@ -1,15 +1,41 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import (
-    create_access_token,
     jwt_required,
     get_jwt_identity,
     get_jwt,
 )
-from controllers.user import register_user, authenticate_user, fetch_profile
+from common.auth import admin_required
+from controllers.user import (
+    register_user,
+    import_users,
+    authenticate_user,
+    fetch_profile,
+)
+from controllers.hashing import HashingUnavailable
+from controllers.session import (
+    open_session,
+    refresh_session,
+    RefreshTokenReused,
+    RefreshUserMissing,
+)
+from common.response_cache import etag_json_response
 
 
 user_blueprint = Blueprint("user", __name__)
 
+# Larger imports should go through import_users.py, which has no request
+# timeout to worry about.
+MAX_IMPORT_ITEMS = 1000
+
+
+def hashing_unavailable(error):
+    """
+    Return a 503 telling the client to retry once the hashing pool drains.
+    """
+    response = jsonify({"error": str(error)})
+    response.headers["Retry-After"] = "1"
+    return response, 503
+
 
 @user_blueprint.route("/register", methods=["POST"])
 def register():
@@ -44,6 +70,8 @@ def register():
         description: User registered successfully
       400:
         description: Invalid input or email already registered
+      503:
+        description: Too many passwords being hashed; retry later
     """
     try:
         data = request.get_json()
@@ -51,6 +79,59 @@ def register():
         return jsonify({"message": "User registered successfully", "user": user}), 201
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
+    except HashingUnavailable as e:
+        return hashing_unavailable(e)
+
+
+@user_blueprint.route("/users/import", methods=["POST"])
+@admin_required()
+def import_users_bulk():
+    """
+    Register many users in one request (Admins Only)
+    ---
+    security:
+      - Bearer: []
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              email:
+                type: string
+                example: user@example.com
+              password:
+                type: string
+                example: password123
+              name:
+                type: string
+                example: John Doe
+              role:
+                type: string
+                example: User
+    responses:
+      201:
+        description: All users imported
+      207:
+        description: Some users imported; see errors
+      400:
+        description: Body is not a list, or no user was valid
+      403:
+        description: Not an admin
+    """
+    try:
+        added, errors = import_users(request.get_json(), max_items=MAX_IMPORT_ITEMS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    status = 201 if not errors else (207 if added else 400)
+    return (
+        jsonify({"imported": [user["email"] for user in added], "errors": errors}),
+        status,
+    )
 
 
 @user_blueprint.route("/login", methods=["POST"])
@@ -75,21 +156,50 @@ def login():
               example: password123
     responses:
       200:
-        description: Login successful
+        description: Login successful; returns an access token and a refresh token
       400:
         description: Missing email or password
       401:
         description: Invalid credentials
+      503:
+        description: Too many passwords being checked; retry later
     """
     try:
         data = request.get_json()
         user = authenticate_user(data)
-        token = create_access_token(
-            identity=user["email"], additional_claims={"role": user["role"]}
-        )
-        return jsonify({"token": token}), 200
+        token, refresh_token = open_session(user)
+        return jsonify({"token": token, "refresh_token": refresh_token}), 200
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
+    except HashingUnavailable as e:
+        return hashing_unavailable(e)
+
+
+@user_blueprint.route("/refresh", methods=["POST"])
+@jwt_required(refresh=True)
+def refresh():
+    """
+    Exchange a Refresh Token for New Tokens
+    ---
+    security:
+      - Bearer: []
+    description: Send the refresh token from /login (or the previous
+      /refresh) as the Bearer token. It is rotated - each refresh token
+      works once - and reusing one revokes the whole login session.
+    responses:
+      200:
+        description: New access token and refresh token
+      401:
+        description: Missing, expired, revoked or reused refresh token, or
+          the user no longer exists
+      422:
+        description: Not a refresh token
+    """
+    try:
+        token, refresh_token = refresh_session(get_jwt())
+    except (RefreshTokenReused, RefreshUserMissing) as e:
+        return jsonify({"error": str(e)}), 401
+    return jsonify({"token": token, "refresh_token": refresh_token}), 200
 
 
 @user_blueprint.route("/profile", methods=["GET"])
@@ -100,6 +210,12 @@ def profile():
     ---
     security:
       - Bearer: []
+    parameters:
+      - name: If-None-Match
+        in: header
+        required: false
+        type: string
+        description: ETag from a previous response
     responses:
       200:
         description: User's profile details
@@ -112,9 +228,11 @@ def profile():
             role:
               type: string
               description: User's role
+      304:
+        description: Not modified since the ETag in If-None-Match
       401:
         description: Unauthorized
     """
     current_user = get_jwt_identity()
     claims = get_jwt()
-    return jsonify(fetch_profile(current_user)), 200
+    return etag_json_response(fetch_profile(current_user))